@@ -0,0 +1,175 @@
+"""
+Command-line batch export of circle images.
+
+Reads circle specs (center_x, center_y, radius) from a CSV or JSONL file and
+renders one image per spec with the same styling as the interactive
+application. The work is spread over a process pool; every worker builds one
+CircleRenderer and reuses its figure and artists for all of its images, and
+writes them straight to disk. Specs are read lazily and only a bounded number
+of chunks is in flight, so memory does not grow with the size of the input.
+
+Usage:
+    python main.py batch specs.csv --out thumbnails --size 256 --workers 8
+"""
+import argparse
+import collections
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+from circle_core import CircleModel, CircleRenderer
+
+SPEC_FIELDS = ("center_x", "center_y", "radius")
+
+CircleSpec = collections.namedtuple("CircleSpec", "index center_x center_y radius name")
+BatchReport = collections.namedtuple("BatchReport", "images seconds images_per_second peak_rss_bytes")
+
+
+def read_specs(path):
+    """
+    Yields a CircleSpec for every row of a CSV (with a header row) or JSONL file.
+    An optional 'name' column/key sets the output file name stem.
+    """
+    with open(path, newline="") as spec_file:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in spec_file if line.strip())
+        else:
+            rows = csv.DictReader(spec_file)
+        for index, row in enumerate(rows):
+            try:
+                values = [float(row[field]) for field in SPEC_FIELDS]
+            except KeyError as error:
+                raise ValueError(f"{path}: spec {index} is missing the field {error}") from None
+            except (TypeError, ValueError):
+                raise ValueError(f"{path}: spec {index} has a value that is not a number") from None
+            if not all(math.isfinite(value) for value in values):
+                raise ValueError(f"{path}: spec {index} has a value that is not finite")
+            if values[2] <= 0:
+                raise ValueError(f"{path}: spec {index} has a non-positive radius")
+            name = str(row.get("name") or f"circle_{index:06d}")
+            if "/" in name or "\\" in name: # Images must stay inside the output directory
+                raise ValueError(f"{path}: spec {index} has a name that is not a plain file name: {name!r}")
+            yield CircleSpec(index, *values, name)
+
+
+def peak_rss_bytes(who="self"):
+    """Peak resident set size of this process ('self') or its reaped children ('children')."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+# --- Worker side ---
+_worker_renderer = None
+
+
+def _init_worker(figsize, dpi):
+    global _worker_renderer
+    _worker_renderer = CircleRenderer(figsize=figsize, dpi=dpi)
+
+
+def _render_chunk(specs, out_dir, image_format):
+    """Renders a chunk of specs to disk with the worker's renderer; returns (count, peak RSS)."""
+    model = CircleModel()
+    for spec in specs:
+        model.center_x = spec.center_x
+        model.center_y = spec.center_y
+        model.radius = spec.radius
+        path = os.path.join(out_dir, f"{spec.name}.{image_format}")
+        _worker_renderer.render(model, path, format=image_format)
+    return len(specs), peak_rss_bytes()
+
+
+# --- Driver side ---
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_batch(spec_path, out_dir, size=256, dpi=100, image_format="png",
+                 workers=None, chunk_size=32, progress=None):
+    """
+    Renders every spec of 'spec_path' into 'out_dir' and returns a BatchReport.
+    'progress', if given, is called with the number of images written so far.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    figsize = (size / dpi, size / dpi)
+    max_in_flight = workers * 2
+
+    images = 0
+    worker_peak_rss = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(figsize, dpi)) as pool:
+        pending = set()
+        chunks = _chunked(read_specs(spec_path), chunk_size)
+        for chunk in itertools.chain(chunks, [None]):
+            # Wait for a slot when enough work is queued (or everything was submitted)
+            while pending and (chunk is None or len(pending) >= max_in_flight):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    count, rss = future.result()
+                    images += count
+                    worker_peak_rss = max(worker_peak_rss, rss or 0)
+                if progress:
+                    progress(images)
+                if chunk is None and not pending:
+                    break
+            if chunk is not None:
+                pending.add(pool.submit(_render_chunk, chunk, out_dir, image_format))
+    seconds = time.perf_counter() - start
+
+    peak_rss = max(worker_peak_rss, peak_rss_bytes() or 0) or None
+    images_per_second = images / seconds if seconds > 0 else 0.0
+    return BatchReport(images, seconds, images_per_second, peak_rss)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Render one image per circle spec from a CSV or JSONL file."
+    )
+    parser.add_argument("specs", help="CSV (with header) or JSONL file with center_x, center_y, radius")
+    parser.add_argument("--out", default="circles", help="output directory (default: %(default)s)")
+    parser.add_argument("--size", type=int, default=256, help="image size in pixels (default: %(default)s)")
+    parser.add_argument("--dpi", type=int, default=100, help="figure DPI (default: %(default)s)")
+    parser.add_argument("--format", default="png", choices=("png", "svg", "pdf", "jpg"),
+                        help="image format (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="specs per worker task (default: %(default)s)")
+    args = parser.parse_args(argv)
+    for option in ("size", "dpi", "workers", "chunk_size"):
+        value = getattr(args, option)
+        if value is not None and value <= 0:
+            parser.error(f"--{option.replace('_', '-')} must be positive")
+
+    try:
+        report = export_batch(
+            args.specs, args.out,
+            size=args.size, dpi=args.dpi, image_format=args.format,
+            workers=args.workers, chunk_size=args.chunk_size
+        )
+    except (ValueError, OSError) as error:
+        parser.error(str(error))
+    print(f"Images: {report.images}")
+    print(f"Time: {report.seconds:.2f} s ({report.images_per_second:.1f} images/sec)")
+    if report.peak_rss_bytes is not None:
+        print(f"Peak RSS (largest process): {report.peak_rss_bytes / 2**20:.1f} MiB")
+    return 0
@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of the per-frame cost of the circle and Pi segment.
+
+Replays a radius animation on a headless CircleRenderer and times, per frame,
+the geometry update alone and the full blitted frame (update, restore the
+cached background, draw both patches). Compares the rebuilt Circle/Wedge
+patches with the cached unit paths placed by an Affine2D.
+
+Usage:
+    python benchmarks/bench_patch_geometry.py [--frames 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from circle_core import CircleModel, CircleRenderer # noqa: E402
+
+
+def run(cached_paths, frames):
+    renderer = CircleRenderer(cached_paths=cached_paths)
+    model = CircleModel(radius=50.0)
+    renderer.update_plot_limits(model, model.radius, threshold=0)
+    canvas = renderer.figure.canvas
+    for artist in (renderer.circle_patch, renderer.pi_segment):
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(renderer.figure.bbox)
+
+    update_times = []
+    frame_times = []
+    for frame in range(frames):
+        display_radius = 1 + 49 * frame / frames # Sweep like a radius animation
+        start = time.perf_counter()
+        renderer.update(model, display_radius=display_radius)
+        updated = time.perf_counter()
+        canvas.restore_region(background)
+        renderer.figure.draw_artist(renderer.circle_patch)
+        renderer.figure.draw_artist(renderer.pi_segment)
+        end = time.perf_counter()
+        update_times.append(updated - start)
+        frame_times.append(end - start)
+    return update_times, frame_times
+
+
+def describe(times):
+    times = sorted(times)
+    p95 = times[int(0.95 * (len(times) - 1))]
+    return f"median {statistics.median(times) * 1e6:8.1f} us   p95 {p95 * 1e6:8.1f} us"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    for label, cached_paths in (("rebuilt Circle/Wedge", False), ("cached unit paths", True)):
+        run(cached_paths, min(args.frames, 100)) # Warm up
+        update_times, frame_times = run(cached_paths, args.frames)
+        print(f"{label}")
+        print(f"  geometry update: {describe(update_times)}")
+        print(f"  blitted frame:   {describe(frame_times)}")
+
+
+if __name__ == "__main__":
+    main()
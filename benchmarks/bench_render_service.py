@@ -0,0 +1,146 @@
+"""
+Throughput and latency of the render service under concurrent clients.
+
+Starts the service in this process on a free localhost port (or uses the one
+given with --url), then lets --clients threads send --requests requests in
+total, each over its own keep-alive connection. The requests are drawn from
+--distinct different circles, so the cache hit ratio can be steered: few
+distinct circles measure the cache, many measure the renderer pool.
+
+Reports requests per second, latency percentiles and the service's metrics.
+
+Usage:
+    python benchmarks/bench_render_service.py [--clients 8] [--requests 2000] [--distinct 200]
+    python benchmarks/bench_render_service.py --url http://127.0.0.1:8765
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from render_service import RenderService, create_server # noqa: E402
+
+
+def request_paths(count, distinct, size, image_format, seed=5):
+    """'count' /render paths drawn uniformly from 'distinct' different circles."""
+    rng = random.Random(seed)
+    circles = [
+        (round(rng.uniform(-50, 50), 2), round(rng.uniform(-50, 50), 2), round(rng.uniform(1, 100), 2))
+        for _ in range(distinct)
+    ]
+    return [
+        "/render?x={}&y={}&r={}&size={}&format={}".format(*rng.choice(circles), size, image_format)
+        for _ in range(count)
+    ]
+
+
+def run_clients(host, port, paths, clients):
+    """Sends 'paths' from 'clients' threads; returns (seconds, latencies in seconds)."""
+    latencies = []
+    lock = threading.Lock()
+    shares = [paths[index::clients] for index in range(clients)]
+    errors = []
+
+    def client(share):
+        connection = http.client.HTTPConnection(host, port)
+        own = []
+        try:
+            for path in share:
+                start = time.perf_counter()
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                own.append(time.perf_counter() - start)
+                if response.status != 200:
+                    raise RuntimeError(f"{path}: HTTP {response.status}")
+        except Exception as error:
+            errors.append(error)
+        finally:
+            connection.close()
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client, args=(share,)) for share in shares]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return seconds, latencies
+
+
+def fetch_metrics(host, port):
+    connection = http.client.HTTPConnection(host, port)
+    connection.request("GET", "/metrics")
+    metrics = json.loads(connection.getresponse().read())
+    connection.close()
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="benchmark a running service instead of starting one")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=200, help="number of different circles requested")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--format", default="png", choices=("png", "svg"))
+    parser.add_argument("--pool", type=int, default=4, help="renderer pool size of the started service")
+    parser.add_argument("--cache-mb", type=float, default=64, help="cache size of the started service")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        service = RenderService(pool_size=args.pool, cache_bytes=int(args.cache_mb * 2**20))
+        server = create_server(service, port=0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        paths = request_paths(args.requests, args.distinct, args.size, args.format)
+        seconds, latencies = run_clients(host, port, paths, args.clients)
+        latencies_ms = np.array(latencies) * 1000
+        result = {
+            "clients": args.clients,
+            "requests": len(latencies),
+            "distinct": args.distinct,
+            "requests_per_s": len(latencies) / seconds,
+            "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+            "latency_p95_ms": float(np.percentile(latencies_ms, 95)),
+            "latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+            "latency_max_ms": float(latencies_ms.max()),
+            "service": fetch_metrics(host, port),
+        }
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    for key, value in result.items():
+        if key != "service":
+            print(f"{key:16s} {value:10.2f}" if isinstance(value, float) else f"{key:16s} {value:10d}")
+    print(json.dumps(result["service"], indent=2))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(result, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
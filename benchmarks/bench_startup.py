@@ -0,0 +1,78 @@
+"""
+Cold-start timings of the interactive application.
+
+Starts 'main.py --startup-report' in fresh interpreters and reports the median
+of each milestone, in milliseconds since main.py started importing:
+
+    imports       main.py's own imports are done (matplotlib is not among them)
+    window        the window with its controls is shown
+    canvas        the figure and the Tk canvas are built (matplotlib imported)
+    first_frame   the first frame has been drawn
+    first_paint   the event loop is idle after the first frame
+    toolbar       the deferred navigation toolbar exists
+
+'process' is the wall time from spawning the interpreter until it exited,
+which includes the interpreter's own startup.
+
+By default the application runs on the Tk-free stand-in in headless_tk.py;
+--display uses the real Tk (e.g. under 'xvfb-run').
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--display] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+HEADLESS_CHILD = (
+    "import sys; sys.path[:0] = [{root!r}, {bench!r}]; "
+    "import headless_tk; headless_tk.install(); "
+    "import main; sys.exit(main.main(['--startup-report']))"
+)
+
+
+def startup_once(display=False):
+    """Starts the application once; returns its milestones plus 'process_ms'."""
+    if display:
+        command = [sys.executable, os.path.join(ROOT_DIR, "main.py"), "--startup-report"]
+    else:
+        command = [sys.executable, "-c", HEADLESS_CHILD.format(root=ROOT_DIR, bench=BENCHMARK_DIR)]
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    process_ms = (time.perf_counter() - start) * 1000
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    report["process_ms"] = process_ms
+    return report
+
+
+def measure_startup(repeat=5, display=False):
+    """Median of each milestone over 'repeat' cold starts."""
+    runs = [startup_once(display) for _ in range(repeat)]
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--display", action="store_true", help="use the real Tk instead of the stand-in")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.repeat, args.display)
+    for key, value in result.items():
+        print(f"{key:16s} {value:8.1f} ms")
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(result, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Tk-free stand-in for driving CircleVisualization without a display.
+
+install() registers minimal replacements for 'tkinter', 'tkinter.ttk',
+'tkinter.font', 'tkinter.filedialog' and matplotlib's TkAgg backend in
+sys.modules. It must be called before main.py is imported. Widgets only store
+their options; variables hold plain Python values; the canvas is a real Agg
+canvas (so all rendering work is still done) whose blit to the screen is a no-op.
+Like the real backend, the stand-in backend only imports matplotlib when the
+application first uses it, so startup timings stay comparable.
+
+HeadlessRoot runs 'after' callbacks in real time on time.monotonic, the clock
+the FrameScheduler uses, so frame rates and latencies measured with it reflect
+the actual cost of the Python and Agg work.
+"""
+import heapq
+import itertools
+import sys
+import time
+import types
+
+
+class Variable:
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+
+class DoubleVar(Variable):
+    def get(self):
+        return float(self._value)
+
+
+class IntVar(Variable):
+    def get(self):
+        return int(self._value)
+
+
+class BooleanVar(Variable):
+    def get(self):
+        return bool(self._value)
+
+
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self._children = []
+        if isinstance(master, Widget):
+            master._children.append(self)
+
+    def pack(self, **options):
+        pass
+
+    grid = place = pack
+
+    def pack_forget(self):
+        pass
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, option):
+        return self.options.get(option)
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def winfo_children(self):
+        return list(self._children)
+
+    def winfo_width(self):
+        return 600
+
+    def winfo_height(self):
+        return 600
+
+    def focus_set(self):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def destroy(self):
+        pass
+
+    # Text widget API, as far as the application uses it
+    def insert(self, index, text, *tags):
+        self.options["text"] = self.options.get("text", "") + text
+
+    def delete(self, first, last=None):
+        self.options["text"] = ""
+
+    def see(self, index):
+        pass
+
+    def yview(self, *args):
+        pass
+
+    def set(self, *args):
+        pass
+
+    def invoke(self):
+        command = self.options.get("command")
+        if command:
+            command()
+
+
+class Notebook(Widget):
+    def add(self, child, **options):
+        pass
+
+
+class HeadlessRoot(Widget):
+    """A Tk root replacement with a real-time 'after' queue."""
+
+    def __init__(self, clock=time.monotonic):
+        super().__init__()
+        self.clock = clock
+        self._queue = []
+        self._jobs = {}
+        self._ids = itertools.count()
+
+    def title(self, text=None):
+        pass
+
+    def geometry(self, spec=None):
+        pass
+
+    def protocol(self, name, func=None):
+        pass
+
+    def focus_get(self):
+        return None
+
+    def after(self, ms, func=None, *args):
+        sequence = next(self._ids)
+        job_id = f"after#{sequence}"
+        heapq.heappush(self._queue, (self.clock() + ms / 1000, sequence, job_id)) # FIFO for equal times
+        self._jobs[job_id] = (func, args)
+        return job_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, job_id):
+        self._jobs.pop(job_id, None)
+
+    def pump(self, seconds):
+        """Runs due callbacks (sleeping until they are due) for 'seconds' of wall time."""
+        end = self.clock() + seconds
+        while True:
+            now = self.clock()
+            while self._queue and self._queue[0][2] not in self._jobs:
+                heapq.heappop(self._queue) # Cancelled
+            if not self._queue or self._queue[0][0] > end:
+                time.sleep(max(0.0, end - now))
+                return
+            due, _, job_id = self._queue[0]
+            if due > now:
+                time.sleep(due - now)
+                continue
+            heapq.heappop(self._queue)
+            func, args = self._jobs.pop(job_id)
+            func(*args)
+
+    def update(self):
+        self.pump(0)
+
+    def destroy(self):
+        self._jobs.clear() # Ends mainloop()
+
+    def mainloop(self):
+        while self._jobs:
+            self.pump(0.05)
+
+
+class Style:
+    def theme_use(self, name=None):
+        pass
+
+    def configure(self, style, **options):
+        pass
+
+    def map(self, style, **options):
+        pass
+
+
+class NavigationToolbarHeadless(Widget):
+    def __init__(self, canvas, window=None, *, pack_toolbar=True):
+        super().__init__(window)
+        self.canvas = canvas
+
+
+_backend_classes = {}
+
+
+def _backend_getattr(name):
+    """Module __getattr__ of the stand-in TkAgg backend: imports matplotlib on first use."""
+    if not _backend_classes:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        class FigureCanvasHeadless(FigureCanvasAgg):
+            """Agg canvas with the FigureCanvasTkAgg API; blitting to the (absent) screen is free."""
+
+            def __init__(self, figure=None, master=None):
+                super().__init__(figure)
+                self._tk_widget = Widget(master)
+
+            def get_tk_widget(self):
+                return self._tk_widget
+
+            def blit(self, bbox=None):
+                pass
+
+        _backend_classes["FigureCanvasTkAgg"] = FigureCanvasHeadless
+        _backend_classes["NavigationToolbar2Tk"] = NavigationToolbarHeadless
+    try:
+        return _backend_classes[name]
+    except KeyError:
+        raise AttributeError(name) from None
+
+
+def install():
+    """Registers the stand-in modules. Call before importing main."""
+    tk = types.ModuleType("tkinter")
+    for constant in ("LEFT", "RIGHT", "TOP", "BOTTOM", "BOTH", "X", "Y", "N", "S", "E", "W",
+                     "END", "WORD", "CHAR", "NONE", "CENTER", "HORIZONTAL", "VERTICAL"):
+        setattr(tk, constant, constant.lower())
+    tk.NORMAL, tk.DISABLED = "normal", "disabled"
+    tk.TclError = RuntimeError
+    tk.Tk = HeadlessRoot
+    tk.Misc = tk.Widget = Widget
+    tk.Frame = tk.Label = tk.Text = tk.Scrollbar = tk.Canvas = tk.Toplevel = Widget
+    tk.Variable, tk.StringVar = Variable, Variable
+    tk.DoubleVar, tk.IntVar, tk.BooleanVar = DoubleVar, IntVar, BooleanVar
+
+    ttk = types.ModuleType("tkinter.ttk")
+    ttk.Style = Style
+    for name in ("Frame", "Label", "Entry", "Scale", "Button", "Separator", "Checkbutton",
+                 "Scrollbar", "LabelFrame", "Spinbox", "Combobox", "Progressbar"):
+        setattr(ttk, name, type(name, (Widget,), {}))
+    ttk.Notebook = Notebook
+
+    font = types.ModuleType("tkinter.font")
+    font.Font = lambda **options: None
+
+    filedialog = types.ModuleType("tkinter.filedialog")
+    filedialog.asksaveasfilename = lambda **options: ""
+    filedialog.askopenfilename = lambda **options: ""
+    filedialog.askdirectory = lambda **options: ""
+
+    tk.ttk, tk.font, tk.filedialog = ttk, font, filedialog
+    sys.modules.update({
+        "tkinter": tk,
+        "tkinter.ttk": ttk,
+        "tkinter.font": font,
+        "tkinter.filedialog": filedialog,
+    })
+
+    backend = types.ModuleType("matplotlib.backends.backend_tkagg")
+    backend.__getattr__ = _backend_getattr
+    sys.modules["matplotlib.backends.backend_tkagg"] = backend
@@ -0,0 +1,409 @@
+"""
+Scenario benchmarks of the interactive application and the Agg render path.
+
+Drives CircleVisualization with scripted input (slider sweeps, rapid entry
+submissions, update-button spam, many-circle scenes, mouse drags) and
+measures, per scenario, the frame rate, the per-frame work time percentiles,
+the time each input handler blocks the event loop, the time from the last
+input until all animations have settled, and the memory use. The 'agg_render' scenario times
+the headless CircleRenderer on its own, and 'startup' the cold start of the
+application in fresh interpreters (see bench_startup.py).
+
+By default the application runs on the Tk-free stand-in in headless_tk.py, so
+no display is needed; --display uses the real Tk (e.g. under 'xvfb-run').
+
+Results are written as JSON. With --baseline, they are compared against an
+earlier run and the exit status is 1 if any metric regressed by more than
+--threshold (a fraction, 0.25 = 25%); memory use counts as well. A --quick
+run is only compared against a --quick baseline. Use --repeat to take the
+median of several runs, which makes the comparison much less sensitive to
+noise.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --output new.json --baseline results.json
+    python benchmarks/run_benchmarks.py --quick --scenarios slider_sweep agg_render
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+SETTLE_TIMEOUT = 30.0 # Seconds to wait for animations to finish
+
+# Metric name -> True if higher is better. Only these take part in the regression check.
+COMPARED_METRICS = {
+    "fps": True,
+    "frame_p50_ms": False,
+    "frame_p95_ms": False,
+    "frame_max_ms": False, # A single long frame is a visible freeze, whatever the percentiles say
+    "input_p95_ms": False,
+    "input_max_ms": False,
+    "settle_s": False,
+    "images_per_s": True,
+    "render_p95_ms": False,
+    "window_ms": False,
+    "first_paint_ms": False,
+    "rss_mb": False,
+    "rss_growth_mb": False,
+}
+NOISE_FLOOR_MS = 1.0 # Millisecond metrics must also change by this much to count as a regression
+NOISE_FLOOR_MB = 5.0 # Likewise for memory metrics
+
+
+def rss_bytes():
+    """Current resident set size of this process, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def percentiles(seconds, prefix):
+    """p50/p95/p99/max of durations in seconds, as '<prefix>_pXX_ms' entries."""
+    if len(seconds) == 0:
+        return {}
+    ms = np.asarray(seconds) * 1000
+    return {
+        f"{prefix}_p50_ms": float(np.percentile(ms, 50)),
+        f"{prefix}_p95_ms": float(np.percentile(ms, 95)),
+        f"{prefix}_p99_ms": float(np.percentile(ms, 99)),
+        f"{prefix}_max_ms": float(ms.max()),
+    }
+
+
+class HeadlessDriver:
+    """Runs the application on the Tk-free stand-in."""
+    name = "headless"
+
+    def __init__(self):
+        from benchmarks import headless_tk
+        headless_tk.install()
+        import tkinter
+        self.root = tkinter.Tk()
+
+    def pump(self, seconds):
+        self.root.pump(seconds)
+
+
+class DisplayDriver:
+    """Runs the application on the real Tk; needs a (possibly virtual) display."""
+    name = "tk"
+
+    def __init__(self):
+        import tkinter
+        self.root = tkinter.Tk()
+        self.root.geometry("900x700")
+
+    def pump(self, seconds):
+        end = time.monotonic() + seconds
+        while True:
+            self.root.update()
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.001))
+
+
+class Session:
+    """One application instance with the profiler hooked into the frame loop."""
+
+    def __init__(self, driver):
+        from main import CircleVisualization # Imported after the driver chose the Tk
+        self.driver = driver
+        self.app = CircleVisualization(driver.root)
+        driver.pump(0.2) # Let the first frame and the initial draw happen
+        profiler = self.app.profiler
+        profiler.instrument(self.app.scheduler, "_tick", "frame")
+        profiler.instrument(self.app.canvas, "draw", "full_draw")
+
+    def reset(self):
+        """Puts the application back into its initial state between scenarios."""
+        app = self.app
+        app.on_clear_circles()
+        app.center_x.set(0.0)
+        app.center_y.set(0.0)
+        app.radius.set(5.0)
+        app.radius_entry_var.set("5.00")
+        app.update_circle()
+        self.settle()
+
+    def settle(self):
+        """Pumps events until the scheduler is idle; returns the time that took."""
+        start = time.monotonic()
+        while not self.app.scheduler.is_idle:
+            if time.monotonic() - start > SETTLE_TIMEOUT:
+                raise RuntimeError(f"animations did not settle within {SETTLE_TIMEOUT} s")
+            self.driver.pump(0.001)
+        return time.monotonic() - start
+
+    def pump(self, seconds):
+        self.driver.pump(seconds)
+
+    def act(self, handler, *args):
+        """Calls an input handler like the event loop would, timing it as an 'input' phase."""
+        start = self.app.profiler.clock()
+        handler(*args)
+        self.app.profiler.record("input", start, self.app.profiler.clock() - start)
+
+    def mouse(self, name, x, y, button=None):
+        """Sends a matplotlib mouse event at data coordinates (x, y) to the canvas."""
+        from matplotlib.backend_bases import MouseEvent
+        canvas = self.app.canvas
+        px, py = self.app.ax.transData.transform((x, y))
+        canvas.callbacks.process(name, MouseEvent(name, canvas, px, py, button=button))
+
+    def measure(self, script, quick=False):
+        """Runs 'script(session, quick)' and returns the metrics of the work it caused."""
+        app = self.app
+        self.reset()
+        profiler = app.profiler
+        profiler.clear()
+        frames_run = app.scheduler.frames_run
+        frames_skipped = app.scheduler.frames_skipped
+        rss_before = rss_bytes()
+
+        start = time.monotonic()
+        script(self, quick)
+        settle_s = self.settle()
+        duration = time.monotonic() - start
+
+        frames = app.scheduler.frames_run - frames_run
+        metrics = {
+            "duration_s": duration,
+            "frames": frames,
+            "frames_skipped": app.scheduler.frames_skipped - frames_skipped,
+            "fps": frames / duration if duration > 0 else 0.0,
+            "full_draws": len(profiler.phase_durations("full_draw")),
+            "settle_s": settle_s,
+        }
+        metrics.update(percentiles(profiler.phase_durations("frame"), "frame"))
+        metrics.update(percentiles(profiler.phase_durations("input"), "input"))
+        rss_after = rss_bytes()
+        if rss_after is not None:
+            metrics["rss_mb"] = rss_after / 2**20
+            metrics["rss_growth_mb"] = (rss_after - rss_before) / 2**20
+        return metrics
+
+
+# --- Scenarios ---
+# Each script drives session.app through session.act(handler) (a timed input
+# event) and session.pump(seconds) (runs the event loop). The input rates are
+# those of a fast user (or faster), so several events fall into one frame.
+
+def slider_sweep(session, quick=False):
+    """Drags the radius slider from 1 to 100, one event every 4 ms."""
+    app = session.app
+    for value in np.linspace(1, 100, 100 if not quick else 25):
+        app.radius.set(float(value))
+        session.act(app.on_radius_control_changed, str(value))
+        session.pump(0.004)
+
+
+def entry_submissions(session, quick=False):
+    """Types a radius and presses Return, 40 times at 30 ms intervals."""
+    app = session.app
+    rng = random.Random(11)
+    for _ in range(40 if not quick else 10):
+        app.radius_entry_var.set(f"{rng.uniform(1, 100):.2f}")
+        session.act(app.on_radius_entry_submitted)
+        session.pump(0.03)
+
+
+def update_button_spam(session, quick=False):
+    """Presses 'Perbarui Lingkaran' with new coordinates and radii every 5 ms."""
+    app = session.app
+    rng = random.Random(12)
+    for _ in range(100 if not quick else 20):
+        app.center_x.set(rng.uniform(-50, 50))
+        app.center_y.set(rng.uniform(-50, 50))
+        app.radius_entry_var.set(f"{rng.uniform(1, 100):.2f}")
+        session.act(app.on_update_button_pressed)
+        session.pump(0.005)
+
+
+def many_circles(count):
+    def script(session, quick=False):
+        session.app.circle_count_var.set(str(count if not quick else count // 10))
+        session.act(session.app.on_add_random_circles) # All circles grow from zero until settled
+    script.__doc__ = f"Adds {count:,} random circles and animates them to their radii."
+    return script
+
+
+def circle_drag(count):
+    def script(session, quick=False):
+        app = session.app
+        app.circle_count_var.set(str(count if not quick else count // 10))
+        app.on_add_random_circles()
+        app.circles.radii[:] = app.circles.target_radii # Skip the growth animation
+        session.settle()
+        app.profiler.clear() # Only the mouse interaction is measured
+
+        (x0, x1), (y0, y1) = app.ax.get_xlim(), app.ax.get_ylim()
+        rng = np.random.default_rng(13)
+        for x, y in zip(rng.uniform(x0, x1, 60), rng.uniform(y0, y1, 60)):
+            session.act(session.mouse, "motion_notify_event", x, y)
+            session.pump(0.004)
+        # Drag the topmost circle under a random point across the view
+        hit = None
+        while hit is None or hit[0] == "main":
+            x, y = rng.uniform(x0, x1), rng.uniform(y0, y1)
+            hit = app.interaction.hit_test(x, y)
+        session.act(session.mouse, "button_press_event", x, y, 1)
+        for step in np.linspace(0, 1, 60):
+            session.act(session.mouse, "motion_notify_event", x + step * (x1 - x) / 2, y, 1)
+            session.pump(0.004)
+        session.act(session.mouse, "button_release_event", x + (x1 - x) / 2, y, 1)
+    script.__doc__ = f"Hovers over and drags one of {count:,} circles with the mouse."
+    return script
+
+
+APP_SCENARIOS = {
+    "slider_sweep": slider_sweep,
+    "entry_submissions": entry_submissions,
+    "update_button_spam": update_button_spam,
+    "many_circles_1k": many_circles(1_000),
+    "many_circles_10k": many_circles(10_000),
+    "circle_drag_100k": circle_drag(100_000),
+}
+
+
+def agg_render(quick=False):
+    """Renders PNGs with the headless CircleRenderer, without any GUI."""
+    from circle_core import CircleModel, CircleRenderer
+    renderer = CircleRenderer(figsize=(4, 4), dpi=100)
+    model = CircleModel()
+    count = 200 if not quick else 40
+    radii = np.linspace(1, 100, count)
+    renderer.render_bytes(model) # Warm up
+    times = []
+    start = time.perf_counter()
+    for radius in radii:
+        model.radius = float(radius)
+        frame_start = time.perf_counter()
+        renderer.render_bytes(model)
+        times.append(time.perf_counter() - frame_start)
+    duration = time.perf_counter() - start
+    metrics = {"duration_s": duration, "images": count, "images_per_s": count / duration}
+    metrics.update(percentiles(times, "render"))
+    rss = rss_bytes()
+    if rss is not None:
+        metrics["rss_mb"] = rss / 2**20
+    return metrics
+
+
+ALL_SCENARIOS = list(APP_SCENARIOS) + ["agg_render", "startup"]
+
+
+def median_metrics(runs):
+    """Per-metric median over repeated runs of a scenario."""
+    return {key: float(np.median([run[key] for run in runs if key in run])) for key in runs[0]}
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of (scenario, metric, baseline value, new value) that regressed."""
+    regressions = []
+    for scenario, metrics in results["scenarios"].items():
+        old_metrics = baseline.get("scenarios", {}).get(scenario)
+        if not old_metrics:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = old_metrics.get(metric), metrics.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if metric.endswith("_ms") and abs(new - old) < NOISE_FLOOR_MS:
+                continue
+            if metric.endswith("_mb") and abs(new - old) < NOISE_FLOOR_MB:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append((scenario, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=ALL_SCENARIOS, default=ALL_SCENARIOS)
+    parser.add_argument("--display", action="store_true", help="use the real Tk instead of the stand-in")
+    parser.add_argument("--quick", action="store_true", help="shorter scripts, for smoke runs")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative change that counts as a regression (default 0.25)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run every scenario this many times and report the median of each metric")
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("quick", False) != args.quick: # The scripts differ, so would the metrics
+            parser.error(f"{args.baseline} was {'' if baseline.get('quick') else 'not '}run with --quick; "
+                         f"compare it with a run that {'also' if baseline.get('quick') else 'does not'} use it")
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "repeat": args.repeat,
+        "scenarios": {},
+    }
+
+    app_scenarios = [name for name in args.scenarios if name in APP_SCENARIOS]
+    if app_scenarios:
+        driver = DisplayDriver() if args.display else HeadlessDriver()
+        results["driver"] = driver.name
+        session = Session(driver)
+        for name in app_scenarios:
+            runs = [session.measure(APP_SCENARIOS[name], args.quick) for _ in range(args.repeat)]
+            results["scenarios"][name] = median_metrics(runs)
+            print(f"{name:20s} {format_metrics(results['scenarios'][name])}", flush=True)
+    if "agg_render" in args.scenarios:
+        runs = [agg_render(args.quick) for _ in range(args.repeat)]
+        results["scenarios"]["agg_render"] = median_metrics(runs)
+        print(f"{'agg_render':20s} {format_metrics(results['scenarios']['agg_render'])}", flush=True)
+    if "startup" in args.scenarios:
+        from benchmarks.bench_startup import measure_startup
+        results["scenarios"]["startup"] = measure_startup(max(3, args.repeat), args.display)
+        print(f"{'startup':20s} {format_metrics(results['scenarios']['startup'])}", flush=True)
+
+    from batch_export import peak_rss_bytes
+    peak = peak_rss_bytes()
+    if peak is not None:
+        results["peak_rss_mb"] = peak / 2**20
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for scenario, metric, old, new in regressions:
+            print(f"REGRESSION {scenario}.{metric}: {old:.4g} -> {new:.4g}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+def format_metrics(metrics):
+    parts = []
+    for key in ("fps", "frame_p50_ms", "frame_p95_ms", "frame_max_ms", "input_p95_ms", "input_max_ms", "settle_s",
+                "images_per_s", "render_p95_ms", "window_ms", "first_paint_ms", "rss_mb"):
+        if key in metrics:
+            parts.append(f"{key} {metrics[key]:.2f}")
+    return "  ".join(parts)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import numpy as np
+from matplotlib.transforms import Bbox
+
+
+def ring_tiles(x, y, inner, outer, size=8):
+    """
+    Squares of 'size' pixels that cover the ring between the radii 'inner' and
+    'outer' around (x, y), all in display coordinates: the area that changes
+    when a circle outline is drawn or erased there, as boxes for repair().
+    """
+    starts = np.arange(-outer, outer, size)
+    x0, y0 = np.meshgrid(starts, starts)
+    x1, y1 = x0 + size, y0 + size
+    # Distance from the center to the nearest and the farthest point of each square
+    nearest = np.hypot(np.clip(0, x0, x1), np.clip(0, y0, y1))
+    farthest = np.hypot(np.maximum(-x0, x1), np.maximum(-y0, y1))
+    keep = (nearest <= outer) & (farthest >= inner)
+    return [Bbox.from_extents(x + a, y + b, x + c, y + d)
+            for a, b, c, d in zip(x0[keep], y0[keep], x1[keep], y1[keep])]
+
+
+class BlitManager:
+    """
+    Blit-based renderer for an Agg canvas (e.g. FigureCanvasTkAgg).
+
+    The static part of the figure (axes, grid, ticks, spines) is rendered once
+    and cached as a background image. Each frame only restores that background
+    and redraws the registered animated artists on top of it. A full redraw is
+    performed only when the cache has been invalidated, i.e. after the plot
+    limits changed or the canvas was resized. A change that only affects a
+    small part of the background (e.g. one of many circles that was moved) can
+    be patched into it with repair() instead.
+    """
+
+    def __init__(self, canvas, animated_artists=()):
+        self.canvas = canvas
+        self._background = None
+        self._artists = []
+        self._repairing = False
+        for artist in animated_artists:
+            self.add_artist(artist)
+
+        # Every full draw (including the ones triggered by Tk resizes and the
+        # navigation toolbar) refreshes the cached background.
+        self._draw_cid = canvas.mpl_connect("draw_event", self._on_draw)
+        self._resize_cid = canvas.mpl_connect("resize_event", self._on_resize)
+
+    def add_artist(self, artist):
+        """Registers an artist to be redrawn on every frame instead of being part of the background."""
+        if artist.figure is not self.canvas.figure:
+            raise ValueError("Artist must belong to the figure of the managed canvas.")
+        artist.set_animated(True)
+        self._artists.append(artist)
+        self.invalidate()
+
+    def remove_artist(self, artist):
+        """Returns an artist to the static background."""
+        self._artists.remove(artist)
+        artist.set_animated(False)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the cached background so that the next update does a full redraw."""
+        self._background = None
+
+    def _on_resize(self, event):
+        self.invalidate()
+
+    def _on_draw(self, event):
+        if self._repairing:
+            return # repair() merges this draw into the background itself
+        if event.canvas is not self.canvas or self.canvas.is_saving():
+            # savefig() draws on a temporary canvas (or with the animated
+            # artists included), so this draw is no background; the screen
+            # canvas is redrawn in full on the next update instead.
+            self.invalidate()
+            return
+        # Animated artists are skipped by a full draw, so capture the background
+        # and then paint them on top to keep the canvas complete.
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            if artist.get_visible():
+                figure.draw_artist(artist)
+
+    def repair(self, bboxes, restrict, unrestrict, overlay=None):
+        """
+        Redraws only the parts of the background inside 'bboxes' (in display
+        coordinates). 'restrict()' must reduce the static artists to what they
+        draw inside those boxes (the expensive ones at least), and
+        'unrestrict()' undoes that. The figure is then drawn once in its cheap,
+        restricted form, and only the pixels inside the boxes are taken over
+        into the cached background. 'overlay()', if given, then draws on top of
+        the background (with figure.draw_artist()) before it is cached again.
+        Without a cached background this is a full update().
+        """
+        figure = self.canvas.figure
+        if self._background is None:
+            self.update()
+            return
+        bboxes = [Bbox.intersection(bbox, figure.bbox) for bbox in bboxes if bbox.overlaps(figure.bbox)]
+        renderer = self.canvas.get_renderer()
+        restrict()
+        try:
+            self._repairing = True
+            try:
+                renderer.clear()
+                figure.draw(renderer)
+            finally:
+                self._repairing = False
+            regions = [self.canvas.copy_from_bbox(bbox) for bbox in bboxes]
+            self.canvas.restore_region(self._background)
+            for region in regions:
+                self.canvas.restore_region(region)
+            if overlay is not None:
+                overlay()
+        finally:
+            unrestrict()
+        self._background = self.canvas.copy_from_bbox(figure.bbox)
+        self._draw_animated()
+        self.canvas.blit(figure.bbox)
+
+    def update(self):
+        """Renders one frame, blitting when a cached background is available."""
+        if self._background is None:
+            # Full redraw; _on_draw caches the new background and the canvas
+            # pushes the whole image to the widget itself.
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
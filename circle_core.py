@@ -0,0 +1,241 @@
+"""
+Tk-free geometry and rendering core of the circle visualization.
+
+Everything in this module works without a display: CircleModel (defined in
+circle_model, which does not import matplotlib, and re-exported here) holds the
+circle as plain floats and computes its properties for single radii or whole
+NumPy arrays of radii, and CircleRenderer draws the styled circle onto a
+matplotlib Figure backed by the Agg canvas. The Tkinter application is a thin
+view on top of these two classes.
+"""
+import io
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle, Patch, Wedge
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
+
+from circle_model import ( # noqa: F401, re-exported
+    ACCENT_COLOR,
+    ACCENT_LIGHT_FILL,
+    BG_COLOR,
+    GRID_COLOR,
+    LIMIT_PADDING_FACTOR,
+    LIMIT_STATIC_PADDING,
+    LIMIT_UPDATE_THRESHOLD,
+    PI_SEGMENT_COLOR,
+    PI_SEGMENT_MIN_WIDTH,
+    PI_SEGMENT_WIDTH_FRACTION,
+    TEXT_COLOR,
+    CircleModel,
+    compute_plot_limits,
+    pi_segment_theta2,
+    pi_segment_width,
+    view_half_extent,
+)
+
+
+@lru_cache(maxsize=64)
+def unit_pi_segment_path(theta2, width_fraction=PI_SEGMENT_WIDTH_FRACTION):
+    """
+    Outline of the Pi segment for a circle of radius 1 centered at the origin.
+    Because the segment's width is a fixed fraction of the radius, this path only
+    has to be scaled and moved to fit any circle.
+    """
+    return Wedge((0, 0), 1, 0, theta2, width=width_fraction).get_path()
+
+
+class UnitPathPatch(Patch):
+    """
+    A patch whose outline is a fixed path in unit coordinates, placed on the axes
+    by an Affine2D (scale by radius, translate to center). Patches that share the
+    affine move and resize together, and doing so only updates the 3x3 matrix;
+    the path is never rebuilt or re-tessellated.
+    """
+
+    def __init__(self, path, affine, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+        self._affine = affine
+
+    def get_path(self):
+        return self._path
+
+    def set_path(self, path):
+        self._path = path
+        self.stale = True
+
+    def get_patch_transform(self):
+        return self._affine
+
+
+class CircleRenderer:
+    """
+    Draws a styled circle and its Pi segment onto a matplotlib Figure.
+
+    The figure is created with the Agg canvas, so rendering works without a
+    display or GUI toolkit. A GUI may attach its own canvas to 'figure'.
+    The artists are created once and only updated afterwards, which keeps
+    rendering many circles in a row cheap.
+
+    With 'cached_paths' (the default), the circle and the Pi segment are
+    UnitPathPatch instances sharing one Affine2D: a radius or center change is a
+    transform update, and the segment path is only swapped when its angle changes.
+    Without it, the regular Circle and Wedge patches are used, which rebuild the
+    wedge path on every change.
+    """
+    BG_COLOR = BG_COLOR
+    TEXT_COLOR = TEXT_COLOR
+    ACCENT_COLOR = ACCENT_COLOR
+    PI_SEGMENT_COLOR = PI_SEGMENT_COLOR
+    GRID_COLOR = GRID_COLOR
+
+    def __init__(self, figsize=(6, 6), dpi=100, cached_paths=True):
+        self.cached_paths = cached_paths
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure) # Headless default canvas
+        self.figure.patch.set_facecolor(self.BG_COLOR) # Figure background
+        self.ax = self.figure.add_subplot()
+        self.ax.set_facecolor(self.BG_COLOR) # Axes background
+
+        self.ax.set_xlim(-15, 15)
+        self.ax.set_ylim(-15, 15)
+        self.ax.set_aspect('equal')
+
+        # Axis and grid colors
+        axis_color = self.TEXT_COLOR
+        self.ax.axhline(0, color=axis_color, lw=0.8)
+        self.ax.axvline(0, color=axis_color, lw=0.8)
+        self.ax.grid(True, color=self.GRID_COLOR, linestyle='--', linewidth=0.5)
+
+        # Tick label colors
+        self.ax.tick_params(axis='x', colors=self.TEXT_COLOR)
+        self.ax.tick_params(axis='y', colors=self.TEXT_COLOR)
+
+        # Spine colors (borders of the plot)
+        for spine in self.ax.spines.values():
+            spine.set_edgecolor(axis_color)
+
+        circle_style = dict(
+            fill=False, # Keeping fill transparent for now, can use ACCENT_LIGHT_FILL
+            edgecolor=self.ACCENT_COLOR,
+            lw=2
+        )
+        pi_segment_style = dict(
+            facecolor=self.PI_SEGMENT_COLOR,
+            alpha=0.7 # Slightly more opaque
+        )
+        if cached_paths:
+            self._placement_matrix = np.eye(3)
+            self.placement = Affine2D(self._placement_matrix) # Unit circle -> data coordinates
+            self._pi_segment_key = (360, PI_SEGMENT_WIDTH_FRACTION)
+            self.circle_patch = UnitPathPatch(Path.unit_circle(), self.placement, **circle_style)
+            self.pi_segment = UnitPathPatch(
+                unit_pi_segment_path(*self._pi_segment_key), self.placement, **pi_segment_style
+            )
+        else:
+            self.circle_patch = Circle((0, 0), radius=1, **circle_style)
+            self.pi_segment = Wedge(
+                center=(0, 0),
+                r=1,
+                theta1=0,
+                theta2=360,
+                width=PI_SEGMENT_WIDTH_FRACTION,
+                **pi_segment_style
+            )
+        self.ax.add_patch(self.circle_patch)
+        self.ax.add_patch(self.pi_segment)
+
+    def update(self, model, display_radius=None):
+        """
+        Updates position and geometry of the circle and the Pi segment.
+        The circle is drawn at 'display_radius' (defaults to the model radius),
+        while the Pi segment's angle reflects the model's target radius.
+        """
+        radius_to_use = model.radius if display_radius is None else display_radius
+        theta2 = pi_segment_theta2(model.get_pi_ratio())
+        if self.cached_paths:
+            self._update_cached(model.center_x, model.center_y, radius_to_use, theta2)
+            return
+
+        center = (model.center_x, model.center_y)
+        self.circle_patch.center = center
+        self.circle_patch.set_radius(radius_to_use)
+
+        self.pi_segment.set_center(center)
+        self.pi_segment.set_radius(radius_to_use)
+        self.pi_segment.set_width(float(pi_segment_width(radius_to_use)))
+        self.pi_segment.set_theta2(theta2)
+
+    def _update_cached(self, center_x, center_y, radius, theta2):
+        # Scale by the radius and translate to the center, reusing the matrix buffer
+        matrix = self._placement_matrix
+        matrix[0, 0] = matrix[1, 1] = radius
+        matrix[0, 2] = center_x
+        matrix[1, 2] = center_y
+        self.placement.set_matrix(matrix)
+
+        # The unit segment only changes with the angle, or for tiny radii where the
+        # minimum width is more than the usual fraction of the radius
+        if radius * PI_SEGMENT_WIDTH_FRACTION >= PI_SEGMENT_MIN_WIDTH:
+            width_fraction = PI_SEGMENT_WIDTH_FRACTION
+        else:
+            width_fraction = min(1.0, PI_SEGMENT_MIN_WIDTH / radius) if radius else 1.0
+        key = (theta2, width_fraction)
+        if key != self._pi_segment_key:
+            self._pi_segment_key = key
+            self.pi_segment.set_path(unit_pi_segment_path(*key))
+        self.circle_patch.stale = True
+        self.pi_segment.stale = True
+
+    def update_plot_limits(self, model, for_radius, threshold=LIMIT_UPDATE_THRESHOLD):
+        """
+        Moves the view so the circle (with 'for_radius') stays visible with padding.
+        The limits are only changed when they drift by more than 'threshold' units,
+        to avoid visual jitter. Returns True if the limits were changed.
+        """
+        xmin, xmax, ymin, ymax = model.get_plot_limits(for_radius)
+        current_xlim = self.ax.get_xlim()
+        current_ylim = self.ax.get_ylim()
+
+        if (abs(current_xlim[0] - xmin) > threshold or
+                abs(current_xlim[1] - xmax) > threshold or
+                abs(current_ylim[0] - ymin) > threshold or
+                abs(current_ylim[1] - ymax) > threshold):
+            self.ax.set_xlim(xmin, xmax)
+            self.ax.set_ylim(ymin, ymax)
+            return True
+        return False
+
+    def render(self, model, fileobj, format="png"):
+        """Renders the model to a path or file object in the given image format."""
+        self.update(model)
+        self.update_plot_limits(model, model.radius, threshold=0)
+        self.figure.savefig(fileobj, format=format, facecolor=self.BG_COLOR)
+
+    def render_bytes(self, model, format="png"):
+        """Renders the model and returns the encoded image."""
+        buffer = io.BytesIO()
+        self.render(model, buffer, format=format)
+        return buffer.getvalue()
+
+    def iter_render(self, centers_x, centers_y, radii, format="png"):
+        """
+        Renders a batch of circles given as (broadcastable) arrays and yields
+        the encoded image of each one. The same figure and artists are reused
+        for every circle.
+        """
+        centers_x, centers_y, radii = np.broadcast_arrays(
+            np.asarray(centers_x, dtype=float),
+            np.asarray(centers_y, dtype=float),
+            np.asarray(radii, dtype=float)
+        )
+        model = CircleModel()
+        for center_x, center_y, radius in zip(centers_x.ravel(), centers_y.ravel(), radii.ravel()):
+            model.center_x = float(center_x)
+            model.center_y = float(center_y)
+            model.radius = float(radius)
+            yield self.render_bytes(model, format=format)
@@ -0,0 +1,99 @@
+"""
+Plain-Python model of the circle, with no matplotlib or Tk dependency.
+
+CircleModel holds the circle as plain floats and computes its properties for
+single radii or whole NumPy arrays of radii; the helpers below compute the Pi
+segment's geometry and the view around a circle. Kept apart from the
+rendering code in circle_core so that the GUI can build its controls (and show
+its window) before matplotlib has been imported.
+"""
+import numpy as np
+
+# --- Color Palette ---
+BG_COLOR = "#F0F0F0"
+TEXT_COLOR = "#333333"
+ACCENT_COLOR = "#007ACC"
+ACCENT_LIGHT_FILL = "#E6F2FF" # Light shade for circle fill (optional)
+PI_SEGMENT_COLOR = "#005C99" # Darker shade of accent for Pi segment
+GRID_COLOR = "#CCCCCC" # Light gray for grid
+
+# --- Geometry ---
+PI_SEGMENT_WIDTH_FRACTION = 0.05 # Width of the Pi segment relative to the radius
+PI_SEGMENT_MIN_WIDTH = 0.01
+LIMIT_PADDING_FACTOR = 0.5 # 50% of radius as padding
+LIMIT_STATIC_PADDING = 5 # Additional static padding units
+LIMIT_UPDATE_THRESHOLD = 1 # Minimum drift (in data units) before limits are updated
+
+
+def pi_segment_theta2(pi_ratio):
+    """Angle (in degrees) swept by the Pi segment for a given circumference/diameter ratio."""
+    return (pi_ratio / np.pi) * 360
+
+
+def pi_segment_width(radius):
+    """Width of the Pi segment ring for one radius or an array of radii."""
+    return np.maximum(PI_SEGMENT_MIN_WIDTH, PI_SEGMENT_WIDTH_FRACTION * np.asarray(radius, dtype=float))
+
+
+def view_half_extent(radius):
+    """Half the width of a square view that shows a circle of 'radius' with adequate padding."""
+    radius = np.asarray(radius, dtype=float)
+    effective_padding = radius * LIMIT_PADDING_FACTOR + LIMIT_STATIC_PADDING
+    return radius + effective_padding
+
+
+def compute_plot_limits(center_x, center_y, radius):
+    """
+    Returns (xmin, xmax, ymin, ymax) of a view that shows the circle with
+    adequate padding. All arguments may be scalars or broadcastable arrays.
+    """
+    extent = view_half_extent(radius)
+    return (center_x - extent, center_x + extent, center_y - extent, center_y + extent)
+
+
+class CircleModel:
+    """
+    Plain-Python state of a circle and its derived quantities.
+
+    The getters accept either a single radius or an array of radii, so a whole
+    batch of circles can be evaluated with one vectorized call:
+
+        model.get_circumference(np.linspace(1, 100, 1_000_000))
+    """
+    __slots__ = ("center_x", "center_y", "radius", "pi_value")
+
+    def __init__(self, center_x=0.0, center_y=0.0, radius=5.0, pi_value=np.pi):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.pi_value = pi_value
+
+    def __repr__(self):
+        return f"CircleModel(center_x={self.center_x!r}, center_y={self.center_y!r}, radius={self.radius!r})"
+
+    def _radius_or_default(self, radius_val):
+        if radius_val is None:
+            return self.radius
+        return np.asarray(radius_val, dtype=float)
+
+    def get_diameter(self, radius_val=None):
+        """Calculates diameter(s) based on the given radius/radii or the model radius."""
+        return self._radius_or_default(radius_val) * 2
+
+    def get_circumference(self, radius_val=None):
+        """Calculates circumference(s) based on the given radius/radii or the model radius."""
+        return self.pi_value * self.get_diameter(radius_val)
+
+    def get_pi_ratio(self, radius_val=None):
+        """
+        Calculates the ratio of circumference to diameter (Pi) for the given radius/radii
+        or the model radius. A zero diameter gives 0, as Pi is undefined for a point.
+        """
+        diameter = np.asarray(self.get_diameter(radius_val), dtype=float)
+        circumference = self.pi_value * diameter
+        ratio = np.divide(circumference, diameter, out=np.zeros_like(diameter), where=diameter != 0)
+        return ratio[()] # Unwraps 0-d arrays to a scalar
+
+    def get_plot_limits(self, radius_val=None):
+        """Plot limits that keep the circle (with the given radius) visible."""
+        return compute_plot_limits(self.center_x, self.center_y, self._radius_or_default(radius_val))
@@ -0,0 +1,305 @@
+"""
+Background jobs for the Tk application.
+
+Heavy computations run on a thread pool (or, for picklable functions, on a
+process pool) instead of the Tk main thread. Their results and streamed
+partial results travel back through one queue, which a FrameScheduler task
+drains once per frame, so callbacks always run on the UI thread, between the
+frame's input handling and its rendering, and never block input or animation.
+
+Jobs can be cancelled, and a job submitted with a 'key' supersedes the
+previous job with the same key (e.g. the computation for an old target
+radius): the old job is cancelled and anything it still produces is dropped.
+
+A streaming job receives its Job as first argument; it reports partial
+results with job.emit(value) and checks job.cancelled (or calls
+job.raise_if_cancelled()) to stop early:
+
+    def count(job, limit):
+        for i in range(limit):
+            job.raise_if_cancelled()
+            job.emit(i)
+        return limit
+
+    executor.submit(count, 10**6, stream=True, key="count", latest_only=True,
+                    on_update=show_progress, on_result=show_result)
+
+For asyncio, run_tk() drives the Tk event loop from a coroutine, so asyncio
+code and Tk callbacks share the main thread, and 'await job.wait()' suspends a
+coroutine until the job's result has been delivered.
+"""
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_UPDATE, _RESULT, _ERROR = range(3)
+
+
+class JobCancelled(Exception):
+    """Raised by Job.raise_if_cancelled() inside a cancelled job."""
+
+
+class Job:
+    """Handle of a submitted background computation."""
+
+    def __init__(self, executor, key, latest_only, on_update, on_result, on_error):
+        self.key = key
+        self.latest_only = latest_only # Deliver only the newest update per frame
+        self.on_update = on_update
+        self.on_result = on_result
+        self.on_error = on_error
+        self.done = False # Set on the UI thread, once the result or error was delivered
+        self._executor = executor
+        self._cancel_event = threading.Event()
+        self._future = None
+        self._waiters = []
+        self._outcome = None # (kind, value) of the delivered result or error
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Stops the job (cooperatively, if it is already running) and drops its pending results."""
+        self._cancel_event.set()
+        if self._future is not None:
+            self._future.cancel() # Only succeeds if it has not started yet
+        for waiter in self._waiters:
+            waiter.get_loop().call_soon_threadsafe(_cancel_future, waiter)
+        self._waiters.clear()
+
+    def raise_if_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled
+
+    def emit(self, value):
+        """Streams a partial result to 'on_update'. Called from the job's own thread."""
+        if not self._cancel_event.is_set():
+            self._executor._results.put((self, _UPDATE, value))
+
+    async def wait(self):
+        """
+        Waits (in a coroutine) until the result has been delivered and returns it.
+        Raises the job's exception, or asyncio.CancelledError if the job was
+        cancelled or superseded.
+        """
+        import asyncio # Only needed by asyncio users; keeps the GUI's startup lean
+        future = asyncio.get_running_loop().create_future()
+        if self.done:
+            kind, value = self._outcome
+            if kind == _RESULT:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        elif self.cancelled:
+            future.cancel()
+        else:
+            self._waiters.append(future)
+        return await future
+
+    def _deliver(self, kind, value):
+        """Runs the callback for one queued item on the UI thread."""
+        if kind == _UPDATE:
+            if self.on_update is not None:
+                self.on_update(value)
+            return
+        self.done = True
+        self._outcome = (kind, value)
+        for waiter in self._waiters:
+            if kind == _RESULT:
+                waiter.get_loop().call_soon_threadsafe(_set_future_result, waiter, value)
+            else:
+                waiter.get_loop().call_soon_threadsafe(_set_future_exception, waiter, value)
+        self._waiters.clear()
+        if kind == _RESULT:
+            if self.on_result is not None:
+                self.on_result(value)
+        elif self.on_error is not None:
+            self.on_error(value)
+        else:
+            import traceback
+            print(f"Exception in background job {self.key or ''}", file=sys.stderr)
+            traceback.print_exception(type(value), value, value.__traceback__)
+
+
+def _set_future_result(future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_future_exception(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _cancel_future(future):
+    if not future.done():
+        future.cancel()
+
+
+def process_context():
+    """
+    The multiprocessing context for worker processes: "forkserver" where
+    available, "spawn" otherwise. A plain fork would copy the Tk interpreter and
+    the locks held by the UI and background threads into the child.
+    """
+    import multiprocessing # Imported on first use, like the process pool
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class BackgroundExecutor:
+    """
+    Runs jobs on a thread pool, or on a process pool created on first use, and
+    delivers their results on the UI thread through 'scheduler'.
+    """
+
+    def __init__(self, scheduler, threads=None, process_workers=None):
+        self.scheduler = scheduler
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self._threads = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="background")
+        self._processes = None
+        self._results = queue.SimpleQueue()
+        self._active = set() # Jobs whose result has not been delivered yet
+        self._latest = {} # key -> newest job with that key
+
+    @property
+    def process_pool(self):
+        """Shared process pool, e.g. for jobs that fan work out to processes themselves."""
+        if self._processes is None:
+            # Imported on first use, since it pulls in multiprocessing (slow to import at startup)
+            from concurrent.futures import ProcessPoolExecutor
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=process_context())
+        return self._processes
+
+    @property
+    def active_jobs(self):
+        return len(self._active)
+
+    def submit(self, func, *args, key=None, stream=False, process=False, latest_only=False,
+               on_update=None, on_result=None, on_error=None, **kwargs):
+        """
+        Runs 'func(*args, **kwargs)' in the background; with 'stream', it is
+        called as 'func(job, *args, **kwargs)' and can emit partial results.
+        With 'process' it runs on the process pool (it must be picklable then,
+        and cannot stream). Must be called on the UI thread. Returns the Job.
+        """
+        if process and stream:
+            raise ValueError("process jobs cannot stream results")
+        job = Job(self, key, latest_only, on_update, on_result, on_error)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel() # Superseded
+            self._latest[key] = job
+        self._active.add(job)
+
+        if process:
+            job._future = self.process_pool.submit(func, *args, **kwargs)
+            job._future.add_done_callback(lambda future: self._post_future(job, future))
+        else:
+            job._future = self._threads.submit(self._run, job, func, args, kwargs, stream)
+        self.scheduler.add_task(self._drain_task)
+        return job
+
+    def cancel(self, key):
+        """Cancels the newest job submitted with 'key', if any."""
+        job = self._latest.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+    def _run(self, job, func, args, kwargs, stream):
+        if job.cancelled:
+            return
+        try:
+            result = func(job, *args, **kwargs) if stream else func(*args, **kwargs)
+        except JobCancelled:
+            return
+        except BaseException as error:
+            self._results.put((job, _ERROR, error))
+        else:
+            self._results.put((job, _RESULT, result))
+
+    def _post_future(self, job, future):
+        # Runs on a pool thread (or right away, if already done)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._results.put((job, _ERROR, error))
+        else:
+            self._results.put((job, _RESULT, future.result()))
+
+    def drain(self):
+        """
+        Delivers the queued results on the calling (UI) thread; results of
+        cancelled or superseded jobs are dropped. Returns how many were delivered.
+        """
+        items = []
+        while True:
+            try:
+                items.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+
+        # Only the newest update of a 'latest_only' job is worth showing
+        newest_update = {}
+        for index, (job, kind, _) in enumerate(items):
+            if kind == _UPDATE and job.latest_only:
+                newest_update[job] = index
+
+        delivered = 0
+        for index, (job, kind, value) in enumerate(items):
+            if job.cancelled or job.done:
+                continue
+            if kind == _UPDATE and job.latest_only and newest_update[job] != index:
+                continue
+            if kind != _UPDATE:
+                self._finish(job)
+            job._deliver(kind, value)
+            delivered += 1
+
+        for job in [job for job in self._active if job.cancelled]:
+            self._finish(job)
+        return delivered
+
+    def _finish(self, job):
+        self._active.discard(job)
+        if job.key is not None and self._latest.get(job.key) is job:
+            del self._latest[job.key]
+
+    def _drain_task(self, dt):
+        """Scheduler task: delivers results once per frame while jobs are outstanding."""
+        self.drain()
+        return bool(self._active)
+
+    def shutdown(self):
+        """Cancels all jobs and stops the pools without waiting for running jobs."""
+        for job in list(self._active):
+            job.cancel()
+        self._active.clear()
+        self._latest.clear()
+        self.scheduler.remove_task(self._drain_task)
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_tk(root, interval=0.005):
+    """
+    Runs the Tk event loop inside asyncio, instead of root.mainloop():
+
+        asyncio.run(run_tk(root))
+
+    Returns when the window is destroyed.
+    """
+    import asyncio
+    import tkinter as tk
+    while True:
+        try:
+            root.update()
+        except tk.TclError: # Application destroyed
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,196 @@
+"""
+Mouse interaction on the canvas: dragging a circle moves it, dragging its rim
+resizes it. This works for the main circle and for the circles of a CircleArray.
+
+Hit-testing uses a CircleGridIndex, so finding the circle under the cursor
+costs a few binary searches even with 100k circles. Mouse events only record
+the newest cursor position; hover and drag updates are coalesced through the
+FrameScheduler and run at most once per frame.
+
+While one of the array's circles is dragged, the collections are not touched:
+the circle is shown as a light preview patch that is blitted on top, and its
+new position is written to the array (which brings it to the front) only when
+the button is released.
+"""
+import math
+
+from matplotlib.backend_tools import Cursors
+from matplotlib.patches import Circle
+
+from spatial_index import rim_hit
+
+MAIN = "main" # Target of a drag on the main circle
+
+
+class CircleInteraction:
+    """
+    Connects to the canvas' mouse events. 'main_circle()' returns the center x,
+    center y and displayed radius of the main circle; 'on_main_drag(x, y, radius,
+    final)' applies a drag of the main circle; 'on_circles_changed(index, old)'
+    is called after a drag moved or resized one of the array's circles, which
+    is then the last one, 'index', and was at 'old' (center x, center y,
+    radius) before.
+    """
+    RIM_TOLERANCE_PX = 5
+
+    def __init__(self, canvas, ax, scheduler, circles, index, main_circle, on_main_drag,
+                 on_circles_changed, color="white", on_preview_changed=None):
+        self.canvas = canvas
+        self.ax = ax
+        self.scheduler = scheduler
+        self.circles = circles
+        self.index = index
+        self.main_circle = main_circle
+        self.on_main_drag = on_main_drag
+        self.on_circles_changed = on_circles_changed
+        self.on_preview_changed = on_preview_changed
+        self.preview = Circle((0, 0), 1, fill=False, edgecolor=color, linestyle="--", linewidth=1.5, zorder=3)
+        self.preview.set_visible(False)
+        ax.add_patch(self.preview)
+
+        self._drag = None # (target, resizing, offset_x, offset_y) while a button is held
+        self._pointer = None # Newest cursor position in data coordinates
+        self._cursor = Cursors.POINTER
+        self._callback_ids = [
+            canvas.mpl_connect("button_press_event", self._on_press),
+            canvas.mpl_connect("motion_notify_event", self._on_motion),
+            canvas.mpl_connect("button_release_event", self._on_release),
+        ]
+
+    @property
+    def artists(self):
+        return (self.preview,)
+
+    @property
+    def dragging(self):
+        return self._drag is not None
+
+    def disconnect(self):
+        for callback_id in self._callback_ids:
+            self.canvas.mpl_disconnect(callback_id)
+        self._callback_ids = []
+
+    def _tool_active(self):
+        # Pan/zoom of the navigation toolbar own the mouse while they are selected
+        toolbar = getattr(self.canvas, "toolbar", None)
+        return toolbar is not None and bool(getattr(toolbar, "mode", ""))
+
+    def _tolerance(self):
+        return self.RIM_TOLERANCE_PX / abs(self.ax.transData.get_matrix()[0, 0])
+
+    def hit_test(self, x, y):
+        """
+        Returns (target, resizing) for the circle at (x, y), or None. The main
+        circle's rim is on top, then the array's circles (see
+        CircleGridIndex.hit); the inside of the main circle is only used when
+        no array circle is there, since the array's circles often lie within it.
+        """
+        tolerance = self._tolerance()
+        center_x, center_y, radius = self.main_circle()
+        distance = math.hypot(x - center_x, y - center_y)
+        on_main = distance <= radius + tolerance
+        if on_main and rim_hit(distance, radius, tolerance):
+            return MAIN, True
+        hit = self.index.hit(x, y, tolerance)
+        if hit is None and on_main:
+            return MAIN, False
+        return hit
+
+    def _current(self, target):
+        if target == MAIN:
+            return self.main_circle()
+        center_x, center_y = self.circles.centers[target]
+        return center_x, center_y, self.circles.radii[target]
+
+    def _on_press(self, event):
+        if event.button != 1 or event.inaxes is not self.ax or self._tool_active():
+            return
+        hit = self.hit_test(event.xdata, event.ydata)
+        if hit is None:
+            return
+        target, resizing = hit
+        center_x, center_y, radius = self._current(target)
+        self._drag = (target, resizing, center_x - event.xdata, center_y - event.ydata)
+        self._pointer = (event.xdata, event.ydata)
+        self.scheduler.cancel("hover")
+        if target != MAIN:
+            self.preview.set_center((center_x, center_y))
+            self.preview.set_radius(radius)
+            self.preview.set_visible(True)
+            self._preview_changed()
+
+    def _on_motion(self, event):
+        if event.inaxes is not self.ax:
+            if self._drag is None:
+                self._pointer = None
+                self.scheduler.coalesce("hover", self._apply_hover)
+            return
+        self._pointer = (event.xdata, event.ydata)
+        if self._drag is not None:
+            self.scheduler.coalesce("drag", self._apply_drag, False)
+        elif not self._tool_active():
+            self.scheduler.coalesce("hover", self._apply_hover)
+
+    def _on_release(self, event):
+        if self._drag is None or event.button != 1:
+            return
+        if event.inaxes is self.ax:
+            self._pointer = (event.xdata, event.ydata)
+        self.scheduler.cancel("drag")
+        self._apply_drag(True)
+
+    def _set_cursor(self, cursor):
+        if cursor != self._cursor:
+            self._cursor = cursor
+            self.canvas.set_cursor(cursor)
+
+    def _apply_hover(self):
+        """Coalesced: shows which action a press at the cursor would start."""
+        hit = None if self._pointer is None or self._drag is not None else self.hit_test(*self._pointer)
+        if hit is None:
+            self._set_cursor(Cursors.POINTER)
+        else:
+            self._set_cursor(Cursors.RESIZE_HORIZONTAL if hit[1] else Cursors.MOVE)
+
+    def _dragged_circle(self):
+        """New (center x, center y, radius) of the dragged circle for the current pointer."""
+        target, resizing, offset_x, offset_y = self._drag
+        center_x, center_y, radius = self._current(target)
+        if target != MAIN: # The array is only written on release
+            center_x, center_y = self.preview.center
+            radius = self.preview.radius
+        x, y = self._pointer
+        if resizing:
+            return center_x, center_y, math.hypot(x - center_x, y - center_y)
+        return x + offset_x, y + offset_y, radius
+
+    def _apply_drag(self, final):
+        """Coalesced: moves or resizes the dragged circle to the newest pointer position."""
+        if self._drag is None:
+            return
+        target = self._drag[0]
+        center_x, center_y, radius = self._dragged_circle()
+        if target == MAIN:
+            self.on_main_drag(center_x, center_y, radius, final)
+        else:
+            radius = max(radius, self._tolerance()) # Stay large enough to grab again
+            self.preview.set_center((center_x, center_y))
+            self.preview.set_radius(radius)
+            if final:
+                # Like its preview, the dropped circle ends up in front of the others
+                old = self._current(target)
+                self.preview.set_visible(False)
+                target = self.circles.bring_to_front(target)
+                self.circles.centers[target] = (center_x, center_y)
+                self.circles.radii[target] = radius
+                self.circles.target_radii[target] = radius
+                self.index.invalidate() # The circles behind it moved down one index
+                self.on_circles_changed(target, old)
+            else:
+                self._preview_changed()
+        if final:
+            self._drag = None
+
+    def _preview_changed(self):
+        if self.on_preview_changed is not None:
+            self.on_preview_changed()
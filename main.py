@@ -1,9 +1,20 @@
+import time
+STARTUP_ORIGIN = time.perf_counter() # Taken before the other imports, for --startup-report
+
+import collections
+import math
+import sys
 import tkinter as tk
 from tkinter import ttk, font as tkFont # Import font
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import matplotlib.pyplot as plt
-from matplotlib.patches import Wedge
-import numpy as np
+
+# matplotlib, and the modules that build on it, are imported by create_canvas
+# after the window is shown: importing them takes most of the startup time.
+from circle_model import ACCENT_COLOR, BG_COLOR, PI_SEGMENT_COLOR, TEXT_COLOR, CircleModel, view_half_extent
+from executor import BackgroundExecutor
+from perf_trace import FrameProfiler
+from polygon_pi import MAX_DOUBLINGS, MAX_SIDES, MIN_SIDES, polygon_bounds
+from scheduler import AnimatedValue, FrameScheduler
+from view_model import WidgetState
 
 class CircleVisualization:
     """
@@ -11,17 +22,26 @@ class CircleVisualization:
     allowing users to interactively change its center coordinates and radius.
     The application demonstrates geometric concepts like diameter, circumference,
     and the ratio Pi, with smooth animations for radius changes.
+    It is a thin Tk view over the headless CircleModel and CircleRenderer.
     """
     # --- Color Palette and Font ---
-    BG_COLOR = "#F0F0F0"
-    TEXT_COLOR = "#333333"
-    ACCENT_COLOR = "#007ACC"
-    ACCENT_LIGHT_FILL = "#E6F2FF" # Light shade for circle fill (optional)
-    PI_SEGMENT_COLOR = "#005C99" # Darker shade of accent for Pi segment
+    BG_COLOR = BG_COLOR
+    TEXT_COLOR = TEXT_COLOR
+    ACCENT_COLOR = ACCENT_COLOR
+    PI_SEGMENT_COLOR = PI_SEGMENT_COLOR
     FONT_FAMILY = "Arial"
     FONT_SIZE = 10
 
+    # --- Many-circles mode ---
+    MAX_CIRCLES = 100_000 # A full redraw of this many circles already takes seconds
+
+    # --- Digits of Pi ---
+    PI_DIGITS_PER_LINE = 50
+    PI_DIGITS_PER_FRAME = 20000 # Digits inserted into the panel per frame, so long runs stay smooth
+    MAX_PI_DIGITS = 10**7
+
     def __init__(self, root):
+        self.startup_times = {"init": time.perf_counter()} # Milestones, see --startup-report
         self.root = root
         self.root.title("Visualisasi Lingkaran")
         self.root.configure(bg=self.BG_COLOR)
@@ -66,16 +86,66 @@ class CircleVisualization:
         self.center_y = tk.DoubleVar(value=0.0)
         self.radius = tk.DoubleVar(value=5.0) # This will store the TARGET radius
         self.radius_entry_var = tk.StringVar(value=str(self.radius.get()))
-        self.pi_value = np.pi
+        self.circle_count_var = tk.StringVar(value="1000") # Circles added per action in many-circles mode
+        self.monte_carlo_samples_var = tk.StringVar(value="100000000")
+        self.monte_carlo_use_processes = tk.BooleanVar(value=False)
+        self.monte_carlo_job = None # Running Monte Carlo executor job, if any
+        self.pi_digits_var = tk.StringVar(value="10000")
+        self.pi_digits_use_processes = tk.BooleanVar(value=True)
+        self.pi_precision_var = tk.StringVar(value="50")
+        self.pi_digits_job = None # Running Chudnovsky executor job, if any
+        self.pi_cache = None # PiDigitCache, opened on first use
+        self._pi_digits_pending = collections.deque() # Streamed digits not yet in the panel
+        self._pi_digits_shown = 0
+        self._precise_key = None # (radius, precision, cached digits) of the precise circumference shown
+        self.show_polygons = tk.BooleanVar(value=False)
+        self.polygon_doublings = tk.DoubleVar(value=0) # The slider picks 6 * 2**doublings sides
+        self.polygon_sides_var = tk.StringVar(value="6") # Any number of sides can be typed
+        self.polygon_sides = 6
+        self.profiling_enabled = tk.BooleanVar(value=False)
+        self.profiler = FrameProfiler() # Only hooked into the hot paths while profiling is enabled
+        self.recording_enabled = tk.BooleanVar(value=False)
+        self.recorder = None # FrameRecorder while recording
+        self._record_frame = False # The radius animation changed the frame being rendered
+        self.model = CircleModel(self.center_x.get(), self.center_y.get(), self.radius.get())
 
         # --- Animation Attributes ---
-        self.current_display_radius = tk.DoubleVar(value=self.radius.get()) # Actual displayed radius
+        # Per-frame state is kept in plain floats (the model holds the target radius);
+        # the Tk variables are only read when the user changes a control.
+        self.display_radius = self.model.radius # Actual displayed radius
         self.is_animating_radius = False
-        self.animation_job_id = None
-        self.ANIMATION_DELAY_MS = 15 # ms between animation frames
-        self.ANIMATION_STEP_SIZE = 0.05 # Multiplier for change per frame (e.g., 5% of remaining difference)
+        self.ANIMATION_FRAME_RATE = 60 # Target frames per second of the animation loop
+        self.ANIMATION_DELAY_MS = 15 # Reference time span for ANIMATION_STEP_SIZE
+        self.ANIMATION_STEP_SIZE = 0.05 # Fraction of the remaining difference covered every ANIMATION_DELAY_MS
         self.ANIMATION_THRESHOLD = 0.01 # If difference is less than this, snap to target
 
+        # Time-based animation loop shared by everything that animates per frame
+        self.scheduler = FrameScheduler(self.root, frame_rate=self.ANIMATION_FRAME_RATE)
+        # Heavy computations run in the background; their results are delivered once per frame
+        self.executor = BackgroundExecutor(self.scheduler)
+        # Label texts, widget states and variable writes are diffed and pushed to Tk once per frame
+        self.widget_state = WidgetState(on_pending=self._request_widget_flush)
+        self._texts_radius = None # Target radius the value labels were last formatted for
+        self.radius_animation = AnimatedValue(
+            self.radius.get(),
+            step_size=self.ANIMATION_STEP_SIZE,
+            step_interval=self.ANIMATION_DELAY_MS / 1000,
+            threshold=self.ANIMATION_THRESHOLD
+        )
+
+        # --- View Attributes ---
+        # The view snaps to discrete zoom levels with cached tick layouts
+        self.ANIMATE_ZOOM = True # Ease between zoom levels instead of jumping
+        self.zoom_ladder = None # ZoomLadder, created with the canvas
+        self.zoom_index = None # Current level in zoom_ladder.levels
+        self.view_center = None
+        self.view_animation = AnimatedValue(
+            0.0,
+            step_size=0.2, # Faster than the radius so the circle stays in view
+            step_interval=self.ANIMATION_DELAY_MS / 1000,
+            threshold=0.01
+        )
+
         self.control_frame = ttk.Frame(self.root, style="TFrame")
         self.control_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         
@@ -83,8 +153,21 @@ class CircleVisualization:
         self.canvas_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         self.create_controls()
+        # Show the window with its controls while the canvas is being built. Input
+        # that arrives in the meantime is handled once the canvas exists.
+        self.loading_label = ttk.Label(self.canvas_frame, text="Memuat kanvas...")
+        self.loading_label.pack(expand=True)
+        self.root.update()
+        self.startup_times["window"] = time.perf_counter()
+
         self.create_canvas()
+        self.startup_times["canvas"] = time.perf_counter()
+        self._redraw_requested = False
+        self.scheduler.add_frame_callback(self._render_frame)
         self.update_circle()
+        self.startup_times["first_frame"] = time.perf_counter()
+        # The toolbar is only needed once the user interacts, so it is built after the first paint
+        self.root.after_idle(self._finish_startup)
 
     def create_controls(self):
         # Group for Input Controls
@@ -169,188 +252,939 @@ class CircleVisualization:
         )
         self.pi_ratio_label.pack(pady=3, anchor=tk.W)
 
+        # Separator
+        ttk.Separator(self.control_frame, orient='horizontal').pack(fill=tk.X, pady=10)
+
+        # The modes share one notebook, so that the panel fits the window
+        mode_notebook = ttk.Notebook(self.control_frame)
+        mode_notebook.pack(fill=tk.BOTH, expand=True, pady=(5,0))
+
+        # Group for the many-circles mode
+        multi_circle_frame = ttk.Frame(mode_notebook, style="TFrame", padding=5)
+        mode_notebook.add(multi_circle_frame, text="Lingkaran")
+
+        ttk.Label(multi_circle_frame, text="Banyak Lingkaran - Jumlah:").pack(pady=(5,2), anchor=tk.W)
+        self.circle_count_entry = ttk.Entry(
+            multi_circle_frame,
+            textvariable=self.circle_count_var,
+            font=self.default_font
+        )
+        self.circle_count_entry.pack(pady=(0,5), fill=tk.X, padx=2)
+
+        multi_circle_buttons = ttk.Frame(multi_circle_frame, style="TFrame")
+        multi_circle_buttons.pack(fill=tk.X, pady=5)
+        ttk.Button(
+            multi_circle_buttons,
+            text="Sampel Acak",
+            command=self.on_add_random_circles,
+            style="TButton"
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(
+            multi_circle_buttons,
+            text="Sapuan Radius",
+            command=self.on_add_radius_sweep,
+            style="TButton"
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(
+            multi_circle_buttons,
+            text="Hapus Semua",
+            command=self.on_clear_circles,
+            style="TButton"
+        ).pack(side=tk.LEFT, padx=2)
+
+        self.circle_count_label = ttk.Label(multi_circle_frame, text="Lingkaran: 0")
+        self.circle_count_label.pack(pady=3, anchor=tk.W)
+
+        # Group for the Monte Carlo estimation of Pi
+        monte_carlo_frame = ttk.Frame(mode_notebook, style="TFrame", padding=5)
+        mode_notebook.add(monte_carlo_frame, text="Monte Carlo")
+
+        ttk.Label(monte_carlo_frame, text="Monte Carlo - Jumlah Sampel:").pack(pady=(5,2), anchor=tk.W)
+        self.monte_carlo_samples_entry = ttk.Entry(
+            monte_carlo_frame,
+            textvariable=self.monte_carlo_samples_var,
+            font=self.default_font
+        )
+        self.monte_carlo_samples_entry.pack(pady=(0,5), fill=tk.X, padx=2)
+        ttk.Checkbutton(
+            monte_carlo_frame,
+            text="Gunakan banyak proses",
+            variable=self.monte_carlo_use_processes
+        ).pack(pady=2, anchor=tk.W)
+
+        monte_carlo_buttons = ttk.Frame(monte_carlo_frame, style="TFrame")
+        monte_carlo_buttons.pack(fill=tk.X, pady=5)
+        self.monte_carlo_start_button = ttk.Button(
+            monte_carlo_buttons,
+            text="Mulai",
+            command=self.on_monte_carlo_start,
+            style="TButton"
+        )
+        self.monte_carlo_start_button.pack(side=tk.LEFT, padx=2)
+        self.monte_carlo_stop_button = ttk.Button(
+            monte_carlo_buttons,
+            text="Hentikan",
+            command=self.on_monte_carlo_stop,
+            style="TButton",
+            state=tk.DISABLED
+        )
+        self.monte_carlo_stop_button.pack(side=tk.LEFT, padx=2)
+
+        self.monte_carlo_estimate_label = ttk.Label(monte_carlo_frame, text="Estimasi Pi: -")
+        self.monte_carlo_estimate_label.pack(pady=3, anchor=tk.W)
+        self.monte_carlo_error_label = ttk.Label(monte_carlo_frame, text="Galat: -")
+        self.monte_carlo_error_label.pack(pady=3, anchor=tk.W)
+        self.monte_carlo_samples_label = ttk.Label(monte_carlo_frame, text="Sampel: 0")
+        self.monte_carlo_samples_label.pack(pady=3, anchor=tk.W)
+
+        # Group for Archimedes' polygon approximation of Pi
+        polygon_frame = ttk.Frame(mode_notebook, style="TFrame", padding=5)
+        mode_notebook.add(polygon_frame, text="Poligon")
+
+        ttk.Checkbutton(
+            polygon_frame,
+            text="Tampilkan Poligon Archimedes",
+            variable=self.show_polygons,
+            command=self.on_polygon_changed
+        ).pack(pady=2, anchor=tk.W)
+        self.polygon_slider = ttk.Scale(
+            polygon_frame,
+            from_=0,
+            to=MAX_DOUBLINGS,
+            orient='horizontal',
+            variable=self.polygon_doublings,
+            command=self.on_polygon_slider_moved,
+            style="Horizontal.TScale"
+        )
+        self.polygon_slider.pack(pady=(0,5), fill=tk.X, padx=2)
+
+        polygon_sides_row = ttk.Frame(polygon_frame, style="TFrame")
+        polygon_sides_row.pack(fill=tk.X, pady=3)
+        ttk.Label(polygon_sides_row, text="Sisi Poligon:").pack(side=tk.LEFT, padx=2)
+        self.polygon_sides_entry = ttk.Entry(
+            polygon_sides_row,
+            textvariable=self.polygon_sides_var,
+            width=10,
+            font=self.default_font
+        )
+        self.polygon_sides_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        self.polygon_sides_entry.bind("<Return>", self.on_polygon_sides_submitted)
+        self.polygon_sides_entry.bind("<FocusOut>", self.on_polygon_sides_submitted)
+
+        lower, upper = polygon_bounds(self.polygon_sides)
+        self.polygon_lower_label = ttk.Label(polygon_frame, text=f"Batas Bawah Pi: {lower:.12f}")
+        self.polygon_lower_label.pack(pady=3, anchor=tk.W)
+        self.polygon_upper_label = ttk.Label(polygon_frame, text=f"Batas Atas Pi: {upper:.12f}")
+        self.polygon_upper_label.pack(pady=3, anchor=tk.W)
+
+        # Group for the digits of Pi (Chudnovsky series); rows are kept compact to fit the tab
+        pi_digits_frame = ttk.Frame(mode_notebook, style="TFrame", padding=5)
+        mode_notebook.add(pi_digits_frame, text="Digit Pi")
+
+        pi_digits_row = ttk.Frame(pi_digits_frame, style="TFrame")
+        pi_digits_row.pack(fill=tk.X, pady=(5,2))
+        ttk.Label(pi_digits_row, text="Jumlah Digit:").pack(side=tk.LEFT, padx=2)
+        self.pi_digits_entry = ttk.Entry(
+            pi_digits_row,
+            textvariable=self.pi_digits_var,
+            width=10,
+            font=self.default_font
+        )
+        self.pi_digits_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        self.pi_digits_entry.bind("<Return>", self.on_pi_digits_start)
+        self.pi_digits_start_button = ttk.Button(
+            pi_digits_row,
+            text="Hitung",
+            command=self.on_pi_digits_start,
+            style="TButton"
+        )
+        self.pi_digits_start_button.pack(side=tk.LEFT, padx=2)
+        self.pi_digits_stop_button = ttk.Button(
+            pi_digits_row,
+            text="Hentikan",
+            command=self.on_pi_digits_stop,
+            style="TButton",
+            state=tk.DISABLED
+        )
+        self.pi_digits_stop_button.pack(side=tk.LEFT, padx=2)
+
+        pi_digits_options = ttk.Frame(pi_digits_frame, style="TFrame")
+        pi_digits_options.pack(fill=tk.X, pady=2)
+        ttk.Checkbutton(
+            pi_digits_options,
+            text="Hitung di proses terpisah",
+            variable=self.pi_digits_use_processes
+        ).pack(side=tk.LEFT, padx=2)
+        self.pi_digits_status_label = ttk.Label(pi_digits_options, text="Digit: -")
+        self.pi_digits_status_label.pack(side=tk.RIGHT, padx=2)
+
+        # Scrolling panel the digits are streamed into, PI_DIGITS_PER_LINE per line.
+        # It is read-only; _insert_pi_digits enables it for the moment it inserts.
+        pi_digits_panel = ttk.Frame(pi_digits_frame, style="TFrame")
+        pi_digits_panel.pack(fill=tk.X, pady=(2,5), padx=2)
+        self.pi_digits_text = tk.Text(
+            pi_digits_panel,
+            height=4,
+            width=self.PI_DIGITS_PER_LINE + 2,
+            wrap=tk.NONE,
+            font=("Courier", self.FONT_SIZE - 1),
+            background="white",
+            foreground=self.TEXT_COLOR,
+            state=tk.DISABLED
+        )
+        pi_digits_scrollbar = ttk.Scrollbar(pi_digits_panel, orient=tk.VERTICAL, command=self.pi_digits_text.yview)
+        self.pi_digits_text.configure(yscrollcommand=pi_digits_scrollbar.set)
+        pi_digits_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.pi_digits_text.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        pi_precision_row = ttk.Frame(pi_digits_frame, style="TFrame")
+        pi_precision_row.pack(fill=tk.X, pady=2)
+        ttk.Label(pi_precision_row, text="Presisi Keliling (digit):").pack(side=tk.LEFT, padx=2)
+        self.pi_precision_entry = ttk.Entry(
+            pi_precision_row,
+            textvariable=self.pi_precision_var,
+            width=10,
+            font=self.default_font
+        )
+        self.pi_precision_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        self.pi_precision_entry.bind("<Return>", self.on_pi_precision_submitted)
+        self.precise_circumference_label = ttk.Label(pi_digits_frame, text="Keliling: -")
+        self.precise_circumference_label.pack(pady=2, anchor=tk.W)
+        self.precise_circumference_text = tk.Text(
+            pi_digits_frame,
+            height=2,
+            width=self.PI_DIGITS_PER_LINE + 2,
+            wrap=tk.NONE,
+            font=("Courier", self.FONT_SIZE - 1),
+            background="white",
+            foreground=self.TEXT_COLOR,
+            state=tk.DISABLED
+        )
+        self.precise_circumference_text.pack(pady=(0,5), fill=tk.X, padx=2)
+
+        # Group for performance diagnostics
+        performance_frame = ttk.Frame(mode_notebook, style="TFrame", padding=5)
+        mode_notebook.add(performance_frame, text="Kinerja")
+        ttk.Checkbutton(
+            performance_frame,
+            text="Profil Kinerja (FPS/p95)",
+            variable=self.profiling_enabled,
+            command=self.on_profiling_toggled
+        ).pack(pady=2, anchor=tk.W)
+        ttk.Button(
+            performance_frame,
+            text="Simpan Jejak...",
+            command=self.on_save_trace,
+            style="TButton"
+        ).pack(pady=5, anchor=tk.W, padx=2)
+        ttk.Checkbutton(
+            performance_frame,
+            text="Rekam Animasi",
+            variable=self.recording_enabled,
+            command=self.on_recording_toggled
+        ).pack(pady=2, anchor=tk.W)
+
     def create_canvas(self):
-        self.figure, self.ax = plt.subplots(figsize=(6, 6))
-        self.figure.patch.set_facecolor(self.BG_COLOR) # Figure background
-        self.ax.set_facecolor(self.BG_COLOR) # Axes background
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from blitting import BlitManager
+        from circle_core import CircleRenderer
+        from interaction import CircleInteraction
+        from monte_carlo import MonteCarloLayer
+        from multi_circle import CircleArray, MultiCircleLayer
+        from perf_trace import PerformanceOverlay
+        from polygon_pi import PolygonLayer
+        from spatial_index import CircleGridIndex
+        from zoom_levels import ZoomLadder
 
-        self.ax.set_xlim(-15, 15)
-        self.ax.set_ylim(-15, 15)
-        self.ax.set_aspect('equal')
-        
-        # Axis and grid colors
-        axis_color = self.TEXT_COLOR # Or a slightly lighter gray
-        grid_color = '#CCCCCC' # Light gray for grid
-        self.ax.axhline(0, color=axis_color, lw=0.8)
-        self.ax.axvline(0, color=axis_color, lw=0.8)
-        self.ax.grid(True, color=grid_color, linestyle='--', linewidth=0.5)
-
-        # Tick label colors
-        self.ax.tick_params(axis='x', colors=self.TEXT_COLOR)
-        self.ax.tick_params(axis='y', colors=self.TEXT_COLOR)
-
-        # Spine colors (borders of the plot)
-        for spine in self.ax.spines.values():
-            spine.set_edgecolor(axis_color)
-
-        self.circle_patch = plt.Circle(
-            (self.center_x.get(), self.center_y.get()),
-            radius=self.radius.get(),
-            fill=False, # Keeping fill transparent for now, can use ACCENT_LIGHT_FILL
-            # edgecolor=self.ACCENT_COLOR, # Initial edge color, will be updated
-            lw=2
-        )
-        self.ax.add_patch(self.circle_patch)
-        
-        self.pi_segment = Wedge(
-            center=(self.center_x.get(), self.center_y.get()),
-            r=self.current_display_radius.get(), # Use current_display_radius for initial setup
-            theta1=0,
-            theta2=(self.get_pi_ratio(self.current_display_radius.get()) / np.pi) * 360,
-            width=0.05 * self.current_display_radius.get(), # Make width relative to display radius
-            facecolor=self.PI_SEGMENT_COLOR,
-            alpha=0.7 # Slightly more opaque
-        )
-        self.ax.add_patch(self.pi_segment)
+        self.loading_label.destroy()
+        self.zoom_ladder = ZoomLadder()
+        self.renderer = CircleRenderer(figsize=(6, 6))
+        self.figure = self.renderer.figure
+        self.ax = self.renderer.ax
+        self.circle_patch = self.renderer.circle_patch
+        self.pi_segment = self.renderer.pi_segment
+        self.renderer.update(self.model, display_radius=self.display_radius)
+
+        # Many-circles mode: all extra circles live in arrays drawn by two collections
+        self.circles = CircleArray()
+        self.multi_circle_layer = MultiCircleLayer(self.ax, self.circles)
+        self.circle_index = CircleGridIndex(self.circles) # Hit-testing for mouse interaction
+        self._circles_animated = False # Collections are redrawn per frame only while they grow
+
+        # Density of the Monte Carlo samples, drawn over the circle's bounding square
+        self.monte_carlo_layer = MonteCarloLayer(self.ax, self.ACCENT_COLOR, self.TEXT_COLOR)
+
+        # Inscribed/circumscribed polygons of Archimedes' approximation
+        self.polygon_layer = PolygonLayer(self.ax, self.TEXT_COLOR)
+
+        # FPS / frame-time readout, only visible while profiling
+        self.performance_overlay = PerformanceOverlay(self.ax, self.TEXT_COLOR)
         
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.canvas_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.configure(bg=self.BG_COLOR)
         self.canvas_widget.pack(fill=tk.BOTH, expand=True)
-        
+        self.toolbar = None # Created by _finish_startup
+
+        # Drag circles to move them, drag their rim to resize them
+        self.interaction = CircleInteraction(
+            self.canvas, self.ax, self.scheduler, self.circles, self.circle_index,
+            main_circle=self._main_circle,
+            on_main_drag=self._on_main_circle_dragged,
+            on_circles_changed=self._on_circles_edited,
+            on_preview_changed=self.request_redraw,
+            color=self.ACCENT_COLOR
+        )
+
+        # Only the circle and the Pi segment change between animation frames;
+        # everything else is cached as a background and blitted.
+        self.blit_manager = BlitManager(
+            self.canvas,
+            (self.monte_carlo_layer.image, self.circle_patch, self.pi_segment)
+            + self.polygon_layer.artists
+            + (self.performance_overlay.text,)
+            + self.interaction.artists
+        )
+
+    def _finish_startup(self):
+        """Runs once the first frame is on screen: builds the navigation toolbar."""
+        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+        self.startup_times["first_paint"] = time.perf_counter()
+
         # Style the toolbar
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.canvas_frame, pack_toolbar=False)
         self.toolbar.configure(background=self.BG_COLOR)
         for button in self.toolbar.winfo_children():
             button.configure(bg=self.BG_COLOR)
         self.toolbar.update()
-        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Packed before the canvas, so that the canvas and not the toolbar shrinks
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X, before=self.canvas_widget)
+        self.startup_times["toolbar"] = time.perf_counter()
 
     def get_diameter(self, radius_val=None):
         """Calculates diameter based on a given radius or the current target radius."""
         if radius_val is None:
-            radius_val = self.radius.get() # Use target radius if no specific value provided
-        return radius_val * 2
+            radius_val = self.model.radius # Use target radius if no specific value provided
+        return self.model.get_diameter(radius_val)
 
     def get_circumference(self, radius_val=None):
         """Calculates circumference based on a given radius or the current target radius."""
         if radius_val is None:
-            radius_val = self.radius.get() # Use target radius
-        return self.pi_value * self.get_diameter(radius_val)
+            radius_val = self.model.radius # Use target radius
+        return self.model.get_circumference(radius_val)
 
     def get_pi_ratio(self, radius_val=None):
         """Calculates the ratio of circumference to diameter (Pi) for a given radius or the current target radius."""
         if radius_val is None:
-            radius_val = self.radius.get() # Use target radius
-        diameter = self.get_diameter(radius_val)
-        if diameter == 0:
-            return 0 # Avoid division by zero, effectively Pi is undefined or 0 for a point
-        return self.get_circumference(radius_val) / diameter
+            radius_val = self.model.radius # Use target radius
+        return self.model.get_pi_ratio(radius_val)
 
     def update_texts(self):
-        target_radius = self.radius.get()
-        self.radius_label.config(
-            text=f"Radius: {target_radius:.2f}"
-        )
-        self.diameter_label.config(
-            text=f"Diameter: {self.get_diameter(target_radius):.2f}"
-        )
-        self.circumference_label.config(
-            text=f"Keliling: {self.get_circumference(target_radius):.2f}"
-        )
-        self.pi_ratio_label.config(
-            text=f"Rasio Pi (Keliling/Diameter): {self.get_pi_ratio(target_radius):.5f}"
-        )
+        """Updates the labels for the target radius; only changed texts reach Tk."""
+        target_radius = self.model.radius
+        if target_radius != self._texts_radius:
+            self._texts_radius = target_radius
+            configure = self.widget_state.configure
+            configure(self.radius_label, text=f"Radius: {target_radius:.2f}")
+            configure(self.diameter_label, text=f"Diameter: {self.get_diameter(target_radius):.2f}")
+            configure(self.circumference_label, text=f"Keliling: {self.get_circumference(target_radius):.2f}")
+            configure(
+                self.pi_ratio_label,
+                text=f"Rasio Pi (Keliling/Diameter): {self.get_pi_ratio(target_radius):.5f}"
+            )
+            if self.pi_cache is not None: # Only once digits of Pi were computed or loaded
+                self.scheduler.coalesce("precise_circumference", self.update_precise_circumference)
         # Update radius_entry_var only if not focused, to prevent issues while typing
         if self.root.focus_get() != self.radius_entry:
-            self.radius_entry_var.set(f"{target_radius:.2f}")
+            self.widget_state.set_variable(self.radius_entry_var, f"{target_radius:.2f}")
 
     def _set_controls_state(self, state):
         """Enable or disable radius controls. state can be 'normal' or 'disabled'."""
-        self.radius_slider.configure(state=state)
-        self.radius_entry.configure(state=state)
+        self.widget_state.configure(self.radius_slider, state=state)
+        self.widget_state.configure(self.radius_entry, state=state)
 
-    def _perform_radius_animation_step(self):
-        if self.animation_job_id: # Clear previous job
-            self.root.after_cancel(self.animation_job_id)
-            self.animation_job_id = None
+    def _request_widget_flush(self):
+        """Makes sure pending widget changes are flushed: by this frame's render, or the next frame."""
+        if not self.scheduler.in_frame:
+            self.scheduler.coalesce("widgets", self.widget_state.flush)
 
-        target_r = self.radius.get()
-        current_r = self.current_display_radius.get()
-        difference = target_r - current_r
+    def _perform_radius_animation_step(self, dt):
+        """
+        Scheduler task that eases the displayed radius toward the target radius
+        for 'dt' seconds of elapsed time and redraws the circle.
+        Returns True while the animation should keep running.
+        """
+        target_r = self.model.radius
+        self.radius_animation.set_target(target_r)
 
-        if abs(difference) < self.ANIMATION_THRESHOLD:
-            new_r = target_r
-            self.is_animating_radius = False
-            self._set_controls_state(tk.NORMAL)
-        else:
-            new_r = current_r + difference * self.ANIMATION_STEP_SIZE
-            self.is_animating_radius = True
-            self._set_controls_state(tk.DISABLED)
-        
-        self.current_display_radius.set(new_r)
+        self.is_animating_radius = self.radius_animation.advance(dt)
+        # Diffed by the widget state, so this only reaches Tk when the state flips
+        self._set_controls_state(tk.DISABLED if self.is_animating_radius else tk.NORMAL)
+
+        new_r = self.display_radius = self.radius_animation.value
         
-        # Update visual components with current_display_radius
-        self.circle_patch.set_radius(new_r)
-        self.pi_segment.set_radius(new_r)
-        self.pi_segment.set_width(max(0.01, 0.05 * new_r))
-        # Pi segment's angle (theta2) should ideally reflect the definition of Pi based on the
-        # *target* radius, ensuring it visually represents the goal state of Pi calculation.
-        self.pi_segment.theta2 = (self.get_pi_ratio(target_r) / np.pi) * 360
+        # Update visual components with display_radius. The Pi segment's angle
+        # reflects the definition of Pi based on the *target* radius (the model radius).
+        self.renderer.update(self.model, display_radius=new_r)
+        self.monte_carlo_layer.set_bounds(self.model.center_x, self.model.center_y, new_r)
 
         # Update plot limits based on the currently displayed radius
         self._update_plot_limits(new_r)
-        self.canvas.draw_idle()
+        self.polygon_layer.update(self.model.center_x, self.model.center_y, new_r, self.polygon_sides)
+        self.request_redraw()
+        self._record_frame = self.recorder is not None
 
-        if self.is_animating_radius:
-            self.animation_job_id = self.root.after(self.ANIMATION_DELAY_MS, self._perform_radius_animation_step)
-        else: # Animation finished
-            self.current_display_radius.set(target_r) # Ensure it's exactly the target
+        if not self.is_animating_radius: # Animation finished
             # Final update of texts to ensure entry var is also correct
-            self.radius_entry_var.set(f"{target_r:.2f}")
+            self.widget_state.set_variable(self.radius_entry_var, f"{target_r:.2f}")
+        return self.is_animating_radius
+
+    def request_redraw(self):
+        """Marks the canvas for redrawing at the end of the current frame (or the next, outside a frame)."""
+        if self.scheduler.in_frame:
+            self._redraw_requested = True
+        else:
+            self.scheduler.coalesce("redraw", self.request_redraw)
+
+    def _render_frame(self):
+        """
+        Frame callback: pushes the widget changes of the frame's tasks to Tk and
+        draws everything they changed with a single blit.
+        """
+        self.widget_state.flush()
+        if self._redraw_requested:
+            self._redraw_requested = False
+            self.blit_manager.update()
+        if self._record_frame:
+            self._record_frame = False
+            self._capture_frame()
+
+    def _read_circle_count(self):
+        """
+        Returns the circle count from its entry, reduced to the room left below
+        MAX_CIRCLES, or None if the entry is invalid (and is reset) or there is no room.
+        """
+        try:
+            count = int(self.widget_state.get_variable(self.circle_count_var))
+            if not 1 <= count <= self.MAX_CIRCLES:
+                raise ValueError
+        except ValueError:
+            self.widget_state.set_variable(self.circle_count_var, "1000")
+            return None
+        count = min(count, self.MAX_CIRCLES - len(self.circles))
+        if count == 0:
+            self._show_circle_count()
+            return None
+        return count
+
+    def _show_circle_count(self):
+        full = " (maksimum)" if len(self.circles) >= self.MAX_CIRCLES else ""
+        self.widget_state.configure(self.circle_count_label, text=f"Lingkaran: {len(self.circles):,}{full}")
+
+    def _add_circles(self, centers, radii, colors):
+        """Adds circles that grow from zero to their radius using the shared animation loop."""
+        self.circle_index.update(self.circles.add(centers, radii, colors, start_radii=0.0))
+        self._show_circle_count()
+        self._set_circles_animated(True)
+        self.scheduler.add_task(self._perform_multi_circle_animation_step)
+
+    def on_add_random_circles(self, event=None):
+        """Adds randomly placed circles inside the current view."""
+        from multi_circle import random_circles
+        count = self._read_circle_count()
+        if count is not None:
+            self._add_circles(*random_circles(count, self.ax.get_xlim(), self.ax.get_ylim()))
+
+    def on_add_radius_sweep(self, event=None):
+        """Adds concentric circles around the center with radii up to the current radius."""
+        from multi_circle import radius_sweep
+        count = self._read_circle_count()
+        if count is not None:
+            center = (self.model.center_x, self.model.center_y)
+            self._add_circles(*radius_sweep(count, center, self.model.radius))
 
+    def on_clear_circles(self, event=None):
+        self.scheduler.remove_task(self._perform_multi_circle_animation_step)
+        self.circles.clear()
+        self.circle_index.invalidate()
+        self._show_circle_count()
+        self.multi_circle_layer.sync(self.model.get_pi_ratio())
+        self._set_circles_animated(False)
+        self.blit_manager.invalidate()
+        self.blit_manager.update()
+
+    def _perform_multi_circle_animation_step(self, dt):
+        """Scheduler task that grows/shrinks all extra circles toward their target radii."""
+        moving = self.circles.advance(
+            dt,
+            self.ANIMATION_STEP_SIZE,
+            self.ANIMATION_DELAY_MS / 1000,
+            self.ANIMATION_THRESHOLD
+        )
+        self.multi_circle_layer.sync(self.model.get_pi_ratio())
+        if not moving:
+            self._set_circles_animated(False)
+        self.request_redraw()
+        return moving
+
+    def _set_circles_animated(self, animated):
+        """
+        While the extra circles grow, their collections are redrawn every frame.
+        Once settled they become part of the cached background, so that frames
+        which only change the main circle or a drag preview do not redraw them.
+        """
+        if animated == self._circles_animated:
+            return
+        self._circles_animated = animated
+        for artist in self.multi_circle_layer.artists:
+            if animated:
+                self.blit_manager.add_artist(artist)
+            else:
+                self.blit_manager.remove_artist(artist)
+
+    def _on_circles_edited(self, index, old):
+        """
+        Called when a drag moved or resized one of the extra circles, which is
+        then in front of all others. Settled circles are part of the background,
+        and redrawing all of them takes seconds with 100k circles, so only the
+        ring of the circle's old outline (and Pi segment) is redrawn, with just
+        the circles that reach into it, and the circle is drawn on top.
+        """
+        from blitting import ring_tiles
+        from circle_model import pi_segment_width
+        pi_ratio = self.model.get_pi_ratio()
+        layer = self.multi_circle_layer
+        if self._circles_animated:
+            layer.sync(pi_ratio)
+            self.request_redraw()
+            return
+        x, y, radius = old
+        pixels_per_unit = abs(self.ax.transData.get_matrix()[0, 0])
+        pad = 3 / pixels_per_unit # A few pixels for the line width and antialiasing
+        inner = max(radius - float(pi_segment_width(radius)) - pad, 0.0)
+        outer = radius + pad
+        tiles = ring_tiles(*self.ax.transData.transform((x, y)), inner * pixels_per_unit, outer * pixels_per_unit)
+        reach = 1.5 * (tiles[0].width if tiles else 0) / pixels_per_unit # Tiles stick out of the ring
+        behind = layer.in_rings([(x, y, max(inner - reach, 0.0), outer + reach)])
+        behind[index] = False
+
+        def draw_on_top():
+            layer.sync(pi_ratio, subset=[index])
+            for artist in layer.artists:
+                self.figure.draw_artist(artist)
+
+        self.blit_manager.repair(
+            tiles,
+            restrict=lambda: layer.sync(pi_ratio, subset=behind),
+            unrestrict=lambda: layer.sync(pi_ratio),
+            overlay=draw_on_top
+        )
+
+    def _main_circle(self):
+        """The main circle as displayed: (center x, center y, radius)."""
+        return self.model.center_x, self.model.center_y, self.display_radius
+
+    def _on_main_circle_dragged(self, center_x, center_y, radius, final):
+        """
+        Moves/resizes the main circle to follow a mouse drag, without animation.
+        The view stays put during the drag and follows the circle on release.
+        """
+        self._stop_radius_animation()
+        radius = min(max(radius, 1), 100)
+        widget_state = self.widget_state
+        widget_state.set_variable(self.center_x, round(center_x, 2))
+        widget_state.set_variable(self.center_y, round(center_y, 2))
+        widget_state.set_variable(self.radius, radius)
+        self.model.center_x = center_x
+        self.model.center_y = center_y
+        self.model.radius = radius
+        self.radius_animation.snap(radius)
+        self.display_radius = radius
+        self.update_texts()
+        if final:
+            # Recentering moves every extra circle, i.e. redraws all of them
+            self.update_circle_visuals(use_current_display_radius=True, keep_view=True)
+            return
+        self.renderer.update(self.model, display_radius=radius)
+        self.monte_carlo_layer.set_bounds(center_x, center_y, radius)
+        self.polygon_layer.update(center_x, center_y, radius, self.polygon_sides)
+        self.request_redraw()
+
+    def on_profiling_toggled(self, event=None):
+        """
+        Hooks the profiler into the per-frame hot paths, or removes it again so that
+        a disabled profiler costs nothing.
+        """
+        if self.profiling_enabled.get() and not self.profiler.enabled:
+            self.profiler.clear()
+            self.profiler.instrument(self.scheduler, "_tick", "frame")
+            self.profiler.instrument(self, "_perform_radius_animation_step", "radius_step")
+            self.profiler.instrument(self, "update_texts")
+            self.profiler.instrument(self, "update_circle_visuals")
+            self.profiler.instrument(self.blit_manager, "update", "blit")
+            self.profiler.instrument(self.canvas, "draw", "full_draw")
+            self.scheduler.add_frame_callback(self._refresh_performance_overlay)
+            self.performance_overlay.text.set_visible(True)
+        elif not self.profiling_enabled.get() and self.profiler.enabled:
+            self.profiler.uninstrument()
+            self.scheduler.remove_frame_callback(self._refresh_performance_overlay)
+            self.performance_overlay.text.set_visible(False)
+        self.blit_manager.update()
+
+    def _refresh_performance_overlay(self):
+        if self.performance_overlay.update(self.profiler):
+            self.request_redraw()
+            self._render_frame() # This callback runs after the regular render
+
+    def on_save_trace(self, event=None):
+        """Saves the recorded trace as a Chrome trace (*.trace.json) or plain JSON."""
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(
+            title="Simpan Jejak Kinerja",
+            defaultextension=".trace.json",
+            filetypes=[("Chrome Trace", "*.trace.json"), ("JSON", "*.json")]
+        )
+        if path:
+            self.profiler.dump(path)
+
+    def on_recording_toggled(self, event=None):
+        """
+        Starts recording the frames of radius animations to a file chosen by the
+        user (a video through ffmpeg, a PNG sequence or raw RGBA), or stops it.
+        """
+        if not self.recording_enabled.get():
+            error = self._stop_recording()
+            if error is not None:
+                self._show_recording_error(error)
+            return
+        from tkinter import filedialog
+        from recorder import FrameRecorder, open_sink
+        path = filedialog.asksaveasfilename(
+            title="Rekam Animasi",
+            defaultextension=".mp4",
+            filetypes=[("Video (ffmpeg)", "*.mp4"), ("Urutan PNG", "*.png"), ("RGBA Mentah", "*.rgba")]
+        )
+        if not path:
+            self.recording_enabled.set(False)
+            return
+        height, width = self.canvas.buffer_rgba().shape[:2]
+        try:
+            sink = open_sink(path, width, height, self.ANIMATION_FRAME_RATE)
+        except (RuntimeError, OSError) as error:
+            self.recording_enabled.set(False)
+            self._show_recording_error(error)
+            return
+        self.recorder = FrameRecorder(sink, fps=self.ANIMATION_FRAME_RATE)
+
+    def _capture_frame(self):
+        """Hands the frame that was just rendered to the recorder."""
+        try:
+            self.recorder.capture(self.canvas, self.scheduler.clock())
+        except (RuntimeError, ValueError, OSError) as error:
+            self._stop_recording()
+            self._show_recording_error(error)
+
+    def _show_recording_error(self, error):
+        from tkinter import messagebox
+        messagebox.showerror("Rekam Animasi", str(error))
+
+    def _stop_recording(self):
+        """Finishes writing the recording; returns the error of the sink, if any."""
+        recorder, self.recorder = self.recorder, None
+        self.recording_enabled.set(False)
+        if recorder is None:
+            return None
+        try:
+            recorder.close()
+        except (RuntimeError, OSError) as error:
+            return error
+        return None
+
+    def on_polygon_changed(self, event=None):
+        """Called when the polygon checkbox toggles or the side count changed; applied once per frame."""
+        self.scheduler.coalesce("polygon", self._apply_polygon_settings)
+
+    def on_polygon_slider_moved(self, event=None):
+        """The slider steps through 6 * 2**k sides."""
+        self.polygon_sides = 6 * 2 ** int(round(self.polygon_doublings.get()))
+        self.on_polygon_changed()
+
+    def on_polygon_sides_submitted(self, event=None):
+        """Takes any side count from MIN_SIDES to MAX_SIDES from the entry; invalid input is reset."""
+        widget_state = self.widget_state
+        try:
+            sides = int(widget_state.get_variable(self.polygon_sides_var).replace(",", ""))
+            if not MIN_SIDES <= sides <= MAX_SIDES:
+                raise ValueError
+        except ValueError:
+            widget_state.set_variable(self.polygon_sides_var, f"{self.polygon_sides:,}")
+            return
+        self.polygon_sides = sides
+        # Moves the slider to about the matching doubling (it does not call its command)
+        widget_state.set_variable(self.polygon_doublings, min(max(math.log2(sides / 6), 0), MAX_DOUBLINGS))
+        self.on_polygon_changed()
+
+    def _apply_polygon_settings(self):
+        lower, upper = polygon_bounds(self.polygon_sides) # Memoized
+        if self.root.focus_get() != self.polygon_sides_entry: # Not while typing
+            self.widget_state.set_variable(self.polygon_sides_var, f"{self.polygon_sides:,}")
+        configure = self.widget_state.configure
+        configure(self.polygon_lower_label, text=f"Batas Bawah Pi: {lower:.12f}")
+        configure(self.polygon_upper_label, text=f"Batas Atas Pi: {upper:.12f}")
+
+        self.polygon_layer.enabled = self.show_polygons.get()
+        self.polygon_layer.update(
+            self.model.center_x,
+            self.model.center_y,
+            self.display_radius,
+            self.polygon_sides
+        )
+        self.request_redraw()
+
+    def on_monte_carlo_start(self, event=None):
+        """Starts estimating Pi by sampling points in the circle's bounding square."""
+        from monte_carlo import MonteCarloPiEstimator
+        try:
+            samples = int(float(self.widget_state.get_variable(self.monte_carlo_samples_var))) # Accepts e.g. 1e8
+            if not 1 <= samples <= 10**12:
+                raise ValueError
+        except ValueError: # Invalid input, reset to the default
+            self.widget_state.set_variable(self.monte_carlo_samples_var, "100000000")
+            return
+
+        estimator = MonteCarloPiEstimator(samples)
+        if self.monte_carlo_use_processes.get():
+            args = (self.executor.process_pool, self.executor.process_workers)
+        else:
+            args = ()
+        # Submitting under the same key supersedes (cancels) a run that is still going
+        self.monte_carlo_job = self.executor.submit(
+            estimator.run, *args,
+            key="monte_carlo",
+            stream=True,
+            latest_only=True, # Each update is a full snapshot, only the newest is shown
+            on_update=self._show_monte_carlo,
+            on_result=self._finish_monte_carlo
+        )
+        self.widget_state.configure(self.monte_carlo_start_button, state=tk.DISABLED)
+        self.widget_state.configure(self.monte_carlo_stop_button, state=tk.NORMAL)
+
+    def on_monte_carlo_stop(self, event=None):
+        """Stops sampling; the estimate shown so far is kept."""
+        if self.monte_carlo_job is not None:
+            self.monte_carlo_job.cancel()
+            self._finish_monte_carlo(None)
+
+    def _show_monte_carlo(self, update):
+        """Shows a Monte Carlo result; called by the executor on the UI thread, once per frame at most."""
+        configure = self.widget_state.configure
+        if update.samples:
+            configure(self.monte_carlo_estimate_label, text=f"Estimasi Pi: {update.estimate:.6f}")
+            configure(
+                self.monte_carlo_error_label,
+                text=f"Galat: {update.error:+.6f} (\u00b1{update.standard_error:.6f})"
+            )
+            self.monte_carlo_layer.show(update)
+            self.request_redraw()
+        configure(self.monte_carlo_samples_label, text=f"Sampel: {update.samples:,}")
+
+    def _finish_monte_carlo(self, update):
+        if update is not None:
+            self._show_monte_carlo(update)
+        self.monte_carlo_job = None
+        self.widget_state.configure(self.monte_carlo_start_button, state=tk.NORMAL)
+        self.widget_state.configure(self.monte_carlo_stop_button, state=tk.DISABLED)
+
+    def _open_pi_cache(self):
+        """Opens the on-disk digit cache on first use; returns None if it cannot be opened."""
+        if self.pi_cache is None:
+            from pi_digits import PiDigitCache
+            try:
+                self.pi_cache = PiDigitCache()
+            except OSError as error: # E.g. a read-only home directory; digits are then not kept
+                print(f"Digit cache unavailable: {error}", file=sys.stderr)
+        return self.pi_cache
+
+    def on_pi_digits_start(self, event=None):
+        """Computes the digits of Pi in the background and streams them into the panel."""
+        from pi_digits import compute_pi_digits
+        try:
+            digits = int(float(self.widget_state.get_variable(self.pi_digits_var))) # Accepts e.g. 1e6
+            if not 1 <= digits <= self.MAX_PI_DIGITS:
+                raise ValueError
+        except ValueError: # Invalid input, reset to the default
+            self.widget_state.set_variable(self.pi_digits_var, "10000")
+            return
+
+        self._pi_digits_pending.clear()
+        self._pi_digits_shown = 0
+        self.pi_digits_text.configure(state=tk.NORMAL)
+        self.pi_digits_text.delete("1.0", tk.END)
+        self.pi_digits_text.insert(tk.END, "3.")
+        self.pi_digits_text.configure(state=tk.DISABLED)
+        # Submitting under the same key supersedes (cancels) a run that is still going
+        self.pi_digits_job = self.executor.submit(
+            compute_pi_digits, digits, self._open_pi_cache(), self.pi_digits_use_processes.get(),
+            key="pi_digits",
+            stream=True, # Every update carries new digits, so none may be dropped
+            on_update=self._show_pi_digits,
+            on_result=self._finish_pi_digits,
+            on_error=self._fail_pi_digits
+        )
+        self.widget_state.configure(self.pi_digits_status_label, text=f"Menghitung {digits:,} digit...")
+        self.widget_state.configure(self.pi_digits_start_button, state=tk.DISABLED)
+        self.widget_state.configure(self.pi_digits_stop_button, state=tk.NORMAL)
+
+    def on_pi_digits_stop(self, event=None):
+        """Stops the computation; the digits computed so far stay cached."""
+        if self.pi_digits_job is not None:
+            self.pi_digits_job.cancel()
+            self._finish_pi_digits(None)
+
+    def _show_pi_digits(self, update):
+        """Queues streamed digits for the panel; called by the executor on the UI thread."""
+        if update.digits:
+            self._pi_digits_pending.append(update.digits)
+            self.scheduler.add_task(self._insert_pi_digits)
+        self.widget_state.configure(self.pi_digits_status_label, text=f"Digit: {update.known:,}")
+        self.scheduler.coalesce("precise_circumference", self.update_precise_circumference)
+
+    def _finish_pi_digits(self, update):
+        self.pi_digits_job = None
+        if update is not None:
+            self.widget_state.configure(self.pi_digits_status_label, text=f"Selesai: {update.known:,} digit")
+        self.widget_state.configure(self.pi_digits_start_button, state=tk.NORMAL)
+        self.widget_state.configure(self.pi_digits_stop_button, state=tk.DISABLED)
+
+    def _fail_pi_digits(self, error):
+        self._finish_pi_digits(None)
+        self.widget_state.configure(self.pi_digits_status_label, text=f"Gagal: {error}")
+
+    def _insert_pi_digits(self, dt):
+        """Scheduler task: inserts up to PI_DIGITS_PER_FRAME queued digits into the panel."""
+        budget = self.PI_DIGITS_PER_FRAME
+        pieces = []
+        while self._pi_digits_pending and budget:
+            digits = self._pi_digits_pending[0]
+            if len(digits) > budget:
+                self._pi_digits_pending[0] = digits[budget:]
+                digits = digits[:budget]
+            else:
+                self._pi_digits_pending.popleft()
+            budget -= len(digits)
+            # Break the digits into lines below the leading "3."
+            start = 0
+            while start < len(digits):
+                column = self._pi_digits_shown % self.PI_DIGITS_PER_LINE
+                if column == 0:
+                    pieces.append("\n")
+                end = start + self.PI_DIGITS_PER_LINE - column
+                pieces.append(digits[start:end])
+                self._pi_digits_shown += len(digits[start:end])
+                start = end
+        self.pi_digits_text.configure(state=tk.NORMAL)
+        self.pi_digits_text.insert(tk.END, "".join(pieces))
+        self.pi_digits_text.configure(state=tk.DISABLED)
+        self.pi_digits_text.see(tk.END)
+        return bool(self._pi_digits_pending)
+
+    def on_pi_precision_submitted(self, event=None):
+        self._precise_key = None
+        self.update_precise_circumference()
+
+    def update_precise_circumference(self):
+        """
+        Shows the circumference for the target radius to the requested number of
+        significant digits, from the cached digits of Pi (at most as many as are
+        cached). Nothing is recomputed if the inputs did not change.
+        """
+        from pi_digits import circumference
+        try:
+            precision = int(float(self.widget_state.get_variable(self.pi_precision_var)))
+            if not 1 <= precision <= self.MAX_PI_DIGITS:
+                raise ValueError
+        except ValueError: # Invalid input, reset to the default
+            self.widget_state.set_variable(self.pi_precision_var, "50")
+            return
+        cache = self._open_pi_cache()
+        known = cache.known if cache is not None else 0
+        key = (self.model.radius, precision, min(known, precision))
+        if key == self._precise_key:
+            return
+        self._precise_key = key
+        configure = self.widget_state.configure
+        if known == 0:
+            configure(self.precise_circumference_label, text="Keliling: - (hitung digit Pi terlebih dahulu)")
+            text = ""
+        else:
+            # Pi is taken five digits beyond the shown ones, so that rounding cannot reach them
+            shown = min(precision, max(known - 5, 1))
+            value = str(circumference(self.model.radius, shown, cache.pi(shown + 5)))
+            note = f" (dibatasi oleh {known:,} digit Pi)" if shown < precision else ""
+            configure(self.precise_circumference_label, text=f"Keliling ({shown:,} digit){note}:")
+            text = "\n".join(
+                value[start:start + self.PI_DIGITS_PER_LINE] for start in range(0, len(value), self.PI_DIGITS_PER_LINE)
+            )
+        self.precise_circumference_text.configure(state=tk.NORMAL)
+        self.precise_circumference_text.delete("1.0", tk.END)
+        self.precise_circumference_text.insert(tk.END, text)
+        self.precise_circumference_text.configure(state=tk.DISABLED)
+
+    def _stop_radius_animation(self):
+        """Cancels any pending or running radius animation and re-enables the controls."""
+        self.scheduler.cancel("radius_target")
+        self.scheduler.remove_task(self._perform_radius_animation_step)
+        if self.is_animating_radius:
+            self.is_animating_radius = False
+            self._set_controls_state(tk.NORMAL)
 
     def start_radius_animation(self):
-        # self.radius already holds the target radius from slider/entry
+        # self.model.radius already holds the target radius from slider/entry
         self.update_texts() # Update labels to show target radius
-        
-        if self.animation_job_id: # If an animation is scheduled, cancel it
-            self.root.after_cancel(self.animation_job_id)
-            self.animation_job_id = None
-            
-        # If not already animating towards the same target, or if it's a new target
-        if not self.is_animating_radius or abs(self.current_display_radius.get() - self.radius.get()) > self.ANIMATION_THRESHOLD :
+        self.radius_animation.set_target(self.model.radius)
+
+        # The running task picks up the new target on its next frame
+        if not self.radius_animation.is_settled:
             self.is_animating_radius = True
             self._set_controls_state(tk.DISABLED)
-            self._perform_radius_animation_step()
+            self.scheduler.add_task(self._perform_radius_animation_step)
 
 
     def on_radius_control_changed(self, event=None):
-        """Called when slider value changes."""
-        new_target_radius = self.radius.get()
+        """
+        Called when slider value changes. A drag produces a burst of these events,
+        so the actual update is merged into a single one per frame.
+        """
+        self.scheduler.coalesce("radius_target", self._apply_radius_control)
+
+    def _apply_radius_control(self):
+        new_target_radius = self.widget_state.get_variable(self.radius)
         if new_target_radius < 1:
             new_target_radius = 1
-            self.radius.set(new_target_radius) # Correct the tk.DoubleVar
+            self.widget_state.set_variable(self.radius, new_target_radius) # Correct the tk.DoubleVar
         
-        self.radius_entry_var.set(f"{new_target_radius:.2f}") # Sync entry field
+        self.model.radius = new_target_radius
+        self.widget_state.set_variable(self.radius_entry_var, f"{new_target_radius:.2f}") # Sync entry field
         self.start_radius_animation()
 
     def on_radius_entry_submitted(self, event=None):
         """Called when Return is pressed in radius entry or focus is lost after change."""
+        widget_state = self.widget_state
         try:
-            value = float(self.radius_entry_var.get())
+            value = float(widget_state.get_variable(self.radius_entry_var))
             if 1 <= value <= 100:
-                if abs(self.radius.get() - value) > self.ANIMATION_THRESHOLD: # Only if value actually changed significantly
-                    self.radius.set(value)
-                    # self.radius_slider.set(value) # Slider already bound to self.radius
-                    self.start_radius_animation()
+                if abs(self.model.radius - value) > self.ANIMATION_THRESHOLD: # Only if value actually changed significantly
+                    widget_state.set_variable(self.radius, value) # Moves the slider
+                    self.model.radius = value
+                    self.scheduler.coalesce("radius_target", self.start_radius_animation)
                 else: # Value is close enough to current target, just ensure sync
-                    self.radius.set(value) # Ensure self.radius is set
-                    self.radius_entry_var.set(f"{value:.2f}") # Format correctly
+                    widget_state.set_variable(self.radius, value) # Ensure self.radius is set
+                    self.model.radius = value
+                    widget_state.set_variable(self.radius_entry_var, f"{value:.2f}") # Format correctly
             else: # Value out of range, reset entry to current target radius
-                self.radius_entry_var.set(f"{self.radius.get():.2f}")
+                widget_state.set_variable(self.radius_entry_var, f"{self.model.radius:.2f}")
         except ValueError: # Invalid input
-            self.radius_entry_var.set(f"{self.radius.get():.2f}")
+            widget_state.set_variable(self.radius_entry_var, f"{self.model.radius:.2f}")
 
     def on_update_button_pressed(self, event=None):
         """
@@ -358,89 +1192,106 @@ class CircleVisualization:
         This action instantly updates the circle to the values specified in the
         X, Y, and Radius input fields, cancelling any ongoing radius animation.
         """
-        if self.is_animating_radius and self.animation_job_id:
-            self.root.after_cancel(self.animation_job_id)
-            self.is_animating_radius = False
-            self._set_controls_state(tk.NORMAL)
-            self.animation_job_id = None
+        self._stop_radius_animation()
 
-        # Update target radius from entry, then current_display_radius
+        # Update target radius from entry, then display_radius
+        widget_state = self.widget_state
         try:
-            entry_radius = float(self.radius_entry_var.get())
+            entry_radius = float(widget_state.get_variable(self.radius_entry_var))
             if 1 <= entry_radius <= 100:
-                self.radius.set(entry_radius)
+                widget_state.set_variable(self.radius, entry_radius)
             else: # Reset to current valid if out of bounds
-                self.radius_entry_var.set(f"{self.radius.get():.2f}")
+                widget_state.set_variable(self.radius_entry_var, f"{widget_state.get_variable(self.radius):.2f}")
         except ValueError: # Reset to current valid if error
-            self.radius_entry_var.set(f"{self.radius.get():.2f}")
+            widget_state.set_variable(self.radius_entry_var, f"{widget_state.get_variable(self.radius):.2f}")
 
-        self.current_display_radius.set(self.radius.get()) # Snap display radius to target
+        self.model.radius = widget_state.get_variable(self.radius)
+        self.radius_animation.snap(self.model.radius)
+        self.display_radius = self.model.radius # Snap display radius to target
         
         self.update_texts() # Ensure all text fields are synced to final values
         self.update_circle_visuals(use_current_display_radius=True) # Full visual update
 
-    def _update_plot_limits(self, for_radius):
+    def _update_plot_limits(self, for_radius, keep_view=False):
         """
         Adjusts the plot limits dynamically to ensure the circle (with 'for_radius')
-        remains visible with adequate padding.
+        remains visible with adequate padding. The view only moves between the
+        discrete levels of the zoom ladder, so on most frames nothing changes.
+        With 'keep_view', a circle that moved but is still at the right zoom
+        level and fully visible does not recenter the view.
+        Returns True if the limits were changed (which invalidates the blit background).
         """
-        center_x = self.center_x.get()
-        center_y = self.center_y.get()
-        
-        # Define desired padding around the circle
-        padding_factor = 0.5 # 50% of radius as padding
-        static_padding = 5   # Additional static padding units
-        
-        effective_padding = for_radius * padding_factor + static_padding
-        
-        target_xlim_min = center_x - for_radius - effective_padding
-        target_xlim_max = center_x + for_radius + effective_padding
-        target_ylim_min = center_y - for_radius - effective_padding
-        target_ylim_max = center_y + for_radius + effective_padding
-
-        current_xlim = self.ax.get_xlim()
-        current_ylim = self.ax.get_ylim()
-
-        # Update limits only if there's a significant difference to avoid minor adjustments
-        # and potential visual jitter. A threshold of 1 unit is used here.
-        if (abs(current_xlim[0] - target_xlim_min) > 1 or \
-            abs(current_xlim[1] - target_xlim_max) > 1 or \
-            abs(current_ylim[0] - target_ylim_min) > 1 or \
-            abs(current_ylim[1] - target_ylim_max) > 1):
-            self.ax.set_xlim(target_xlim_min, target_xlim_max)
-            self.ax.set_ylim(target_ylim_min, target_ylim_max)
-
-    def update_circle_visuals(self, use_current_display_radius=False):
+        index = self.zoom_ladder.level_for(float(view_half_extent(for_radius)), self.zoom_index)
+        center = (self.model.center_x, self.model.center_y)
+        if index == self.zoom_index and center == self.view_center:
+            return False
+        if keep_view and index == self.zoom_index and self.view_center is not None:
+            offset = max(abs(center[0] - self.view_center[0]), abs(center[1] - self.view_center[1]))
+            if offset + for_radius <= self.zoom_ladder.levels[index]:
+                return False
+
+        recentered = center != self.view_center
+        self.zoom_index = index
+        self.view_center = center
+        self.view_animation.set_target(self.zoom_ladder.levels[index])
+        if self.ANIMATE_ZOOM and not recentered:
+            # Ease toward the new level; the task redraws the view every frame
+            self.scheduler.add_task(self._perform_zoom_animation_step)
+            return False
+
+        self.scheduler.remove_task(self._perform_zoom_animation_step)
+        self.view_animation.snap()
+        self._apply_view()
+        return True
+
+    def _apply_view(self):
+        """Shows the current (possibly animated) view extent with a cached tick layout."""
+        from zoom_levels import apply_view
+        half_extent = self.view_animation.value
+        # While zooming, use the ticks of the level that covers the whole visible range
+        layout_index = self.zoom_ladder.level_for(half_extent)
+        layout = self.zoom_ladder.tick_layout(layout_index, *self.view_center)
+        apply_view(self.ax, *self.view_center, half_extent, layout)
+        self.blit_manager.invalidate()
+
+    def _perform_zoom_animation_step(self, dt):
+        """Scheduler task that eases the view between two zoom levels."""
+        zooming = self.view_animation.advance(dt)
+        self._apply_view()
+        self.polygon_layer.update(
+            self.model.center_x,
+            self.model.center_y,
+            self.display_radius,
+            self.polygon_sides
+        ) # Level of detail depends on the zoom
+        self.request_redraw()
+        return zooming
+
+    def update_circle_visuals(self, use_current_display_radius=False, keep_view=False):
         """
         Updates all visual aspects of the circle and the Pi segment on the canvas.
         This includes position, radius, color, and the Pi segment's geometry.
         It can use either the target radius or the current display radius for sizing.
+        'keep_view' is passed on to _update_plot_limits.
         """
-        center_x = self.center_x.get()
-        center_y = self.center_y.get()
+        self.model.center_x = self.widget_state.get_variable(self.center_x)
+        self.model.center_y = self.widget_state.get_variable(self.center_y)
+        self.model.radius = self.widget_state.get_variable(self.radius)
         
         # Determine which radius to use for this update
-        radius_to_use = self.current_display_radius.get() if use_current_display_radius else self.radius.get()
-
-        # Update circle properties
-        self.circle_patch.center = (center_x, center_y)
-        self.circle_patch.set_radius(radius_to_use)
-        self.circle_patch.set_edgecolor(self.ACCENT_COLOR)
-        self.circle_patch.set_fill(False)
-
-        # Update Pi segment properties
-        self.pi_segment.center = (center_x, center_y)
-        self.pi_segment.set_radius(radius_to_use)
-        # Pi segment's angle should reflect the definition of Pi, so use target radius for ratio
-        self.pi_segment.theta2 = (self.get_pi_ratio(self.radius.get()) / np.pi) * 360
-        self.pi_segment.set_width(max(0.01, 0.05 * radius_to_use))
-        self.pi_segment.set_facecolor(self.PI_SEGMENT_COLOR)
-
-        self._update_plot_limits(radius_to_use)
+        radius_to_use = self.display_radius if use_current_display_radius else self.model.radius
+
+        # Pi segment's angle reflects the definition of Pi, so the renderer uses the model's
+        # target radius for the ratio
+        self.renderer.update(self.model, display_radius=radius_to_use)
+        self.monte_carlo_layer.set_bounds(self.model.center_x, self.model.center_y, radius_to_use)
+
+        self._update_plot_limits(radius_to_use, keep_view)
+        self.polygon_layer.update(self.model.center_x, self.model.center_y, radius_to_use, self.polygon_sides)
         
         # Do not call update_texts here as it might conflict with animation text updates
         # self.update_texts() 
-        self.canvas.draw_idle() # Use draw_idle for potentially smoother rendering in Tkinter
+        self.blit_manager.update() # Blits unless the plot limits changed
 
     def update_circle(self):
         """
@@ -450,19 +1301,71 @@ class CircleVisualization:
         such controls were added without their own animation logic).
         It cancels any ongoing radius animation.
         """
-        if self.is_animating_radius and self.animation_job_id: # Stop any ongoing animation
-            self.root.after_cancel(self.animation_job_id) # type: ignore
-            self.is_animating_radius = False
-            self._set_controls_state(tk.NORMAL)
+        self._stop_radius_animation() # Stop any ongoing animation
 
-        self.current_display_radius.set(self.radius.get()) # Sync display radius to target
+        self.model.radius = self.widget_state.get_variable(self.radius)
+        self.radius_animation.snap(self.model.radius)
+        self.display_radius = self.model.radius # Sync display radius to target
         self.update_texts() # Update all text labels to reflect the target state.
-        self.update_circle_visuals(use_current_display_radius=True) # Update visuals to current_display_radius
+        self.update_circle_visuals(use_current_display_radius=True) # Update visuals to display_radius
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    """
+    Starts the interactive application, or a command-line mode:
+        python main.py batch specs.csv --out DIR   (see batch_export.py)
+        python main.py record --out DIR/frame.png  (see recorder.py)
+        python main.py serve --port 8765           (see render_service.py)
+    'python main.py --startup-report' prints the startup timings and exits.
+    'python main.py --asyncio' runs the Tk event loop inside an asyncio event loop.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        import batch_export # Only needed for the command-line mode
+        return batch_export.main(argv[1:])
+    if argv and argv[0] == "record":
+        import recorder
+        return recorder.main(argv[1:])
+    if argv and argv[0] == "serve":
+        import render_service
+        return render_service.main(argv[1:])
+
+    main_started = time.perf_counter()
     root = tk.Tk()
     # It's good practice to set the initial size of the window
     root.geometry("900x700") 
     app = CircleVisualization(root)
-    root.mainloop()
+    if "--startup-report" in argv:
+        # Runs after _finish_startup, since idle callbacks run in order
+        root.after_idle(print_startup_report, app, main_started)
+    try:
+        if "--asyncio" in argv:
+            import asyncio
+            from executor import run_tk
+            asyncio.run(run_tk(root))
+        else:
+            root.mainloop()
+    finally:
+        app.executor.shutdown()
+        if app.recorder is not None:
+            app.recorder.close()
+        if app.pi_cache is not None:
+            app.pi_cache.close()
+    return 0
+
+
+def print_startup_report(app, main_started):
+    """
+    Prints the startup milestones as JSON (milliseconds since main.py started
+    importing its modules) and closes the application:
+        python main.py --startup-report
+    """
+    import json
+    times = {"imports_ms": main_started}
+    times.update((f"{name}_ms", value) for name, value in app.startup_times.items())
+    print(json.dumps({name: (value - STARTUP_ORIGIN) * 1000 for name, value in times.items()}), flush=True)
+    app.root.destroy()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Streaming Monte Carlo estimation of Pi.
+
+Points are sampled uniformly in the square [-1, 1] x [-1, 1] in fixed-size
+NumPy chunks; the fraction that falls inside the unit circle approximates
+Pi / 4. Every chunk is reduced to its hit count and a fixed-size 2D density
+histogram right away, so memory stays constant per chunk no matter how many
+samples are drawn, and plotting 10^8+ samples costs the same as plotting 10^4.
+
+Sampling runs as a streaming job of the BackgroundExecutor (optionally
+fanning chunks out to its process pool) and emits MonteCarloUpdate snapshots,
+which the executor delivers to the UI once per frame.
+"""
+import collections
+import math
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.image import AxesImage
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+DEFAULT_BINS = 256
+
+MonteCarloUpdate = collections.namedtuple(
+    "MonteCarloUpdate",
+    "samples inside estimate error standard_error density_inside density_outside finished"
+)
+
+
+def sample_chunk(seed, count, bins=DEFAULT_BINS):
+    """
+    Samples 'count' points in [-1, 1]^2 and returns (inside_count, inside_density,
+    outside_density), where the densities are (bins, bins) histograms of the points.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((count, 2))
+    points *= 2
+    points -= 1
+    inside = np.einsum("ij,ij->i", points, points) <= 1.0
+
+    # Histogram by direct bin indexing, much cheaper than np.histogram2d
+    cells = np.minimum(((points + 1) * (bins / 2)).astype(np.intp), bins - 1)
+    flat = cells[:, 1] * bins + cells[:, 0]
+    inside_density = np.bincount(flat[inside], minlength=bins * bins).reshape(bins, bins)
+    outside_density = np.bincount(flat[~inside], minlength=bins * bins).reshape(bins, bins)
+    return int(inside.sum()), inside_density, outside_density
+
+
+class MonteCarloPiEstimator:
+    """
+    Estimates Pi and streams the running result.
+
+    run(job) is meant to be submitted as a streaming executor job: it emits a
+    MonteCarloUpdate after every chunk and returns the final one. Given a process
+    pool, it samples the chunks there; otherwise the job's thread samples them.
+    Cancelling the job stops the sampling after the chunks in progress.
+    """
+
+    def __init__(self, total_samples, chunk_size=DEFAULT_CHUNK_SIZE, bins=DEFAULT_BINS, seed=None):
+        self.total_samples = int(total_samples)
+        self.chunk_size = int(chunk_size)
+        self.bins = bins
+        self._seed_sequence = np.random.SeedSequence(seed)
+
+        self.samples = 0
+        self.inside = 0
+        self.density_inside = np.zeros((bins, bins), dtype=np.int64)
+        self.density_outside = np.zeros((bins, bins), dtype=np.int64)
+
+    def run(self, job, process_pool=None, workers=1):
+        """Samples all points, emitting an update per chunk; returns the final update."""
+        if process_pool is not None:
+            self._run_pool(job, process_pool, workers)
+        else:
+            for size in self._chunk_sizes(job):
+                self._accumulate(size, sample_chunk(self._seed_sequence.spawn(1)[0], size, self.bins))
+                job.emit(self.snapshot(finished=False))
+        return self.snapshot(finished=True)
+
+    def _chunk_sizes(self, job):
+        remaining = self.total_samples
+        while remaining > 0 and not job.cancelled:
+            size = min(self.chunk_size, remaining)
+            remaining -= size
+            yield size
+
+    def _run_pool(self, job, pool, workers):
+        pending = {}
+        sizes = self._chunk_sizes(job)
+        exhausted = False
+        while True:
+            # Keep a bounded number of chunks in flight
+            while not exhausted and len(pending) < 2 * workers:
+                size = next(sizes, None)
+                if size is None:
+                    exhausted = True
+                    break
+                seed = self._seed_sequence.spawn(1)[0]
+                pending[pool.submit(sample_chunk, seed, size, self.bins)] = size
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._accumulate(pending.pop(future), future.result())
+            job.emit(self.snapshot(finished=False))
+            if job.cancelled:
+                for future in pending:
+                    future.cancel()
+                break
+
+    def _accumulate(self, size, result):
+        inside, density_inside, density_outside = result
+        self.samples += size
+        self.inside += inside
+        self.density_inside += density_inside
+        self.density_outside += density_outside
+
+    def snapshot(self, finished):
+        """The current estimate as a MonteCarloUpdate (with copies of the densities)."""
+        if self.samples:
+            ratio = self.inside / self.samples
+            estimate = 4 * ratio
+            standard_error = 4 * math.sqrt(ratio * (1 - ratio) / self.samples)
+        else:
+            estimate = standard_error = float("nan")
+        return MonteCarloUpdate(
+            self.samples, self.inside, estimate, estimate - math.pi, standard_error,
+            self.density_inside.copy(), self.density_outside.copy(), finished
+        )
+
+
+def density_image(density_inside, density_outside, inside_color, outside_color, max_alpha=0.4):
+    """
+    Turns the two density histograms into an RGBA image (rows = y) with log-scaled
+    opacity up to 'max_alpha', suitable for an image with origin='lower'.
+    """
+    total = density_inside + density_outside
+    peak = total.max()
+    image = np.zeros(total.shape + (4,))
+    if peak == 0:
+        return image
+    mostly_inside = (density_inside >= density_outside)[..., None]
+    image[..., :3] = np.where(mostly_inside, inside_color[:3], outside_color[:3])
+    image[..., 3] = max_alpha * np.log1p(total) / np.log1p(peak)
+    return image
+
+
+class MonteCarloLayer:
+    """
+    Shows the sampled point density as one image stretched over the bounding
+    square of the circle. The image has a fixed number of pixels (the histogram
+    bins), so drawing it does not depend on the number of samples.
+    """
+
+    def __init__(self, ax, inside_color, outside_color, zorder=0.5):
+        self.inside_color = to_rgba(inside_color)
+        self.outside_color = to_rgba(outside_color)
+        self.image = AxesImage(ax, origin='lower', interpolation='nearest', zorder=zorder)
+        self.image.set_data(np.zeros((1, 1, 4)))
+        self.image.set_visible(False)
+        ax.add_image(self.image)
+
+    def set_bounds(self, center_x, center_y, radius):
+        """Places the sampling square [-1, 1]^2 over the circle's bounding square."""
+        self.image.set_extent((center_x - radius, center_x + radius, center_y - radius, center_y + radius))
+
+    def show(self, update):
+        self.image.set_data(density_image(
+            update.density_inside, update.density_outside, self.inside_color, self.outside_color
+        ))
+        self.image.set_visible(True)
+
+    def hide(self):
+        self.image.set_visible(False)
@@ -0,0 +1,301 @@
+"""
+Many-circles mode: array-backed storage and collection-based drawing.
+
+CircleArray keeps the centers, radii, target radii and colors of all circles
+in contiguous NumPy arrays (struct of arrays). MultiCircleLayer draws all of
+them with one EllipseCollection for the circles and one PathCollection with a
+single compound path for the Pi segments, so no Artist exists per circle and
+the per-frame cost is a handful of vectorized array operations.
+"""
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.collections import EllipseCollection, PathCollection
+from matplotlib.path import Path
+
+from circle_core import (
+    PI_SEGMENT_COLOR,
+    PI_SEGMENT_MIN_WIDTH,
+    PI_SEGMENT_WIDTH_FRACTION,
+    pi_segment_theta2,
+    pi_segment_width,
+)
+from scheduler import easing_remaining
+
+
+class CircleArray:
+    """
+    Growable storage of many circles as NumPy arrays.
+
+    The public properties are views on the first 'size' rows of the internal
+    buffers, so they can be modified in place. The buffers grow geometrically,
+    which keeps adding circles amortized O(1) per circle.
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._centers = np.empty((capacity, 2))
+        self._radii = np.empty(capacity)
+        self._target_radii = np.empty(capacity)
+        self._colors = np.empty((capacity, 4))
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def centers(self):
+        return self._centers[:self.size]
+
+    @property
+    def radii(self):
+        return self._radii[:self.size]
+
+    @property
+    def target_radii(self):
+        return self._target_radii[:self.size]
+
+    @property
+    def colors(self):
+        return self._colors[:self.size]
+
+    def _reserve(self, capacity):
+        if capacity <= len(self._radii):
+            return
+        capacity = max(capacity, 2 * len(self._radii))
+        for name in ("_centers", "_radii", "_target_radii", "_colors"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:])
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add(self, centers, radii, colors, start_radii=None):
+        """
+        Appends circles and returns the indices they were stored at. The circles
+        start at 'start_radii' (defaults to 'radii') and can be animated toward
+        'radii' with advance().
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        count = len(centers)
+        start, end = self.size, self.size + count
+        self._reserve(end)
+        self._centers[start:end] = centers
+        self._target_radii[start:end] = radii
+        self._radii[start:end] = radii if start_radii is None else start_radii
+        self._colors[start:end] = colors
+        self.size = end
+        return np.arange(start, end)
+
+    def remove(self, indices):
+        """Removes the circles at 'indices'; the remaining circles keep their order."""
+        keep = np.ones(self.size, dtype=bool)
+        keep[indices] = False
+        kept = int(keep.sum())
+        for name in ("_centers", "_radii", "_target_radii", "_colors"):
+            buffer = getattr(self, name)
+            buffer[:kept] = buffer[:self.size][keep]
+        self.size = kept
+
+    def bring_to_front(self, index):
+        """Moves circle 'index' to the end, where it is drawn last; returns its new index."""
+        last = self.size - 1
+        for name in ("_centers", "_radii", "_target_radii", "_colors"):
+            buffer = getattr(self, name)
+            row = buffer[index].copy()
+            buffer[index:last] = buffer[index + 1:self.size]
+            buffer[last] = row
+        return last
+
+    def clear(self):
+        self.size = 0
+
+    def advance(self, dt, step_size, step_interval, threshold):
+        """
+        Eases all radii toward their target radii in place for 'dt' seconds.
+        Returns True while any circle is still moving.
+        """
+        radii = self.radii
+        targets = self.target_radii
+        difference = radii - targets
+        difference *= easing_remaining(dt, step_size, step_interval)
+        np.add(targets, difference, out=radii)
+        moving = np.abs(difference) >= threshold
+        if not moving.any():
+            radii[:] = targets # Snap to targets
+            return False
+        return True
+
+
+class MultiCircleLayer:
+    """
+    Draws a CircleArray onto an Axes with two collections.
+
+    The circles are an EllipseCollection whose widths/heights are in data units.
+    The Pi segments of all circles form one compound Path (outer arc followed by
+    the reversed inner arc for each circle), filled as a single PathCollection.
+    The arc outline is a unit template that is scaled and offset per circle with
+    broadcasting, and it is only rebuilt when the arc angle changes.
+
+    Segments are only drawn for circles of at least MIN_ARC_RADIUS_PX on
+    screen, and never with more than ARC_VERTEX_BUDGET vertices in total: if
+    too many circles qualify, only the largest of them get a segment.
+    """
+    MIN_ARC_SEGMENTS = 8
+    MAX_ARC_SEGMENTS = 64
+    PIXELS_PER_ARC_SEGMENT = 4
+    MIN_ARC_RADIUS_PX = 3 # Smaller segments are not visible anyway
+    ARC_VERTEX_BUDGET = 1_000_000 # Upper bound for the vertices of all Pi segments together
+
+    def __init__(self, ax, circles, linewidth=1.0):
+        self.ax = ax
+        self.circles = circles
+        self.circle_collection = EllipseCollection(
+            widths=[], heights=[], angles=[],
+            units='xy',
+            offsets=np.empty((0, 2)),
+            offset_transform=ax.transData,
+            facecolors='none',
+            linewidths=linewidth
+        )
+        self.arc_collection = PathCollection(
+            [Path(np.empty((0, 2)))],
+            facecolors=PI_SEGMENT_COLOR,
+            edgecolors='none',
+            alpha=0.7
+        )
+        ax.add_collection(self.circle_collection, autolim=False)
+        ax.add_collection(self.arc_collection, autolim=False)
+        self._template_key = None
+        self._template = None
+        self._codes_key = None
+        self._codes = None
+        self._vertices = np.empty((0, 2))
+
+    @property
+    def artists(self):
+        return (self.circle_collection, self.arc_collection)
+
+    def _arc_circles(self, pixels_per_unit):
+        """Indices (in drawing order) of the circles that get a Pi segment."""
+        radii = self.circles.radii
+        indices = np.flatnonzero(radii * pixels_per_unit >= self.MIN_ARC_RADIUS_PX)
+        # Each ring has two arcs of at least MIN_ARC_SEGMENTS + 1 points and a closing point
+        max_rings = self.ARC_VERTEX_BUDGET // (2 * self.MIN_ARC_SEGMENTS + 3)
+        if len(indices) > max_rings:
+            largest = np.argpartition(radii[indices], len(indices) - max_rings)[-max_rings:]
+            indices = np.sort(indices[largest])
+        return indices
+
+    def _arc_segments(self, radii, pixels_per_unit):
+        """
+        Number of arc segments: about one vertex every few pixels on the largest
+        circle, within the vertex budget for the whole collection.
+        """
+        if not len(radii):
+            return self.MIN_ARC_SEGMENTS
+        largest_radius_px = float(radii.max()) * pixels_per_unit
+        segments = int(2 * np.pi * largest_radius_px / self.PIXELS_PER_ARC_SEGMENT)
+        budget = self.ARC_VERTEX_BUDGET // len(radii) // 2 - 2 # Points per arc, minus the arc's last point
+        upper = max(self.MIN_ARC_SEGMENTS, min(budget, self.MAX_ARC_SEGMENTS))
+        return int(np.clip(segments, self.MIN_ARC_SEGMENTS, upper))
+
+    def _arc_template(self, segments, theta2):
+        """Unit outer arc (segments + 1 points from 0 to theta2 degrees), cached per key."""
+        key = (segments, theta2)
+        if key != self._template_key:
+            angles = np.radians(np.linspace(0, theta2, segments + 1))
+            self._template = np.column_stack((np.cos(angles), np.sin(angles)))
+            self._template_key = key
+        return self._template
+
+    def _ring_codes(self, count, points_per_arc):
+        per_ring = 2 * points_per_arc + 1
+        if self._codes_key != (count, per_ring):
+            ring = np.full(per_ring, Path.LINETO, dtype=Path.code_type)
+            ring[0] = Path.MOVETO
+            ring[-1] = Path.CLOSEPOLY
+            self._codes = np.tile(ring, count)
+            self._codes_key = (count, per_ring)
+        return self._codes
+
+    def in_rings(self, rings):
+        """
+        Mask of the circles whose outline or Pi segment reaches into one of
+        'rings', given as (center x, center y, inner radius, outer radius).
+        """
+        centers = self.circles.centers
+        radii = self.circles.radii
+        widths = pi_segment_width(radii)
+        found = np.zeros(len(radii), dtype=bool)
+        for x, y, inner, outer in rings:
+            # The outline's points are between |d - r| and d + r away from the ring's center
+            distances = np.hypot(centers[:, 0] - x, centers[:, 1] - y)
+            found |= (np.abs(distances - radii) <= outer + widths) & (distances + radii >= inner)
+        return found
+
+    def sync(self, pi_ratio=np.pi, subset=None):
+        """
+        Pushes the current arrays into both collections. With 'subset' (indices
+        or a mask) only those circles are pushed, e.g. to redraw just a part of
+        the view cheaply.
+        """
+        circles = self.circles
+        centers = circles.centers
+        radii = circles.radii
+        colors = circles.colors
+        pixels_per_unit = abs(self.ax.transData.get_matrix()[0, 0])
+        arc_circles = self._arc_circles(pixels_per_unit)
+        # Chosen for all circles, so that a restricted sync draws the same segments
+        segments = self._arc_segments(radii[arc_circles], pixels_per_unit)
+        if subset is not None:
+            selected = np.zeros(len(radii), dtype=bool)
+            selected[subset] = True
+            arc_circles = arc_circles[selected[arc_circles]]
+            arc_centers, arc_radii = centers[arc_circles], radii[arc_circles]
+            centers, radii, colors = centers[selected], radii[selected], colors[selected]
+        elif len(arc_circles) < len(radii):
+            arc_centers, arc_radii = centers[arc_circles], radii[arc_circles]
+        else:
+            arc_centers, arc_radii = centers, radii
+        diameters = 2 * radii
+
+        self.circle_collection.set_offsets(centers)
+        self.circle_collection.set_widths(diameters)
+        self.circle_collection.set_heights(diameters)
+        self.circle_collection.set_angles(np.zeros(len(radii)))
+        self.circle_collection.set_edgecolor(colors)
+
+        template = self._arc_template(segments, float(pi_segment_theta2(pi_ratio)))
+        points = len(template)
+        count = len(arc_radii)
+        per_ring = 2 * points + 1
+        if len(self._vertices) != count * per_ring:
+            self._vertices = np.empty((count * per_ring, 2))
+        rings = self._vertices.reshape(count, per_ring, 2)
+        inner_radii = arc_radii - np.maximum(PI_SEGMENT_MIN_WIDTH, PI_SEGMENT_WIDTH_FRACTION * arc_radii)
+        # Outer arc counter-clockwise, inner arc clockwise, then close the ring
+        np.multiply(arc_radii[:, None, None], template, out=rings[:, :points])
+        np.multiply(inner_radii[:, None, None], template[::-1], out=rings[:, points:2 * points])
+        rings[:, :2 * points] += arc_centers[:, None, :]
+        rings[:, -1] = rings[:, 0]
+        self.arc_collection.set_paths([Path(self._vertices, self._ring_codes(count, points))])
+        self.circle_collection.stale = True
+
+
+def random_circles(count, xlim, ylim, rng=None, cmap="viridis"):
+    """
+    Random circles inside the given view: returns (centers, radii, colors) with
+    radii between 1% and 5% of the view width, colored by radius.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    span = xlim[1] - xlim[0]
+    centers = np.column_stack((rng.uniform(*xlim, count), rng.uniform(*ylim, count)))
+    radii = rng.uniform(0.01 * span, 0.05 * span, count)
+    colors = colormaps[cmap]((radii - radii.min()) / max(np.ptp(radii), 1e-12))
+    return centers, radii, colors
+
+
+def radius_sweep(count, center, max_radius, cmap="viridis"):
+    """Concentric circles around 'center' with radii evenly spaced up to 'max_radius'."""
+    radii = np.linspace(max_radius / count, max_radius, count)
+    centers = np.tile(np.asarray(center, dtype=float), (count, 1))
+    colors = colormaps[cmap](np.linspace(0, 1, count))
+    return centers, radii, colors
@@ -0,0 +1,199 @@
+"""
+Low-overhead frame-time instrumentation.
+
+FrameProfiler records (phase, start, duration) samples in a fixed-size ring
+buffer, so a profiling session of any length uses constant memory. Methods are
+instrumented by replacing them with timed wrappers on the instance (see
+instrument()); uninstrument() deletes the wrappers again, so a disabled
+profiler leaves no code in the hot paths at all.
+
+The recorded trace can be dumped as plain JSON (per-phase statistics plus the
+raw samples) or in the Chrome trace event format, which can be opened in
+chrome://tracing or https://ui.perfetto.dev.
+"""
+import functools
+import json
+import time
+
+import numpy as np
+
+FRAME_PHASE = "frame"
+
+
+class FrameProfiler:
+    """
+    Ring buffer of timed phases. The 'frame' phase marks whole frames and is
+    used for the FPS and frame-time statistics.
+    """
+
+    def __init__(self, capacity=16384, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self._phase_names = []
+        self._phase_ids = {}
+        self._phases = np.zeros(capacity, dtype=np.int32)
+        self._starts = np.zeros(capacity)
+        self._durations = np.zeros(capacity)
+        self._next = 0
+        self._count = 0
+        self._instrumented = [] # (object, attribute name)
+        self._origin = clock()
+
+    @property
+    def enabled(self):
+        return bool(self._instrumented)
+
+    def _phase_id(self, name):
+        phase_id = self._phase_ids.get(name)
+        if phase_id is None:
+            phase_id = self._phase_ids[name] = len(self._phase_names)
+            self._phase_names.append(name)
+        return phase_id
+
+    def record(self, name, start, duration):
+        index = self._next
+        self._phases[index] = self._phase_id(name)
+        self._starts[index] = start
+        self._durations[index] = duration
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self):
+        """Drops all samples; trace timestamps restart at zero."""
+        self._next = 0
+        self._count = 0
+        self._origin = self.clock()
+
+    def wrap(self, name, func):
+        """Returns a wrapper of 'func' that records each call as phase 'name'."""
+        clock = self.clock
+        record = self.record
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, clock() - start)
+        return timed
+
+    def instrument(self, obj, attribute, name=None):
+        """Replaces obj.attribute with a timed wrapper stored on the instance."""
+        setattr(obj, attribute, self.wrap(name or attribute, getattr(obj, attribute)))
+        self._instrumented.append((obj, attribute))
+
+    def uninstrument(self):
+        """Removes every wrapper installed by instrument(), restoring the class methods."""
+        for obj, attribute in reversed(self._instrumented):
+            try:
+                delattr(obj, attribute)
+            except AttributeError: # Already gone
+                pass
+        self._instrumented.clear()
+
+    def samples(self):
+        """Returns (names, starts, durations) of the recorded samples, oldest first."""
+        if self._count < self.capacity:
+            order = np.arange(self._count)
+        else:
+            order = np.roll(np.arange(self.capacity), -self._next)
+        names = [self._phase_names[phase_id] for phase_id in self._phases[order]]
+        return names, self._starts[order], self._durations[order]
+
+    def phase_durations(self, name):
+        if name not in self._phase_ids:
+            return np.empty(0)
+        valid = self._phases[:self._count] == self._phase_ids[name]
+        return self._durations[:self._count][valid]
+
+    def frame_stats(self, window=1.0):
+        """
+        Returns (fps, p95 frame time in seconds) over the frames of the last
+        'window' seconds, where the frame time is the interval between frames.
+        """
+        if FRAME_PHASE not in self._phase_ids:
+            return 0.0, 0.0
+        valid = self._phases[:self._count] == self._phase_ids[FRAME_PHASE]
+        starts = self._starts[:self._count][valid]
+        starts = np.sort(starts[starts >= self.clock() - window])
+        if len(starts) < 2:
+            return 0.0, 0.0
+        intervals = np.diff(starts)
+        return 1.0 / intervals.mean(), float(np.percentile(intervals, 95))
+
+    def summary(self):
+        """Per-phase statistics in milliseconds."""
+        result = {}
+        for name in self._phase_names:
+            durations = self.phase_durations(name) * 1000
+            if len(durations):
+                result[name] = {
+                    "count": int(len(durations)),
+                    "mean_ms": float(durations.mean()),
+                    "p50_ms": float(np.percentile(durations, 50)),
+                    "p95_ms": float(np.percentile(durations, 95)),
+                    "max_ms": float(durations.max()),
+                }
+        return result
+
+    def to_json(self, fileobj):
+        """Writes the per-phase summary and the raw samples as JSON."""
+        names, starts, durations = self.samples()
+        json.dump({
+            "summary": self.summary(),
+            "samples": [
+                {"phase": name, "start_s": float(start - self._origin), "duration_ms": float(duration * 1000)}
+                for name, start, duration in zip(names, starts, durations)
+            ],
+        }, fileobj, indent=1)
+
+    def to_chrome_trace(self, fileobj):
+        """Writes the samples as Chrome trace 'complete' events (timestamps in microseconds)."""
+        names, starts, durations = self.samples()
+        events = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": float((start - self._origin) * 1e6),
+                "dur": float(duration * 1e6),
+                "pid": 1,
+                "tid": 1,
+            }
+            for name, start, duration in zip(names, starts, durations)
+        ]
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fileobj)
+
+    def dump(self, path):
+        """Writes a Chrome trace if 'path' ends with '.trace.json', otherwise plain JSON."""
+        with open(path, "w") as trace_file:
+            if path.endswith(".trace.json"):
+                self.to_chrome_trace(trace_file)
+            else:
+                self.to_json(trace_file)
+
+
+class PerformanceOverlay:
+    """A small FPS / p95 frame-time readout in the corner of the axes."""
+
+    def __init__(self, ax, color, refresh_interval=0.25):
+        self.text = ax.text(
+            0.02, 0.98, "",
+            transform=ax.transAxes,
+            ha='left', va='top',
+            family='monospace', fontsize=8,
+            color=color,
+            visible=False
+        )
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+
+    def update(self, profiler):
+        """Refreshes the text at most every 'refresh_interval' seconds; returns True if it changed."""
+        now = profiler.clock()
+        if now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+        fps, p95 = profiler.frame_stats()
+        self.text.set_text(f"FPS {fps:5.1f}  p95 {p95 * 1000:5.1f} ms")
+        return True
@@ -0,0 +1,368 @@
+"""
+Digits of Pi to arbitrary precision, streamed while they are computed.
+
+Pi is computed with the Chudnovsky series, each term of which adds about 14
+digits, summed by binary splitting: the terms [a, b) are reduced to three
+integers P, Q, T, and two neighbouring ranges are merged with a few big
+multiplications, so the cost is dominated by a handful of very large
+products. The terms are added in stages of doubling size; after every stage
+the digits it made certain are emitted, so the first digits appear at once
+and the total work is about twice that of a single pass.
+
+The big-integer arithmetic uses gmpy2 if it is installed. Otherwise it uses
+the decimal module with an unlimited exact context: libmpdec multiplies huge
+numbers with a number-theoretic transform and converts them to text in
+linear time, whereas Python ints multiply with Karatsuba, convert to str in
+quadratic time and refuse to convert more than sys.get_int_max_str_digits()
+digits. The square root of 10005 is refined by Newton iterations from stage to
+stage, since Decimal.sqrt() is slow at millions of digits.
+
+Neither library releases the GIL while it multiplies, so a computation on a
+thread stalls the UI for up to a second at a time at millions of digits. The
+stages can be computed in worker processes instead (each from scratch, which
+takes about twice as long in total), so that the UI stays smooth; each stage
+has a process of its own, which is terminated when the job is cancelled.
+
+Computed digits are appended to a plain ASCII file that is memory-mapped for
+reading, so they are reused across restarts and can be read to any precision
+without computing them again.
+"""
+import collections
+import contextlib
+import decimal
+import math
+import mmap
+import os
+import threading
+
+from executor import process_context
+
+try:
+    import fcntl
+except ImportError: # Not on Windows; concurrent instances are then not coordinated
+    fcntl = None
+
+try:
+    import gmpy2
+except ImportError: # Optional; the decimal module is used instead
+    gmpy2 = None
+
+DIGITS_PER_TERM = math.log10(640320**3 / 1728) # About 14.18
+C3_OVER_24 = 640320**3 // 24
+GUARD_DIGITS = 20 # Computed beyond the emitted digits, so that rounding cannot reach them
+FIRST_STAGE_TERMS = 64
+LEAF_TERMS = 32 # Ranges this small are summed with plain ints
+CANCEL_CHECK_TERMS = 4096 # Ranges this large check for cancellation
+
+PiDigitsUpdate = collections.namedtuple("PiDigitsUpdate", "known digits finished")
+PiDigitsUpdate.__doc__ = """'digits' are the next decimals of Pi, up to decimal number 'known'."""
+
+
+def default_cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "visualization-of-circle", "pi_digits.txt")
+
+
+class PiDigitCache:
+    """
+    The decimals of Pi known so far (without the leading '3.'), in an
+    append-only ASCII file that is memory-mapped for reading. Thread-safe: a
+    background job may extend it while the UI reads it. Several instances of
+    the application may share the file: writes hold an exclusive lock on it
+    and append after what is actually in the file, not what this instance
+    last saw.
+    """
+    CHECK_PREFIX = b"14159265358979323846"
+
+    def __init__(self, path=None):
+        self.path = path or default_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a+b")
+        self._map = None
+        with self._file_lock():
+            self._remap()
+            if self._map is not None and not self._valid():
+                self._file.truncate(0) # Damaged or foreign file; start over
+                self._remap()
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Holds an exclusive lock on the file against other processes."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _valid(self):
+        data = self._map[:]
+        return data.isdigit() and data[:len(self.CHECK_PREFIX)] == self.CHECK_PREFIX[:len(data)]
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def known(self):
+        """Number of decimals in the cache."""
+        with self._lock:
+            return len(self._map) if self._map is not None else 0
+
+    def digits(self, count, start=0):
+        """Decimals start+1 .. start+count (fewer, if the cache has fewer) as a string."""
+        with self._lock:
+            if self._map is None:
+                return ""
+            return self._map[start:start + count].decode("ascii")
+
+    def extend(self, start, digits):
+        """Stores 'digits', the decimals from number start+1 on; the ones already cached are skipped."""
+        with self._lock, self._file_lock():
+            # Another instance may have extended the file since it was mapped
+            known = os.fstat(self._file.fileno()).st_size
+            if start <= known < start + len(digits):
+                self._file.write(digits[known - start:].encode("ascii"))
+                self._file.flush()
+            self._remap()
+
+    def pi(self, precision):
+        """Pi as a Decimal with up to 'precision' significant digits from the cache."""
+        return decimal.Decimal("3." + self.digits(max(precision - 1, 1)))
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+def circumference(radius, precision, pi):
+    """2 * pi * radius as a Decimal rounded to 'precision' significant digits."""
+    with decimal.localcontext() as context:
+        context.prec = precision
+        return 2 * decimal.Decimal(str(float(radius))) * pi
+
+
+# --- Chudnovsky binary splitting ---
+def _leaf_terms(a, b):
+    """P, Q, T of the terms [a, b) as plain ints."""
+    P = Q = T = None
+    for k in range(a, b):
+        if k == 0:
+            p = q = 1
+        else:
+            p = (6 * k - 5) * (2 * k - 1) * (6 * k - 1)
+            q = k * k * k * C3_OVER_24
+        t = p * (13591409 + 545140134 * k)
+        if k & 1:
+            t = -t
+        if P is None:
+            P, Q, T = p, q, t
+        else:
+            P, Q, T = P * p, Q * q, T * q + P * t
+    return P, Q, T
+
+
+def _merge(left, right):
+    P1, Q1, T1 = left
+    P2, Q2, T2 = right
+    return P1 * P2, Q1 * Q2, T1 * Q2 + P1 * T2
+
+
+def _split(job, a, b, number):
+    """P, Q, T of the terms [a, b), converted to 'number' (e.g. Decimal or mpz) above the leaves."""
+    if b - a <= LEAF_TERMS:
+        return tuple(number(value) for value in _leaf_terms(a, b))
+    if job is not None and b - a >= CANCEL_CHECK_TERMS:
+        job.raise_if_cancelled()
+    middle = (a + b) // 2
+    return _merge(_split(job, a, middle, number), _split(job, middle, b, number))
+
+
+class _DecimalBackend:
+    """Big-integer arithmetic with the decimal module (exact, with libmpdec's fast multiplication)."""
+
+    def __init__(self):
+        self.exact = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+        self._inverse_sqrt = None # 1 / sqrt(10005), refined as the precision grows
+        self._inverse_sqrt_precision = 0
+
+    def split(self, job, a, b):
+        with decimal.localcontext(self.exact):
+            return _split(job, a, b, decimal.Decimal)
+
+    def merge(self, left, right):
+        with decimal.localcontext(self.exact):
+            return _merge(left, right)
+
+    def _refine_inverse_sqrt(self, context, precision):
+        if self._inverse_sqrt is None:
+            self._inverse_sqrt = decimal.Decimal(1 / math.sqrt(10005))
+            self._inverse_sqrt_precision = 15
+        y = self._inverse_sqrt
+        while self._inverse_sqrt_precision < precision:
+            # Newton's iteration for 1 / sqrt(n) doubles the correct digits
+            self._inverse_sqrt_precision = min(2 * self._inverse_sqrt_precision, precision)
+            context.prec = self._inverse_sqrt_precision + 10
+            y = y + y * (1 - 10005 * y * y) / 2
+        self._inverse_sqrt = y
+        context.prec = precision
+        return +y
+
+    def decimals(self, Q, T, count):
+        """The first 'count' decimals of Pi = 426880 * sqrt(10005) * Q / T."""
+        precision = count + GUARD_DIGITS
+        rounded = decimal.Context(prec=precision, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+        with decimal.localcontext(rounded) as context:
+            inverse_sqrt = self._refine_inverse_sqrt(context, precision)
+            pi = (+Q) * (426880 * 10005) * inverse_sqrt / (+T)
+            return str(pi)[2:2 + count]
+
+
+class _GmpyBackend:
+    """Big-integer arithmetic with gmpy2 (GMP)."""
+
+    def split(self, job, a, b):
+        return _split(job, a, b, gmpy2.mpz)
+
+    def merge(self, left, right):
+        return _merge(left, right)
+
+    def decimals(self, Q, T, count):
+        scale = gmpy2.mpz(10) ** (count + GUARD_DIGITS)
+        pi = Q * 426880 * gmpy2.isqrt(10005 * scale * scale) // T
+        return str(pi)[1:1 + count] # GMP converts to text in subquadratic time
+
+
+def _backend():
+    return _GmpyBackend() if gmpy2 is not None else _DecimalBackend()
+
+
+def _stages(digits):
+    """(end term, decimals certain after it) for the stages of doubling term counts."""
+    total_terms = int((digits + GUARD_DIGITS) / DIGITS_PER_TERM) + 2
+    terms = 0
+    while terms < total_terms:
+        terms = min(total_terms, max(2 * terms, FIRST_STAGE_TERMS))
+        if terms == total_terms:
+            yield terms, digits
+        else:
+            yield terms, min(digits, int(terms * DIGITS_PER_TERM) - GUARD_DIGITS)
+
+
+def pi_decimals(count):
+    """The first 'count' decimals of Pi, computed in one pass (e.g. in a worker process)."""
+    backend = _backend()
+    terms, _ = list(_stages(count))[-1]
+    sums = backend.split(None, 0, terms)
+    return backend.decimals(sums[1], sums[2], count)
+
+
+def _stage_worker(connection, count):
+    try:
+        connection.send(pi_decimals(count))
+    finally:
+        connection.close()
+
+
+class _StageProcess:
+    """Computes pi_decimals(count) in a process of its own, which is terminated if the job is cancelled."""
+
+    def __init__(self, context, count):
+        self.count = count
+        self._connection, sender = context.Pipe(duplex=False)
+        self.process = context.Process(target=_stage_worker, args=(sender, count), daemon=True)
+        self.process.start()
+        sender.close() # Only the worker writes; its exit then ends the pipe
+
+    def wait(self, timeout):
+        """True once the result (or the worker's exit) is there."""
+        return self._connection.poll(timeout)
+
+    def result(self):
+        try:
+            decimals = self._connection.recv()
+        except EOFError:
+            self.process.join()
+            raise RuntimeError(f"computing {self.count:,} digits failed (exit code {self.process.exitcode})") from None
+        self.process.join()
+        self._connection.close()
+        return decimals
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        self._connection.close()
+
+
+def compute_pi_digits(job, digits, cache=None, use_processes=False):
+    """
+    Computes the first 'digits' decimals of Pi. Meant to be submitted as a
+    streaming executor job: emits a PiDigitsUpdate for every stage (the cached
+    decimals first, in one update) and appends new decimals to 'cache'.
+    Returns the final PiDigitsUpdate, which carries no new digits.
+
+    The big-number libraries hold the GIL during their long multiplications,
+    so with 'use_processes' every stage is computed in a worker process (from
+    scratch, which costs about as much again), and the job's thread only waits
+    for the stages and streams their digits. Cancelling the job terminates
+    the workers.
+    """
+    known = 0
+    if cache is not None and cache.known:
+        known = min(cache.known, digits)
+        job.emit(PiDigitsUpdate(known, cache.digits(known), False))
+    if known == digits:
+        return PiDigitsUpdate(known, "", True)
+
+    if use_processes:
+        stage_decimals = _process_stages(job, digits, known)
+    else:
+        stage_decimals = _thread_stages(job, digits, known)
+    for stage_digits, decimals in stage_decimals:
+        new_digits = decimals[known:]
+        if cache is not None:
+            cache.extend(known, new_digits)
+        known = stage_digits
+        job.emit(PiDigitsUpdate(known, new_digits, False))
+    return PiDigitsUpdate(known, "", True)
+
+
+def _thread_stages(job, digits, known):
+    """Yields (count, decimals) per stage, extending the sums of the previous stage."""
+    backend = _backend()
+    terms = 0
+    sums = None
+    for end, stage_digits in _stages(digits):
+        block = backend.split(job, terms, end)
+        sums = block if sums is None else backend.merge(sums, block)
+        terms = end
+        job.raise_if_cancelled()
+        if stage_digits > known: # Otherwise the cache had all of them
+            yield stage_digits, backend.decimals(sums[1], sums[2], stage_digits)
+
+
+def _process_stages(job, digits, known):
+    """Yields (count, decimals) per stage, computing the next stage in another process meanwhile."""
+    context = process_context()
+    counts = collections.deque(count for _, count in _stages(digits) if count > known)
+    running = collections.deque()
+    try:
+        while counts or running:
+            while counts and len(running) < 2:
+                running.append(_StageProcess(context, counts.popleft()))
+            while not running[0].wait(0.1):
+                job.raise_if_cancelled()
+            stage = running.popleft()
+            yield stage.count, stage.result()
+    finally:
+        for stage in running: # Cancelled, or the consumer stopped early
+            stage.terminate()
@@ -0,0 +1,135 @@
+"""
+Archimedes' approximation of Pi with inscribed and circumscribed polygons.
+
+Starting from hexagons, each doubling of the number of sides tightens the
+bounds  n*sin(pi/n) < Pi < n*tan(pi/n). The doubling recurrences only use a
+harmonic and a geometric mean, never the difference of two nearly equal
+numbers, so they stay accurate to the last bit even for millions of sides.
+Side counts that are not 6 * 2**k use the closed form directly. Results are
+memoized, so moving the slider back and forth is O(1).
+
+Polygons with more sides than can be told apart from the circle at the
+current zoom are not drawn vertex by vertex (see visible_sides_limit).
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+BASE_SIDES = 6
+MAX_DOUBLINGS = 20 # 6 * 2**20 = 6,291,456 sides
+MIN_SIDES = 3
+MAX_SIDES = BASE_SIDES * 2**MAX_DOUBLINGS
+
+
+@lru_cache(maxsize=None)
+def archimedes_table(doublings=MAX_DOUBLINGS):
+    """
+    Returns (sides, lower, upper) arrays for 6 * 2**k sided polygons, k = 0..doublings,
+    where lower/upper are the half-perimeters of the inscribed/circumscribed polygon
+    around a unit circle (i.e. the bounds for Pi). Uses Archimedes' recurrences:
+
+        upper_2n = 2 * upper_n * lower_n / (upper_n + lower_n)
+        lower_2n = sqrt(upper_2n * lower_n)
+    """
+    sides = BASE_SIDES * 2 ** np.arange(doublings + 1, dtype=np.int64)
+    lower = np.empty(doublings + 1)
+    upper = np.empty(doublings + 1)
+    lower[0] = 3.0 # Hexagon inscribed in a unit circle
+    upper[0] = 2 * math.sqrt(3) # Hexagon circumscribed about a unit circle
+    for k in range(doublings):
+        upper[k + 1] = 2 * upper[k] * lower[k] / (upper[k] + lower[k])
+        lower[k + 1] = math.sqrt(upper[k + 1] * lower[k])
+    # Read-only, because the cached arrays are shared between callers
+    for array in (sides, lower, upper):
+        array.flags.writeable = False
+    return sides, lower, upper
+
+
+def archimedes_bounds(doublings):
+    """(sides, lower, upper) for the polygon with 6 * 2**doublings sides."""
+    sides, lower, upper = archimedes_table(max(MAX_DOUBLINGS, doublings))
+    return int(sides[doublings]), float(lower[doublings]), float(upper[doublings])
+
+
+def polygon_half_perimeters(sides):
+    """
+    Vectorized bounds (lower, upper) for any number(s) of sides, n*sin(pi/n) and
+    n*tan(pi/n). Both are products of well-conditioned factors, so they are
+    accurate for large n as well; used for side counts that are not 6 * 2**k.
+    """
+    sides = np.asarray(sides, dtype=float)
+    angle = np.pi / sides
+    return sides * np.sin(angle), sides * np.tan(angle)
+
+
+@lru_cache(maxsize=1024)
+def polygon_bounds(sides):
+    """(lower, upper) for a polygon with any number of sides from MIN_SIDES on."""
+    if sides < MIN_SIDES:
+        raise ValueError(f"a polygon has at least {MIN_SIDES} sides")
+    doublings = (sides // BASE_SIDES).bit_length() - 1
+    if doublings >= 0 and sides == BASE_SIDES << doublings: # 6 * 2**k: from the doubling table
+        return archimedes_bounds(doublings)[1:]
+    lower, upper = polygon_half_perimeters(sides)
+    return float(lower), float(upper)
+
+
+def visible_sides_limit(radius_px, tolerance_px=0.5):
+    """
+    Largest number of sides for which a polygon still visibly differs from a circle
+    of 'radius_px' pixels, i.e. its sagitta r*(1 - cos(pi/n)) exceeds 'tolerance_px'.
+    Above this, drawing every vertex produces exactly the pixels of the circle.
+    """
+    if radius_px <= tolerance_px:
+        return BASE_SIDES
+    return int(math.pi / math.acos(1 - tolerance_px / radius_px))
+
+
+class PolygonLayer:
+    """
+    Draws the inscribed and circumscribed polygons of a circle, with level of detail:
+    when the polygon cannot be told apart from the circle at the current zoom, it is
+    hidden instead of being drawn with (possibly millions of) vertices.
+    """
+
+    def __init__(self, ax, color, linewidth=1.0):
+        from matplotlib.patches import Polygon # The bounds above are used before matplotlib is loaded
+        self.ax = ax
+        self.inscribed = Polygon(np.zeros((BASE_SIDES, 2)), closed=True, fill=False,
+                                 edgecolor=color, linestyle='--', lw=linewidth, visible=False)
+        self.circumscribed = Polygon(np.zeros((BASE_SIDES, 2)), closed=True, fill=False,
+                                     edgecolor=color, linestyle=':', lw=linewidth, visible=False)
+        ax.add_patch(self.inscribed)
+        ax.add_patch(self.circumscribed)
+        self.enabled = False
+        self._unit_key = None
+        self._unit = None
+
+    @property
+    def artists(self):
+        return (self.inscribed, self.circumscribed)
+
+    def _unit_polygon(self, sides):
+        """Vertices of the unit-circle inscribed polygon, cached for the last side count."""
+        if sides != self._unit_key:
+            angles = np.linspace(0, 2 * np.pi, sides, endpoint=False) + np.pi / 2
+            self._unit = np.column_stack((np.cos(angles), np.sin(angles)))
+            self._unit_key = sides
+        return self._unit
+
+    def update(self, center_x, center_y, radius, sides):
+        """
+        Places both polygons around the circle. Returns True if they are drawn,
+        False if they are hidden (disabled, or indistinguishable from the circle).
+        """
+        pixels_per_unit = abs(self.ax.transData.get_matrix()[0, 0])
+        drawn = self.enabled and sides <= visible_sides_limit(radius * pixels_per_unit)
+        if drawn:
+            unit = self._unit_polygon(sides)
+            center = np.array([center_x, center_y])
+            self.inscribed.set_xy(center + radius * unit)
+            self.circumscribed.set_xy(center + (radius / math.cos(math.pi / sides)) * unit)
+        self.inscribed.set_visible(drawn)
+        self.circumscribed.set_visible(drawn)
+        return drawn
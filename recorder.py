@@ -0,0 +1,289 @@
+"""
+Recording of radius animations straight from the Agg buffer of the canvas.
+
+A FrameRecorder copies the rendered RGBA buffer of a frame (one memcpy, no
+round trip through Tk) into a bounded queue, and writer threads hand the
+frames to a sink: a numbered PNG sequence, one raw RGBA file, or an ffmpeg
+process that encodes a video. When the sink cannot keep up, capturing blocks
+until the writers have caught up, so memory stays flat however long the
+recording runs. PNG files are independent of each other, so several writers
+encode them in parallel; the other sinks get their frames in order from one.
+
+Frames are placed on a constant frame-rate timeline by their timestamps: a
+frame that took longer than one interval is repeated, an extra frame within
+the same interval is dropped, so the recording plays back at real speed.
+
+render_animation() renders the same radius animation without a window, with
+a fixed time step instead of the wall clock, so the output is deterministic
+and is produced faster than real time:
+
+    python main.py record --start 1 --end 100 --out frames/frame.png
+"""
+import argparse
+import math
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+_STOP = object() # Queue sentinel
+
+
+class PngSequenceSink:
+    """Writes every frame as '<stem>_000000.png', '<stem>_000001.png', ... next to 'path'."""
+    ordered = False # Frames may be written concurrently and out of order
+
+    def __init__(self, path, compress_level=1):
+        from PIL import Image # Matplotlib depends on Pillow
+        self._image = Image
+        stem, _ = os.path.splitext(path)
+        self.pattern = stem + "_{:06d}.png"
+        self.compress_level = compress_level # Fast zlib level; the sequence is an intermediate
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame, number):
+        image = self._image.fromarray(frame, "RGBA")
+        image.save(self.pattern.format(number), compress_level=self.compress_level)
+
+    def close(self):
+        pass
+
+
+class RawSink:
+    """
+    Appends the frames as raw RGBA bytes to one file, e.g. for
+    'ffmpeg -f rawvideo -pix_fmt rgba -s WxH -r FPS -i frames.rgba out.mp4'.
+    """
+    ordered = True
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+
+    def write(self, frame, number):
+        self.file.write(frame.data)
+
+    def close(self):
+        self.file.close()
+
+
+class FfmpegSink:
+    """Pipes the frames into ffmpeg, which encodes them into 'path' (e.g. an H.264 .mp4)."""
+    ordered = True
+
+    def __init__(self, path, width, height, fps, ffmpeg="ffmpeg"):
+        executable = shutil.which(ffmpeg)
+        if executable is None:
+            raise RuntimeError(f"{ffmpeg} was not found; record a PNG sequence or raw frames instead")
+        self.process = subprocess.Popen(
+            [
+                executable, "-loglevel", "error", "-y",
+                "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                "-pix_fmt", "yuv420p", path
+            ],
+            stdin=subprocess.PIPE
+        )
+
+    def write(self, frame, number):
+        self.process.stdin.write(frame.data)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+def open_sink(path, width, height, fps):
+    """Chooses the sink by extension: .png -> PNG sequence, .rgba/.raw -> raw file, else ffmpeg."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".png":
+        return PngSequenceSink(path)
+    if extension in (".rgba", ".raw"):
+        return RawSink(path)
+    return FfmpegSink(path, width, height, fps)
+
+
+class FrameRecorder:
+    """
+    Streams canvas frames to a sink on writer threads ('writers' of them if
+    the sink accepts frames out of order, else one). At most 'max_queued'
+    frames are held in memory. Errors of the sink are raised by the next
+    capture() or by close().
+    """
+
+    def __init__(self, sink, fps=60, max_queued=16, max_gap=0.5, writers=None):
+        self.sink = sink
+        self.fps = fps
+        self.max_gap = max_gap # A longer pause between captures starts a new segment
+        self.frames = 0 # Frames on the timeline (including repeats)
+        self.stalls = 0 # Captures that had to wait for the writer
+        self.shape = None # (height, width, 4) of the first frame; all frames must match
+        self._last_time = None
+        self._error = None
+        self._queue = queue.Queue(maxsize=max_queued)
+        if sink.ordered:
+            writers = 1
+        elif writers is None:
+            writers = min(4, os.cpu_count() or 1)
+        self._threads = [
+            threading.Thread(target=self._write_frames, name=f"recorder-{index}", daemon=True)
+            for index in range(writers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def capture(self, canvas, timestamp=None):
+        """Copies the canvas' current Agg buffer and queues it; returns how often it was written."""
+        self._raise_error()
+        buffer = canvas.buffer_rgba()
+        if self.shape is None:
+            self.shape = buffer.shape
+        elif buffer.shape != self.shape:
+            raise ValueError("the canvas size changed during the recording")
+        repeat = 1
+        if timestamp is not None:
+            if self._last_time is not None and timestamp - self._last_time < self.max_gap:
+                repeat = int(round((timestamp - self._last_time) * self.fps))
+                if repeat == 0:
+                    return 0 # Still within the interval of the previous frame
+                self._last_time += repeat / self.fps
+            else:
+                self._last_time = timestamp
+        frame = np.array(buffer) # The renderer reuses its buffer for the next frame
+        if self._queue.full():
+            self.stalls += 1
+        self._queue.put((frame, self.frames, repeat))
+        self.frames += repeat
+        return repeat
+
+    def close(self):
+        """Writes the queued frames and closes the sink."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        try:
+            self.sink.close()
+        finally:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_frames(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if self._error is not None:
+                continue # Keep draining so that capture() never blocks forever
+            frame, first, repeat = item
+            try:
+                for number in range(first, first + repeat):
+                    self.sink.write(frame, number)
+            except Exception as error:
+                self._error = error
+
+
+def render_animation(start_radius, end_radius, sink, center=(0.0, 0.0), fps=60, size=600, dpi=100,
+                     step_size=0.05, step_interval=0.015, threshold=0.01, hold=0.5, progress=None):
+    """
+    Renders the application's radius animation from 'start_radius' to
+    'end_radius' off screen, with a fixed time step of 1 / fps, and writes every
+    frame to 'sink'; 'hold' seconds of the final frame are appended. The view
+    follows the radius over the same zoom ladder as the application.
+    Returns the number of frames written.
+    """
+    from blitting import BlitManager
+    from circle_core import CircleModel, CircleRenderer, view_half_extent
+    from scheduler import AnimatedValue
+    from zoom_levels import ZoomLadder, apply_view
+
+    renderer = CircleRenderer(figsize=(size / dpi, size / dpi), dpi=dpi)
+    canvas = renderer.figure.canvas
+    blit_manager = BlitManager(canvas, (renderer.circle_patch, renderer.pi_segment))
+    model = CircleModel(*center, end_radius)
+    radius = AnimatedValue(start_radius, step_size, step_interval, threshold)
+    radius.set_target(end_radius)
+    view = AnimatedValue(0.0, 0.2, step_interval, 0.01) # Same easing as the application's zoom
+    ladder = ZoomLadder()
+    zoom_index = ladder.level_for(float(view_half_extent(start_radius)))
+    view.snap(ladder.levels[zoom_index])
+
+    recorder = FrameRecorder(sink, fps=fps)
+    dt = 1.0 / fps
+    frames = 0
+    hold_frames = int(round(hold * fps))
+    try:
+        moving = True
+        while moving or hold_frames > 0:
+            if not moving:
+                hold_frames -= 1
+            renderer.update(model, display_radius=radius.value)
+            zoom_index = ladder.level_for(float(view_half_extent(radius.value)), zoom_index)
+            view.set_target(ladder.levels[zoom_index])
+            if frames == 0 or not view.is_settled:
+                view.advance(dt)
+                layout = ladder.tick_layout(ladder.level_for(view.value), *center)
+                apply_view(renderer.ax, *center, view.value, layout)
+                blit_manager.invalidate()
+            blit_manager.update()
+            recorder.capture(canvas)
+            frames += 1
+            if progress is not None:
+                progress(frames)
+            moving = radius.advance(dt) or not view.is_settled
+    finally:
+        recorder.close()
+    return frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="main.py record",
+        description="Render the radius animation off screen to a video, PNG sequence or raw frames."
+    )
+    parser.add_argument("--start", type=float, default=1.0, help="start radius (default: %(default)s)")
+    parser.add_argument("--end", type=float, default=100.0, help="end radius (default: %(default)s)")
+    parser.add_argument("--center", type=float, nargs=2, default=(0.0, 0.0), metavar=("X", "Y"))
+    parser.add_argument("--out", default="animation/frame.png",
+                        help=".png: numbered PNG sequence, .rgba/.raw: raw RGBA frames, "
+                             "anything else: encoded by ffmpeg (default: %(default)s)")
+    parser.add_argument("--fps", type=int, default=60, help="frames per second (default: %(default)s)")
+    parser.add_argument("--size", type=int, default=600, help="frame size in pixels (default: %(default)s)")
+    parser.add_argument("--hold", type=float, default=0.5,
+                        help="seconds to hold the final frame (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if not all(math.isfinite(radius) and radius > 0 for radius in (args.start, args.end)):
+        parser.error("radii must be positive numbers")
+    if not all(math.isfinite(coordinate) for coordinate in args.center):
+        parser.error("--center must be finite")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.size <= 0:
+        parser.error("--size must be positive")
+    if not (math.isfinite(args.hold) and args.hold >= 0):
+        parser.error("--hold must be zero or more seconds")
+
+    start = time.perf_counter()
+    try:
+        sink = open_sink(args.out, args.size, args.size, args.fps)
+    except (RuntimeError, OSError) as error:
+        parser.error(str(error))
+    frames = render_animation(args.start, args.end, sink, tuple(args.center), args.fps, args.size, hold=args.hold)
+    seconds = time.perf_counter() - start
+    print(f"Frames: {frames} ({frames / args.fps:.2f} s of animation)")
+    print(f"Time: {seconds:.2f} s ({frames / seconds:.1f} frames/sec)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
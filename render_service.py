@@ -0,0 +1,313 @@
+"""
+Local HTTP render service for circle images.
+
+Serves images with the styling of the interactive application, for tools
+that would otherwise start a Tk process of their own:
+
+    GET /render?x=0&y=0&r=5&size=256&format=png   -> image/png (or image/svg+xml)
+    GET /metrics                                   -> JSON counters of the service
+
+Requests are rendered by a pool of CircleRenderers that are built once and
+reused, so a request costs one draw and no figure construction. The encoded
+images are kept in an LRU cache bounded by their total size in bytes, and
+identical requests are answered from it.
+
+The server only listens on localhost (or on a Unix socket):
+
+    python main.py serve --port 8765 --pool 4 --cache-mb 64
+    python main.py serve --unix /tmp/circles.sock
+"""
+import argparse
+import collections
+import json
+import math
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from circle_core import CircleModel, CircleRenderer, view_half_extent
+
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+MIN_SIZE = 16
+MAX_SIZE = 4096
+MAX_COORDINATE = 1e300 # Far enough below the float range for the view's limit and tick arithmetic
+
+
+class ByteLRUCache:
+    """Thread-safe LRU cache of bytes values whose total size stays below 'max_bytes'."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Stores 'value' and evicts the least recently used entries as needed."""
+        if len(value) > self.max_bytes:
+            return # Would evict everything else and still not fit
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = value
+            self.current_bytes += len(value)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+class RendererPool:
+    """
+    A fixed number of CircleRenderers shared by the request threads. A thread
+    borrows one renderer at a time; renderers already at the requested pixel
+    size are preferred, so figures are rarely resized.
+    """
+
+    def __init__(self, size=4, dpi=100):
+        self.dpi = dpi
+        self._free = [CircleRenderer(dpi=dpi) for _ in range(size)]
+        self._available = threading.Condition()
+        self.waits = 0 # Requests that had to wait for a free renderer
+
+    def acquire(self, pixels):
+        with self._available:
+            if not self._free:
+                self.waits += 1
+                self._available.wait_for(lambda: self._free)
+            inches = pixels / self.dpi
+            for index, renderer in enumerate(self._free):
+                if tuple(renderer.figure.get_size_inches()) == (inches, inches):
+                    return self._free.pop(index)
+            renderer = self._free.pop()
+        renderer.figure.set_size_inches(inches, inches)
+        return renderer
+
+    def release(self, renderer):
+        with self._available:
+            self._free.append(renderer)
+            self._available.notify()
+
+
+class RenderService:
+    """Renders circle images through a RendererPool and a ByteLRUCache."""
+
+    def __init__(self, pool_size=4, cache_bytes=64 * 2**20, dpi=100):
+        self.pool = RendererPool(pool_size, dpi)
+        self.cache = ByteLRUCache(cache_bytes)
+        self.renders = 0
+        self.render_seconds = 0.0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def render(self, center_x, center_y, radius, size=256, image_format="png"):
+        """Returns the encoded image, from the cache if it was rendered before."""
+        key = (image_format, size, center_x, center_y, radius)
+        image = self.cache.get(key)
+        if image is not None:
+            return image
+        start = time.perf_counter()
+        renderer = self.pool.acquire(size)
+        try:
+            image = renderer.render_bytes(CircleModel(center_x, center_y, radius), format=image_format)
+        finally:
+            self.pool.release(renderer)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.renders += 1
+            self.render_seconds += elapsed
+        self.cache.put(key, image)
+        return image
+
+    def metrics(self):
+        with self._lock:
+            renders, render_seconds = self.renders, self.render_seconds
+        return {
+            "uptime_s": time.monotonic() - self.started,
+            "renders": renders,
+            "render_mean_ms": render_seconds / renders * 1000 if renders else 0.0,
+            "pool_waits": self.pool.waits,
+            "cache": self.cache.metrics(),
+        }
+
+
+def parse_render_query(query):
+    """Parses the query string of /render into render() arguments; raises ValueError if invalid."""
+    params = parse_qs(query)
+
+    def value(name, default=None):
+        values = params.get(name)
+        if not values:
+            if default is None:
+                raise ValueError(f"missing parameter '{name}'")
+            return default
+        return values[-1]
+
+    try:
+        center_x = float(value("x", "0"))
+        center_y = float(value("y", "0"))
+        radius = float(value("r"))
+        size = int(value("size", "256"))
+    except ValueError as error:
+        raise ValueError(f"invalid parameter: {error}") from None
+    image_format = value("format", "png").lower()
+    if not (math.isfinite(radius) and radius > 0):
+        raise ValueError("'r' must be a positive number")
+    if not (math.isfinite(center_x) and math.isfinite(center_y)):
+        raise ValueError("'x' and 'y' must be finite")
+    width = 2 * float(view_half_extent(radius))
+    if not max(abs(center_x), abs(center_y)) + width <= MAX_COORDINATE:
+        raise ValueError(f"the view of this circle must stay within \u00b1{MAX_COORDINATE:g}")
+    if not MIN_SIZE <= size <= MAX_SIZE:
+        raise ValueError(f"'size' must be between {MIN_SIZE} and {MAX_SIZE}")
+    if image_format not in FORMATS:
+        raise ValueError(f"'format' must be one of {', '.join(FORMATS)}")
+    return center_x, center_y, radius, size, image_format
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    server_version = "CircleRender/1.0"
+    protocol_version = "HTTP/1.1" # Keep-alive, so benchmark clients can reuse connections
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/render":
+            try:
+                arguments = parse_render_query(url.query)
+            except ValueError as error:
+                self._send(400, "text/plain; charset=utf-8", f"{error}\n".encode())
+                return
+            try:
+                image = self.server.service.render(*arguments)
+            except Exception as error: # Answer instead of dropping the connection
+                self.log_error("rendering %s failed: %r", url.query, error)
+                self._send(500, "text/plain; charset=utf-8", f"rendering failed: {error}\n".encode())
+                return
+            self._send(200, FORMATS[arguments[-1]], image)
+        elif url.path == "/metrics":
+            body = json.dumps(self.server.service.metrics(), indent=2).encode()
+            self._send(200, "application/json", body)
+        else:
+            self._send(404, "text/plain; charset=utf-8", b"not found\n")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, RenderRequestHandler)
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class RenderUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path, service, verbose=False):
+            self.service = service
+            self.verbose = verbose
+            try:
+                mode = os.stat(path).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(f"{path} exists and is not a socket")
+                os.unlink(path) # Left behind by a previous run
+            super().__init__(path, RenderRequestHandler)
+else: # Windows
+    RenderUnixServer = None
+
+
+def create_server(service, host="127.0.0.1", port=8765, unix_socket=None, verbose=False):
+    """Creates the server for 'service' on localhost:port, or on 'unix_socket' if given."""
+    if unix_socket is not None:
+        if RenderUnixServer is None:
+            raise RuntimeError("Unix sockets are not supported on this platform")
+        return RenderUnixServer(unix_socket, service, verbose)
+    return RenderHTTPServer((host, port), service, verbose)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve circle images over HTTP on localhost."
+    )
+    parser.add_argument("--port", type=int, default=8765, help="TCP port on 127.0.0.1 (default: %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--pool", type=int, default=4, help="number of pre-built figures (default: %(default)s)")
+    parser.add_argument("--cache-mb", type=float, default=64, help="image cache size in MiB (default: %(default)s)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    service = RenderService(pool_size=args.pool, cache_bytes=int(args.cache_mb * 2**20))
+    try:
+        server = create_server(service, port=args.port, unix_socket=args.unix, verbose=args.verbose)
+    except (RuntimeError, OSError) as error:
+        parser.error(str(error))
+    where = args.unix or f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Serving circle images on {where} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix:
+            os.unlink(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
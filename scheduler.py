@@ -0,0 +1,212 @@
+import inspect
+import math
+import time
+
+
+def easing_remaining(dt, step_size, step_interval):
+    """
+    Fraction of the remaining difference that is left after easing for 'dt'
+    seconds, when 'step_size' of it is covered every 'step_interval' seconds.
+    """
+    return (1.0 - step_size) ** (dt / step_interval)
+
+
+class AnimatedValue:
+    """
+    A value that eases toward a target based on elapsed wall time.
+
+    The easing keeps the feel of the original fixed-step animation: each
+    'step_interval' seconds, 'step_size' of the remaining difference is covered.
+    Because the progress is derived from the real time between frames, the
+    animation takes the same time on a fast and on a loaded machine.
+    """
+
+    def __init__(self, value, step_size=0.05, step_interval=0.015, threshold=0.01):
+        self.value = value
+        self.target = value
+        self.step_size = step_size
+        self.step_interval = step_interval
+        self.threshold = threshold
+
+    @property
+    def is_settled(self):
+        return abs(self.target - self.value) < self.threshold
+
+    def set_target(self, target):
+        self.target = target
+
+    def snap(self, value=None):
+        """Jumps straight to 'value' (or the current target) and stops easing."""
+        if value is not None:
+            self.target = value
+        self.value = self.target
+
+    def advance(self, dt):
+        """
+        Moves the value toward the target for 'dt' seconds of elapsed time.
+        Returns True while the value is still moving.
+        """
+        if self.is_settled:
+            self.value = self.target # Snap to target
+            return False
+        remaining = easing_remaining(dt, self.step_size, self.step_interval)
+        self.value = self.target - (self.target - self.value) * remaining
+        if self.is_settled:
+            self.value = self.target
+            return False
+        return True
+
+
+class FrameScheduler:
+    """
+    Runs per-frame work on a Tk-style event loop, driven by a monotonic clock.
+
+    Any object that provides 'after(ms, func)' and 'after_cancel(id)' can host
+    the scheduler (a Tk root or any widget), so several animated properties or
+    views can share one frame loop. Each tick:
+
+    1. runs the coalesced callbacks posted since the last frame (only the latest
+       call per key, so a burst of slider events becomes a single update),
+    2. advances every registered task with the real elapsed time 'dt',
+    3. calls the frame callbacks (e.g. a renderer that draws once per frame
+       whatever the tasks changed),
+    4. schedules the next tick on the next frame boundary. If a tick ran late,
+       the frames that were missed are skipped instead of being replayed.
+
+    The loop goes idle when there are no tasks and no pending callbacks.
+    """
+
+    def __init__(self, root, frame_rate=60, clock=time.monotonic):
+        self.root = root
+        self.frame_interval = 1.0 / frame_rate
+        self.clock = clock
+        self._tasks = []
+        self._frame_callbacks = []
+        self._pending = {} # key -> (callback, args), latest call wins
+        self._job_id = None
+        self._ticking = False
+        self._last_tick = None
+        self._next_deadline = None
+        self.frames_run = 0
+        self.frames_skipped = 0
+
+    @property
+    def is_running(self):
+        return self._job_id is not None
+
+    @property
+    def in_frame(self):
+        """True while a tick is running, i.e. frame callbacks are still to come."""
+        return self._ticking
+
+    @property
+    def is_idle(self):
+        """True when no tasks or coalesced callbacks are waiting, i.e. everything has settled."""
+        return not self._tasks and not self._pending and not self._ticking
+
+    def _find_task(self, task):
+        # Decorated tasks (e.g. timing wrappers) match the function they wrap
+        unwrapped = inspect.unwrap(task)
+        for index, registered in enumerate(self._tasks):
+            if inspect.unwrap(registered) == unwrapped:
+                return index
+        return None
+
+    def add_task(self, task):
+        """
+        Registers 'task(dt)' to be called once per frame. The task is removed
+        when it returns a false value.
+        """
+        if self._find_task(task) is None:
+            self._tasks.append(task)
+        self._wake()
+
+    def remove_task(self, task):
+        index = self._find_task(task)
+        if index is not None:
+            del self._tasks[index]
+
+    def has_task(self, task):
+        return self._find_task(task) is not None
+
+    def add_frame_callback(self, callback):
+        """
+        Registers 'callback()' to run at the end of every tick, after the tasks.
+        Frame callbacks do not keep the loop running on their own.
+        """
+        self._frame_callbacks.append(callback)
+
+    def remove_frame_callback(self, callback):
+        if callback in self._frame_callbacks:
+            self._frame_callbacks.remove(callback)
+
+    def coalesce(self, key, callback, *args):
+        """
+        Defers 'callback(*args)' to the start of the next frame. If another call
+        with the same key arrives before then, it replaces this one.
+        """
+        self._pending[key] = (callback, args)
+        self._wake()
+
+    def cancel(self, key):
+        """Drops a coalesced callback that has not run yet."""
+        self._pending.pop(key, None)
+
+    def stop(self):
+        """Stops the frame loop and forgets all tasks and pending callbacks."""
+        if self._job_id is not None:
+            self.root.after_cancel(self._job_id)
+            self._job_id = None
+        self._tasks.clear()
+        self._pending.clear()
+        self._last_tick = None
+
+    def _wake(self):
+        # A tick in progress reschedules itself once it is done.
+        if self._job_id is None and not self._ticking:
+            self._last_tick = self.clock()
+            self._next_deadline = self._last_tick
+            self._job_id = self.root.after(0, self._tick)
+
+    def _tick(self):
+        self._job_id = None
+        self._ticking = True
+        try:
+            self._run_frame()
+        finally:
+            self._ticking = False
+        self._schedule_next()
+
+    def _run_frame(self):
+        now = self.clock()
+        dt = now - self._last_tick
+        self._last_tick = now
+        self.frames_run += 1
+
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            for callback, args in pending.values():
+                callback(*args)
+
+        for task in list(self._tasks):
+            if task in self._tasks and not task(dt):
+                self.remove_task(task)
+
+        for callback in list(self._frame_callbacks):
+            callback()
+
+    def _schedule_next(self):
+        if not self._tasks and not self._pending:
+            self._last_tick = None
+            return
+
+        # Aim for the next frame boundary. When the frame took longer than the
+        # interval, skip the missed frames rather than trying to catch up.
+        self._next_deadline += self.frame_interval
+        now = self.clock()
+        if self._next_deadline < now:
+            missed = math.ceil((now - self._next_deadline) / self.frame_interval)
+            self.frames_skipped += missed
+            self._next_deadline += missed * self.frame_interval
+        delay_ms = max(1, int(round((self._next_deadline - now) * 1000)))
+        self._job_id = self.root.after(delay_ms, self._tick)
@@ -0,0 +1,139 @@
+"""
+Spatial index over the circles of a CircleArray, for hit-testing.
+
+Circles are grouped into levels by size: a circle whose extent (radius) is at
+most base * 2**level lives on that level, in the grid cell of width
+base * 2**(level + 1) that contains its center. A circle can then only contain
+a point if its center lies in the 3 x 3 cells around the point on its level,
+whatever the size of the other circles. Each level is stored as a sorted
+array of cell keys with the matching circle indices (compressed rows), so a
+query is a few binary searches per level instead of a pass over all circles,
+and a rebuild is a handful of vectorized NumPy operations.
+
+Moving or resizing circles does not rebuild the grid: the changed indices are
+kept in a small dirty set that every query also checks directly, and the grid
+is only rebuilt once that set grows past a fraction of all circles. Candidates
+are always verified against the current centers and radii, so stale grid
+entries can never produce a wrong hit.
+"""
+import math
+
+import numpy as np
+
+_KEY_STRIDE = 1 << 32 # Cell key = column * stride + row
+
+
+def rim_hit(distance, radius, tolerance):
+    """True if a point at 'distance' from the center is on the rim band of the circle."""
+    return bool(abs(distance - radius) <= min(tolerance, radius / 2))
+
+
+class CircleGridIndex:
+    """
+    Hierarchical uniform grid over a CircleArray. A circle is indexed with the
+    larger of its radius and target radius, so circles that are still growing
+    toward their target do not need to be updated every frame.
+    """
+
+    def __init__(self, circles, rebuild_fraction=1 / 16, min_dirty=256):
+        self.circles = circles
+        self.rebuild_fraction = rebuild_fraction
+        self.min_dirty = min_dirty
+        self.base = 1.0
+        self._levels = {} # level -> (sorted cell keys, circle indices)
+        self._indexed = 0 # Circles [0, _indexed) are in the grid
+        self._dirty = set()
+        self.rebuilds = 0
+
+    def invalidate(self):
+        """Forgets the grid, e.g. after circles were removed and the indices shifted."""
+        self._levels = {}
+        self._indexed = 0
+        self._dirty.clear()
+
+    def update(self, indices):
+        """Marks circles that were moved or resized."""
+        self._dirty.update(int(index) for index in np.atleast_1d(indices))
+
+    def _extents(self, indices=slice(None)):
+        return np.maximum(self.circles.radii[indices], self.circles.target_radii[indices])
+
+    def _level_of(self, extents):
+        return np.maximum(0, np.ceil(np.log2(np.maximum(extents, 1e-12) / self.base))).astype(np.int64)
+
+    def rebuild(self):
+        count = len(self.circles)
+        self._levels = {}
+        self._dirty.clear()
+        self._indexed = count
+        self.rebuilds += 1
+        if count == 0:
+            return
+        extents = self._extents()
+        positive = extents[extents > 0]
+        self.base = float(np.min(positive)) if len(positive) else 1.0
+        levels = self._level_of(extents)
+        cell_sizes = self.base * np.exp2(levels + 1)
+        centers = self.circles.centers
+        columns = np.floor(centers[:, 0] / cell_sizes).astype(np.int64)
+        rows = np.floor(centers[:, 1] / cell_sizes).astype(np.int64)
+        keys = columns * _KEY_STRIDE + rows
+
+        order = np.lexsort((keys, levels))
+        levels, keys = levels[order], keys[order]
+        boundaries = np.flatnonzero(np.diff(levels)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, count]):
+            self._levels[int(levels[start])] = (keys[start:end], order[start:end])
+
+    def _needs_rebuild(self):
+        count = len(self.circles)
+        if count < self._indexed: # Circles were removed behind our back
+            return True
+        unindexed = len(self._dirty) + count - self._indexed
+        return unindexed > max(self.min_dirty, self.rebuild_fraction * count)
+
+    def candidates(self, x, y, tolerance=0.0):
+        """Indices of the circles that may contain (x, y), with duplicates; a superset of the hits."""
+        if self._needs_rebuild():
+            self.rebuild()
+        found = []
+        for level, (keys, indices) in self._levels.items():
+            cell_size = self.base * 2.0 ** (level + 1)
+            reach = max(1, math.ceil((cell_size / 2 + tolerance) / cell_size))
+            column = math.floor(x / cell_size)
+            row = math.floor(y / cell_size)
+            offsets = np.arange(-reach, reach + 1)
+            wanted = ((column + offsets)[:, None] * _KEY_STRIDE + (row + offsets)[None, :]).ravel()
+            starts = np.searchsorted(keys, wanted, side="left")
+            ends = np.searchsorted(keys, wanted, side="right")
+            for start, end in zip(starts[starts < ends], ends[starts < ends]):
+                found.append(indices[start:end])
+        found.append(np.arange(self._indexed, len(self.circles)))
+        if self._dirty:
+            found.append(np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty)))
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def hit(self, x, y, tolerance=0.0):
+        """
+        Returns (index, on_rim) of the topmost (last drawn) circle that contains
+        (x, y) or whose rim is within 'tolerance' of it, or None. A circle whose
+        rim band is at (x, y) wins over the circles that merely contain it, so
+        nested (e.g. concentric) circles can each be grabbed by their rim. The
+        rim band is at most half the radius wide, so small circles can still be
+        grabbed inside.
+        """
+        candidates = self.candidates(x, y, tolerance)
+        candidates = candidates[candidates < len(self.circles)]
+        if len(candidates) == 0:
+            return None
+        offsets = self.circles.centers[candidates] - (x, y)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        radii = self.circles.radii[candidates]
+        hits = distances <= radii + tolerance
+        if not hits.any():
+            return None
+        on_rim = hits & (np.abs(distances - radii) <= np.minimum(tolerance, radii / 2))
+        if on_rim.any():
+            hits = on_rim
+        position = np.flatnonzero(hits)[np.argmax(candidates[hits])]
+        return int(candidates[position]), bool(on_rim[position])
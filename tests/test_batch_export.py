@@ -0,0 +1,28 @@
+import pytest
+
+from batch_export import read_specs
+
+
+def test_read_specs_from_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "specs.csv"
+    csv_path.write_text("center_x,center_y,radius,name\n1,2,3,first\n4,5,6,\n")
+    specs = [(spec.center_x, spec.radius, spec.name) for spec in read_specs(str(csv_path))]
+    assert specs == [(1.0, 3.0, "first"), (4.0, 6.0, "circle_000001")]
+
+    jsonl_path = tmp_path / "specs.jsonl"
+    jsonl_path.write_text('{"center_x": 0, "center_y": 0, "radius": 2.5}\n\n')
+    assert [spec.radius for spec in read_specs(str(jsonl_path))] == [2.5]
+
+
+@pytest.mark.parametrize("row, message", [
+    ("0,0,nan", "not finite"),
+    ("inf,0,1", "not finite"),
+    ("0,0,abc", "not a number"),
+    ("0,0,-1", "non-positive radius"),
+    ("0,0,1,../escape", "plain file name"),
+])
+def test_read_specs_rejects_bad_rows(tmp_path, row, message):
+    path = tmp_path / "specs.csv"
+    path.write_text(f"center_x,center_y,radius,name\n1,1,1,ok\n{row}\n")
+    with pytest.raises(ValueError, match=message):
+        list(read_specs(str(path)))
@@ -0,0 +1,88 @@
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from blitting import BlitManager
+
+
+@pytest.fixture
+def manager():
+    figure, axes = plt.subplots(figsize=(2, 2), dpi=50)
+    (line,) = axes.plot([0, 1], [0, 1], color="red", linewidth=4)
+    manager = BlitManager(figure.canvas, [line])
+    manager.update()
+    yield manager, line
+    plt.close(figure)
+
+
+@pytest.mark.parametrize("fmt", ["png", "svg", "pdf"])
+def test_savefig_does_not_become_the_background(manager, fmt):
+    manager, line = manager
+    manager.canvas.figure.savefig(io.BytesIO(), format=fmt)
+    line.set_visible(False)
+    manager.update() # Must redraw in full, not restore a background holding the line
+    image = np.asarray(manager.canvas.buffer_rgba())
+    red = (image[..., 0] > 200) & (image[..., 1] < 80) & (image[..., 2] < 80)
+    assert not red.any()
+
+
+def test_ring_tiles_cover_the_ring():
+    from blitting import ring_tiles
+    tiles = ring_tiles(100.0, 50.0, 20.0, 30.0, size=8)
+    angles = np.linspace(0, 2 * np.pi, 200)
+    for radius in (20.0, 25.0, 30.0):
+        for x, y in zip(100 + radius * np.cos(angles), 50 + radius * np.sin(angles)):
+            assert any(tile.contains(x, y) for tile in tiles)
+    assert not any(tile.contains(100, 50) for tile in tiles) # The inside is left alone
+
+
+def test_repair_matches_a_full_redraw():
+    from blitting import ring_tiles
+    from circle_model import pi_segment_width
+    from multi_circle import CircleArray, MultiCircleLayer
+
+    figure, axes = plt.subplots(figsize=(3, 3), dpi=100)
+    axes.set_xlim(-10, 10)
+    axes.set_ylim(-10, 10)
+    axes.set_axis_off()
+    rng = np.random.default_rng(5)
+    circles = CircleArray()
+    circles.add(rng.uniform(-9, 9, (300, 2)), rng.uniform(0.3, 2, 300), np.tile((0, 0, 0, 1.0), (300, 1)))
+    circles.radii[10] = 3.0 # Leaves a clear ghost if not repaired
+    layer = MultiCircleLayer(axes, circles)
+    layer.sync()
+    manager = BlitManager(figure.canvas)
+    manager.update()
+
+    old_x, old_y = circles.centers[10]
+    old_radius = circles.radii[10]
+    index = circles.bring_to_front(10)
+    circles.centers[index] = (4.0, -3.0)
+    pixels_per_unit = abs(axes.transData.get_matrix()[0, 0])
+    pad = 3 / pixels_per_unit
+    inner, outer = max(old_radius - pi_segment_width(old_radius) - pad, 0), old_radius + pad
+    tiles = ring_tiles(*axes.transData.transform((old_x, old_y)), inner * pixels_per_unit, outer * pixels_per_unit)
+    behind = layer.in_rings([(old_x, old_y, max(inner - 1, 0), outer + 1)])
+    behind[index] = False
+
+    def draw_on_top():
+        layer.sync(subset=[index])
+        for artist in layer.artists:
+            figure.draw_artist(artist)
+
+    manager.repair(tiles, lambda: layer.sync(subset=behind), layer.sync, draw_on_top)
+    repaired = np.asarray(figure.canvas.buffer_rgba()).astype(int)
+    manager.invalidate()
+    manager.update()
+    expected = np.asarray(figure.canvas.buffer_rgba()).astype(int)
+    rows, columns = np.nonzero(np.abs(repaired - expected).max(axis=2) > 40)
+    x, y = axes.transData.inverted().transform(np.column_stack((columns, len(expected) - 1 - rows))).T
+    # The moved circle is drawn above the other circles' Pi segments instead of below them
+    assert np.all(np.abs(np.hypot(x - 4.0, y + 3.0) - 3.0) < 0.15)
+    plt.close(figure)
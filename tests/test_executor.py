@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from executor import BackgroundExecutor
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.tasks = []
+
+    def add_task(self, task):
+        if task not in self.tasks:
+            self.tasks.append(task)
+
+    def remove_task(self, task):
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+
+@pytest.fixture
+def executor():
+    executor = BackgroundExecutor(FakeScheduler(), threads=2)
+    yield executor
+    executor.shutdown()
+
+
+def finish(executor, job):
+    job._future.result(timeout=5)
+    executor.drain()
+
+
+def test_results_are_delivered_on_drain(executor):
+    results = []
+    job = executor.submit(sum, [1, 2, 3], on_result=results.append)
+    job._future.result(timeout=5)
+    assert results == [] # Not before the UI thread drains
+    executor.drain()
+    assert results == [6] and job.done and executor.active_jobs == 0
+
+
+def test_superseded_job_is_dropped(executor):
+    results = []
+
+    def slow(job, value):
+        while not job.cancelled and value == "old":
+            pass
+        job.raise_if_cancelled()
+        return value
+
+    old = executor.submit(slow, "old", stream=True, key="k", on_result=results.append)
+    new = executor.submit(slow, "new", stream=True, key="k", on_result=results.append)
+    finish(executor, old)
+    finish(executor, new)
+    assert results == ["new"] and old.cancelled
+
+
+def test_latest_only_delivers_the_newest_update(executor):
+    updates = []
+
+    def count(job):
+        for value in range(100):
+            job.emit(value)
+
+    job = executor.submit(count, stream=True, latest_only=True, on_update=updates.append)
+    finish(executor, job)
+    assert updates == [99]
+
+
+def test_wait_after_the_result_was_delivered(executor):
+    job = executor.submit(sum, [1, 2])
+    finish(executor, job)
+    assert asyncio.run(asyncio.wait_for(job.wait(), 1)) == 3
+
+
+def test_wait_after_the_error_was_delivered(executor):
+    job = executor.submit(int, "x", on_error=lambda error: None)
+    finish(executor, job)
+    with pytest.raises(ValueError):
+        asyncio.run(asyncio.wait_for(job.wait(), 1))
+
+
+def test_wait_before_the_result_is_delivered(executor):
+    async def main():
+        job = executor.submit(sum, [4, 5])
+        waiting = asyncio.ensure_future(job.wait())
+        await asyncio.sleep(0)
+        job._future.result(timeout=5)
+        executor.drain()
+        return await asyncio.wait_for(waiting, 1)
+
+    assert asyncio.run(main()) == 9
+
+
+def test_wait_on_a_cancelled_job(executor):
+    job = executor.submit(sum, [1])
+    job.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(job.wait())
@@ -0,0 +1,49 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from interaction import MAIN, CircleInteraction
+from multi_circle import CircleArray, radius_sweep
+from spatial_index import CircleGridIndex
+
+
+class FakeScheduler:
+    def coalesce(self, key, callback, *args):
+        pass
+
+    def cancel(self, key):
+        pass
+
+
+@pytest.fixture
+def scene():
+    figure, axes = plt.subplots(figsize=(5, 5), dpi=100)
+    axes.set_xlim(-12, 12)
+    axes.set_ylim(-12, 12)
+    circles = CircleArray()
+    interaction = CircleInteraction(figure.canvas, axes, FakeScheduler(), circles, CircleGridIndex(circles),
+                                    main_circle=lambda: (0.0, 0.0, 10.0), on_main_drag=None,
+                                    on_circles_changed=None)
+    yield interaction, circles
+    plt.close(figure)
+
+
+def test_radius_sweep_circles_are_grabbed_by_their_rim(scene):
+    interaction, circles = scene
+    centers, radii, colors = radius_sweep(5, (0.0, 0.0), 10.0)
+    circles.add(centers, radii, colors)
+    for i, radius in enumerate(radii[:-1]):
+        assert interaction.hit_test(radius, 0.0) == (i, True)
+    assert interaction.hit_test(10.0, 0.0) == (MAIN, True) # The main circle's rim stays on top
+
+
+def test_circle_inside_the_main_circle_wins_over_its_inside(scene):
+    interaction, circles = scene
+    circles.add(np.array([[3.0, 3.0]]), np.array([1.0]), np.ones((1, 4)))
+    assert interaction.hit_test(3.0, 3.0) == (0, False)
+    assert interaction.hit_test(-3.0, -3.0) == (MAIN, False)
+    assert interaction.hit_test(11.0, 11.0) is None
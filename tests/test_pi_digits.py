@@ -0,0 +1,147 @@
+import decimal
+import multiprocessing
+
+import pytest
+
+import pi_digits
+from pi_digits import PiDigitCache, circumference, compute_pi_digits
+
+
+def machin_decimals(count):
+    """The first 'count' decimals of Pi from Machin's formula, as an independent reference."""
+    scale = 10 ** (count + 10)
+
+    def arctan_inverse(x):
+        total = term = scale // x
+        n, sign = 1, 1
+        while term:
+            term //= x * x
+            n += 2
+            sign = -sign
+            total += sign * (term // n)
+        return total
+
+    pi = 4 * (4 * arctan_inverse(5) - arctan_inverse(239))
+    return str(decimal.Decimal(pi))[1:1 + count] # Decimal is not bound by the int-to-str digit limit
+
+
+REFERENCE = machin_decimals(5000)
+
+
+class Cancelled(Exception):
+    pass
+
+
+class FakeJob:
+    def __init__(self, cancel_after=None):
+        self.updates = []
+        self.cancel_after = cancel_after # Cancel once this many updates were emitted
+
+    def emit(self, update):
+        self.updates.append(update)
+
+    def raise_if_cancelled(self):
+        if self.cancel_after is not None and len(self.updates) >= self.cancel_after:
+            raise Cancelled
+
+    def digits(self):
+        return "".join(update.digits for update in self.updates)
+
+
+def test_digits_match_reference_in_stages():
+    job = FakeJob()
+    result = compute_pi_digits(job, 5000)
+    assert result == pi_digits.PiDigitsUpdate(5000, "", True)
+    assert job.digits() == REFERENCE
+    known = [update.known for update in job.updates]
+    assert len(known) > 2 and known == sorted(known) and known[-1] == 5000
+
+
+def test_few_digits():
+    job = FakeJob()
+    compute_pi_digits(job, 3)
+    assert job.digits() == "141"
+
+
+def test_cache_is_reused_and_extended(tmp_path):
+    path = tmp_path / "pi.txt"
+    cache = PiDigitCache(str(path))
+    compute_pi_digits(FakeJob(), 2000, cache)
+    assert cache.known == 2000
+    cache.close()
+
+    cache = PiDigitCache(str(path)) # As after a restart
+    job = FakeJob()
+    compute_pi_digits(job, 5000, cache)
+    assert job.updates[0] == pi_digits.PiDigitsUpdate(2000, REFERENCE[:2000], False)
+    assert job.digits() == REFERENCE
+    assert cache.digits(5000) == REFERENCE
+    assert cache.digits(10, start=4990) == REFERENCE[4990:]
+
+    job = FakeJob()
+    compute_pi_digits(job, 1000, cache) # Served from the cache alone
+    assert [update.digits for update in job.updates] == [REFERENCE[:1000]]
+    cache.close()
+
+
+def test_cache_extend_skips_known_digits(tmp_path):
+    cache = PiDigitCache(str(tmp_path / "pi.txt"))
+    cache.extend(0, "14159")
+    cache.extend(3, "5926") # Overlaps the known digits
+    cache.extend(20, "999") # Leaves a gap, ignored
+    assert cache.digits(100) == "1415926"
+    cache.close()
+
+
+def test_caches_sharing_a_file_do_not_duplicate_digits(tmp_path):
+    path = str(tmp_path / "pi.txt")
+    first = PiDigitCache(path)
+    compute_pi_digits(FakeJob(), 1000, first)
+    second = PiDigitCache(path) # Another instance of the application
+    compute_pi_digits(FakeJob(), 3000, first)
+    job = FakeJob()
+    compute_pi_digits(job, 3000, second) # Still starts from the 1000 it saw
+    assert job.digits() == REFERENCE[:3000]
+    assert second.known == 3000 and second.digits(5000) == REFERENCE[:3000]
+    first.close()
+    second.close()
+    assert PiDigitCache(path).digits(5000) == REFERENCE[:3000]
+
+
+def test_damaged_cache_is_discarded(tmp_path):
+    path = tmp_path / "pi.txt"
+    path.write_bytes(b"14159not digits")
+    cache = PiDigitCache(str(path))
+    assert cache.known == 0
+    cache.close()
+
+    path.write_bytes(b"27182818")
+    cache = PiDigitCache(str(path))
+    assert cache.known == 0
+    cache.close()
+
+
+def test_circumference_to_requested_precision(tmp_path):
+    cache = PiDigitCache(str(tmp_path / "pi.txt"))
+    cache.extend(0, REFERENCE)
+    value = circumference(5.0, 60, cache.pi(65))
+    assert len(str(value).replace(".", "")) == 60
+    with decimal.localcontext() as context:
+        context.prec = 60
+        expected = 10 * decimal.Decimal("3." + REFERENCE[:100])
+        assert value == +expected
+    cache.close()
+
+
+def test_process_stages_match_reference():
+    job = FakeJob()
+    compute_pi_digits(job, 3000, use_processes=True)
+    assert job.digits() == REFERENCE[:3000]
+    assert not multiprocessing.active_children()
+
+
+def test_cancelling_terminates_worker_processes():
+    job = FakeJob(cancel_after=1)
+    with pytest.raises(Cancelled):
+        compute_pi_digits(job, 2_000_000, use_processes=True)
+    assert not multiprocessing.active_children()
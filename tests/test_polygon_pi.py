@@ -0,0 +1,34 @@
+import math
+
+import pytest
+
+from polygon_pi import MAX_SIDES, archimedes_bounds, polygon_bounds, visible_sides_limit
+
+
+@pytest.mark.parametrize("sides", [3, 5, 6, 7, 96, 1000, 999_999, MAX_SIDES])
+def test_bounds_enclose_pi_for_any_side_count(sides):
+    lower, upper = polygon_bounds(sides)
+    assert lower < math.pi < upper
+    assert lower == pytest.approx(sides * math.sin(math.pi / sides), rel=1e-14)
+    assert upper == pytest.approx(sides * math.tan(math.pi / sides), rel=1e-14)
+
+
+def test_doubling_counts_come_from_the_table():
+    for doublings in (0, 4, 20):
+        sides, lower, upper = archimedes_bounds(doublings)
+        assert polygon_bounds(sides) == (lower, upper)
+
+
+def test_bounds_tighten_with_more_sides():
+    widths = [upper - lower for lower, upper in map(polygon_bounds, (3, 10, 100, 10_000, 1_000_000))]
+    assert widths == sorted(widths, reverse=True)
+
+
+def test_too_few_sides():
+    with pytest.raises(ValueError):
+        polygon_bounds(2)
+
+
+def test_visible_sides_limit_grows_with_the_radius():
+    assert visible_sides_limit(0.1) == 6
+    assert visible_sides_limit(10) < visible_sides_limit(1000)
@@ -0,0 +1,20 @@
+import pytest
+
+import recorder
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (["--fps", "0"], "--fps must be positive"),
+    (["--size", "0"], "--size must be positive"),
+    (["--end", "nan"], "radii must be positive numbers"),
+    (["--start", "0"], "radii must be positive numbers"),
+    (["--center", "0", "inf"], "--center must be finite"),
+    (["--hold", "nan"], "--hold must be zero or more seconds"),
+])
+def test_invalid_arguments_are_usage_errors(tmp_path, capsys, arguments, message):
+    output = tmp_path / "frames.raw"
+    with pytest.raises(SystemExit) as exit_info:
+        recorder.main(arguments + ["--out", str(output)])
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not output.exists()
@@ -0,0 +1,69 @@
+import socket
+
+import pytest
+
+import render_service
+from render_service import ByteLRUCache, parse_render_query
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    cache = ByteLRUCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234" # "a" is now the most recently used
+    cache.put("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234" and cache.get("c") == b"1234"
+    assert cache.current_bytes == 8
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["evictions"]) == (3, 1, 1)
+
+
+def test_cache_replaces_values_and_skips_oversized_ones():
+    cache = ByteLRUCache(max_bytes=10)
+    cache.put("a", b"12345678")
+    cache.put("a", b"12")
+    assert cache.current_bytes == 2 and len(cache) == 1
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.get("a") == b"12"
+
+
+def test_parse_render_query_defaults():
+    assert parse_render_query("r=5") == (0.0, 0.0, 5.0, 256, "png")
+    assert parse_render_query("x=1&y=-2&r=3&size=64&format=SVG") == (1.0, -2.0, 3.0, 64, "svg")
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "r=abc",
+    "r=0",
+    "r=-1",
+    "r=nan",
+    "r=inf",
+    "r=1e308",
+    "x=1e308&r=1",
+    "x=inf&r=1",
+    "r=1&size=8",
+    "r=1&size=100000",
+    "r=1&format=gif",
+])
+def test_parse_render_query_rejects(query):
+    with pytest.raises(ValueError):
+        parse_render_query(query)
+
+
+@pytest.mark.skipif(render_service.RenderUnixServer is None, reason="no Unix sockets")
+def test_unix_server_keeps_files_that_are_not_sockets(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        render_service.create_server(None, unix_socket=str(path))
+    assert path.read_text() == "keep me"
+
+    stale = tmp_path / "render.sock"
+    leftover = socket.socket(socket.AF_UNIX)
+    leftover.bind(str(stale)) # As left behind by a previous run
+    leftover.close()
+    server = render_service.create_server(None, unix_socket=str(stale))
+    server.server_close()
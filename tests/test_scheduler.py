@@ -0,0 +1,103 @@
+import pytest
+
+from scheduler import AnimatedValue, FrameScheduler
+
+
+class FakeRoot:
+    """Tk 'after' queue on a manual clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = {} # id -> (due time, func)
+        self._next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.queue[self._next_id] = (self.now + ms / 1000, func)
+        return self._next_id
+
+    def after_cancel(self, job_id):
+        self.queue.pop(job_id, None)
+
+    def run_next(self, extra=0.0):
+        """Advances the clock to the next callback (plus 'extra' seconds of work) and runs it."""
+        job_id = min(self.queue, key=lambda key: self.queue[key][0])
+        due, func = self.queue.pop(job_id)
+        self.now = max(self.now, due) + extra
+        func()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def scheduler(root):
+    return FrameScheduler(root, frame_rate=50, clock=root.clock)
+
+
+def test_coalesced_calls_run_once_with_the_latest_arguments(root, scheduler):
+    calls = []
+    for value in range(5):
+        scheduler.coalesce("slider", calls.append, value)
+    scheduler.coalesce("other", calls.append, "other")
+    assert len(root.queue) == 1 # One tick scheduled for all of them
+    root.run_next()
+    assert calls == [4, "other"]
+    assert scheduler.is_idle and not root.queue
+
+
+def test_cancelled_callback_does_not_run(root, scheduler):
+    calls = []
+    scheduler.coalesce("drag", calls.append, 1)
+    scheduler.cancel("drag")
+    root.run_next()
+    assert calls == []
+
+
+def test_tasks_get_the_elapsed_time_until_they_finish(root, scheduler):
+    steps = []
+
+    def task(dt):
+        steps.append(dt)
+        return len(steps) < 3
+
+    scheduler.add_task(task)
+    scheduler.add_task(task) # Registered once
+    while root.queue:
+        root.run_next()
+    assert len(steps) == 3
+    assert steps[1] == pytest.approx(0.02) and steps[2] == pytest.approx(0.02)
+    assert not scheduler.has_task(task) and scheduler.is_idle
+
+
+def test_late_frames_are_skipped_not_replayed(root, scheduler):
+    scheduler.add_task(lambda dt: True)
+    root.run_next()
+    root.run_next(extra=0.1) # This frame took five intervals
+    root.run_next()
+    assert scheduler.frames_skipped >= 4
+    assert root.now < 0.2
+
+
+def test_frame_callbacks_run_after_tasks_and_do_not_keep_the_loop_alive(root, scheduler):
+    order = []
+    scheduler.add_frame_callback(lambda: order.append("render"))
+    scheduler.add_task(lambda dt: order.append("task"))
+    root.run_next()
+    assert order == ["task", "render"]
+    assert not root.queue
+
+
+def test_animated_value_eases_to_its_target():
+    value = AnimatedValue(0.0, step_size=0.5, step_interval=0.01, threshold=0.01)
+    value.set_target(10.0)
+    assert value.advance(0.01)
+    assert value.value == pytest.approx(5.0)
+    while value.advance(0.01):
+        pass
+    assert value.value == 10.0 and value.is_settled
@@ -0,0 +1,104 @@
+import numpy as np
+
+from multi_circle import CircleArray
+from spatial_index import CircleGridIndex, rim_hit
+
+
+def brute_force_hit(circles, x, y, tolerance):
+    distances = np.hypot(circles.centers[:, 0] - x, circles.centers[:, 1] - y)
+    hits = np.flatnonzero(distances <= circles.radii + tolerance)
+    if len(hits) == 0:
+        return None
+    rims = [index for index in hits if rim_hit(distances[index], circles.radii[index], tolerance)]
+    index = int(rims[-1] if rims else hits[-1])
+    return index, rim_hit(distances[index], circles.radii[index], tolerance)
+
+
+def random_array(rng, count, span=100.0):
+    circles = CircleArray()
+    centers = rng.uniform(-span, span, (count, 2))
+    radii = np.exp(rng.uniform(np.log(0.01), np.log(span / 2), count)) # Sizes over four decades
+    circles.add(centers, radii, np.ones((count, 4)))
+    return circles
+
+
+def assert_matches_brute_force(index, circles, rng, queries=500, span=110.0):
+    for x, y in rng.uniform(-span, span, (queries, 2)):
+        for tolerance in (0.0, 0.5):
+            assert index.hit(x, y, tolerance) == brute_force_hit(circles, x, y, tolerance)
+
+
+def test_hit_matches_brute_force():
+    rng = np.random.default_rng(1)
+    circles = random_array(rng, 20_000)
+    assert_matches_brute_force(CircleGridIndex(circles), circles, rng)
+
+
+def test_queries_on_circle_centers_and_rims():
+    rng = np.random.default_rng(2)
+    circles = random_array(rng, 2000)
+    index = CircleGridIndex(circles)
+    for i in rng.choice(len(circles), 200, replace=False):
+        center_x, center_y = circles.centers[i]
+        radius = circles.radii[i]
+        for x, y in ((center_x, center_y), (center_x + radius, center_y), (center_x, center_y - 0.999 * radius)):
+            assert index.hit(x, y, 0.1) == brute_force_hit(circles, x, y, 0.1)
+
+
+def test_moved_and_added_circles_are_found_before_a_rebuild():
+    rng = np.random.default_rng(3)
+    circles = random_array(rng, 5000)
+    index = CircleGridIndex(circles, min_dirty=10_000) # Never rebuilds on its own here
+    index.rebuild()
+    moved = rng.choice(len(circles), 50, replace=False)
+    circles.centers[moved] = rng.uniform(-100, 100, (50, 2))
+    circles.radii[moved] *= 3
+    circles.target_radii[moved] = circles.radii[moved]
+    index.update(moved)
+    circles.add(rng.uniform(-100, 100, (100, 2)), rng.uniform(0.1, 20, 100), np.ones((100, 4)))
+    assert_matches_brute_force(index, circles, rng)
+    assert index.rebuilds == 1
+
+
+def test_rebuilds_after_many_changes_and_removal():
+    rng = np.random.default_rng(4)
+    circles = random_array(rng, 4000)
+    index = CircleGridIndex(circles, min_dirty=16)
+    index.hit(0, 0)
+    changed = rng.choice(len(circles), 1000, replace=False)
+    circles.centers[changed] += 5
+    index.update(changed)
+    index.hit(0, 0)
+    assert index.rebuilds == 2
+    circles.remove(np.arange(0, len(circles), 2))
+    assert_matches_brute_force(index, circles, rng, queries=200)
+
+
+def test_empty_array():
+    circles = CircleArray()
+    index = CircleGridIndex(circles)
+    assert index.hit(0, 0, 1.0) is None
+    circles.add([(0.0, 0.0)], [2.0], [(1, 1, 1, 1)])
+    assert index.hit(0.5, 0, 0.1) == (0, False)
+    circles.clear()
+    index.invalidate()
+    assert index.hit(0.5, 0, 0.1) is None
+
+
+def test_rim_band_is_at_most_half_the_radius():
+    assert rim_hit(10.0, 10.0, 1.0)
+    assert rim_hit(9.2, 10.0, 1.0)
+    assert not rim_hit(8.5, 10.0, 1.0)
+    # A small circle's inside stays grabbable for moving
+    assert not rim_hit(0.0, 1.0, 5.0)
+    assert rim_hit(0.6, 1.0, 5.0)
+
+
+def test_nested_circles_are_grabbed_by_their_rim():
+    circles = CircleArray()
+    radii = np.linspace(1.0, 10.0, 10)
+    circles.add(np.zeros((10, 2)), radii, np.ones((10, 4)))
+    index = CircleGridIndex(circles)
+    for i, radius in enumerate(radii):
+        assert index.hit(radius, 0.0, 0.1) == (i, True)
+    assert index.hit(1.5, 0.0, 0.1) == (9, False) # Between rims: the topmost circle moves
@@ -0,0 +1,98 @@
+from view_model import WidgetState
+
+
+class FakeWidget:
+    def __init__(self):
+        self.options = {}
+        self.calls = 0
+
+    def configure(self, **options):
+        self.options.update(options)
+        self.calls += 1
+
+
+class FakeVariable:
+    def __init__(self, value=None):
+        self.value = value
+        self.sets = 0
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        self.sets += 1
+
+
+def test_only_changed_options_are_pushed():
+    state = WidgetState()
+    label = FakeWidget()
+    state.configure(label, text="a", state="normal")
+    assert state.flush() == 2
+    state.configure(label, text="a", state="normal")
+    assert not state.has_pending
+    assert state.flush() == 0
+    state.configure(label, text="b")
+    assert state.flush() == 1
+    assert label.options == {"text": "b", "state": "normal"}
+    assert label.calls == 3
+
+
+def test_latest_value_wins_and_reverting_cancels_the_push():
+    state = WidgetState()
+    label = FakeWidget()
+    state.configure(label, text="a")
+    state.flush()
+    state.configure(label, text="b")
+    state.configure(label, text="c")
+    state.configure(label, text="a") # Back to what is shown
+    assert state.flush() == 0
+    state.configure(label, text="b")
+    state.configure(label, text="c")
+    assert state.flush() == 1
+    assert label.options["text"] == "c"
+
+
+def test_on_pending_is_called_once_per_batch():
+    calls = []
+    state = WidgetState(on_pending=lambda: calls.append(1))
+    label = FakeWidget()
+    state.configure(label, text="a")
+    state.configure(label, text="b")
+    assert len(calls) == 1
+    state.flush()
+    state.configure(label, text="c")
+    assert len(calls) == 2
+
+
+def test_variable_writes_skip_unchanged_values():
+    state = WidgetState()
+    variable = FakeVariable(1.0)
+    state.set_variable(variable, 1.0)
+    assert state.flush() == 0
+    state.set_variable(variable, 2.0)
+    assert state.get_variable(variable) == 2.0 # Pending writes win
+    assert state.flush() == 1
+    assert variable.value == 2.0 and variable.sets == 1
+
+
+def test_variable_write_after_the_user_edited_it():
+    state = WidgetState()
+    variable = FakeVariable(0.0)
+    assert state.get_variable(variable) == 0.0
+    variable.value = 3.0 # The user types into the entry
+    state.set_variable(variable, 0.0) # Same as the value read before, but not as shown now
+    state.flush()
+    assert variable.value == 0.0
+
+
+def test_unreadable_variable_is_overwritten():
+    class Unparsable(FakeVariable):
+        def get(self):
+            raise ValueError("expected floating-point number")
+
+    state = WidgetState()
+    variable = Unparsable()
+    state.set_variable(variable, 5.0)
+    assert state.flush() == 1
+    assert variable.value == 5.0
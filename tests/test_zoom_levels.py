@@ -0,0 +1,78 @@
+import pytest
+from matplotlib.figure import Figure
+
+from zoom_levels import ZoomLadder, apply_view, format_tick, nice_step
+
+
+@pytest.fixture
+def ladder():
+    return ZoomLadder()
+
+
+def test_levels_are_increasing(ladder):
+    assert ladder.levels[0] == 10 and ladder.levels[-1] == 100_000
+    assert ladder.levels == sorted(set(ladder.levels))
+
+
+def test_level_for_picks_the_smallest_level_that_fits(ladder):
+    index = ladder.level_for(11.0)
+    assert ladder.levels[index] == 12
+    assert ladder.levels[ladder.level_for(12.0)] == 12
+    assert ladder.level_for(1e9) == len(ladder.levels) - 1
+
+
+def test_level_for_zooms_out_at_once_and_in_with_hysteresis(ladder):
+    current = ladder.level_for(15.0) # Level 15
+    assert ladder.levels[ladder.level_for(15.5, current)] == 20 # Zoom out as soon as it does not fit
+    # Level 12 would fit 11.5, but not with 15% to spare
+    assert ladder.level_for(11.5, current) == current
+    assert ladder.levels[ladder.level_for(10.0, current)] == 12
+    # Far smaller: steps down over several levels at once
+    assert ladder.levels[ladder.level_for(10.0, ladder.level_for(100.0))] == 12
+
+
+def test_nice_step_and_format_tick():
+    assert [nice_step(step) for step in (0.7, 1.0, 1.1, 2.2, 3, 7)] == [1, 1, 2, 2.5, 5, 10]
+    assert format_tick(-2.5) == "\N{MINUS SIGN}2.5"
+    assert format_tick(100000.0) == "100000"
+
+
+def test_tick_layouts_are_cached_with_a_bound():
+    ladder = ZoomLadder(max_layouts=4)
+    layout = ladder.tick_layout(0, 0.0, 0.0)
+    assert ladder.tick_layout(0, 0.0, 0.0) is layout
+    for center in range(1, 10):
+        ladder.tick_layout(0, float(center), 0.0)
+    assert len(ladder._tick_cache) == 4
+    assert ladder.tick_layout(0, 0.0, 0.0) is not layout # Evicted
+
+
+def visible_labels(ax, figure):
+    figure.canvas.draw()
+    return [label.get_text() for label in ax.get_xticklabels() if label.get_visible() and label.get_text()]
+
+
+def test_level_view_uses_the_precomputed_ticks(ladder):
+    figure = Figure()
+    ax = figure.add_subplot()
+    index = ladder.level_for(15.0)
+    layout = ladder.tick_layout(index, 0.0, 0.0)
+    apply_view(ax, 0.0, 0.0, ladder.levels[index], layout)
+    assert visible_labels(ax, figure) == ["\N{MINUS SIGN}15", "\N{MINUS SIGN}10", "\N{MINUS SIGN}5",
+                                          "0", "5", "10", "15"]
+    # While easing toward the level, the view is smaller than the level
+    apply_view(ax, 0.0, 0.0, 0.9 * ladder.levels[index], layout)
+    assert list(ax.get_xticks()) == list(layout[0].positions)
+
+
+def test_other_views_get_automatic_ticks(ladder):
+    figure = Figure()
+    ax = figure.add_subplot()
+    index = ladder.level_for(15.0)
+    apply_view(ax, 0.0, 0.0, ladder.levels[index], ladder.tick_layout(index, 0.0, 0.0))
+    ax.set_xlim(40, 70) # Panned and zoomed with the toolbar
+    labels = visible_labels(ax, figure)
+    assert len(labels) >= 3
+    assert all(40 <= float(label) <= 70 for label in labels)
+    ax.set_xlim(2, 4) # Zoomed in within the level's window
+    assert len(visible_labels(ax, figure)) >= 3
@@ -0,0 +1,88 @@
+"""
+Dirty tracking for the Tk side of the view.
+
+Every option set on a widget and every Tk variable write is a round trip
+through the Tcl interpreter, even when the value did not change. WidgetState
+keeps the desired widget options and variable values in plain Python and
+remembers what was last pushed to Tk; flush() only sends the values that
+differ, so a frame in which nothing visible changed makes no Tcl calls at all.
+The application flushes once per frame, after its tasks ran.
+
+Variables the user can edit (entries, sliders) change behind WidgetState's
+back, so they are read with get_variable(). Their cached value can be stale by
+the time it is written, so variable writes are always queued and compared with
+the variable's current value when they are flushed.
+"""
+
+_UNSET = object()
+
+
+class WidgetState:
+    """
+    Cache of the widget options and variable values last pushed to Tk.
+
+    'on_pending' is called whenever there is something to flush and there was
+    nothing before, so the owner can make sure a flush gets scheduled.
+    """
+
+    def __init__(self, on_pending=None):
+        self.on_pending = on_pending
+        self._rendered = {} # (id(widget), option) -> value last pushed
+        self._pending = {} # (id(target), option) -> (target, option, value)
+        self.pushes = 0 # Number of Tk calls made, for diagnostics
+
+    def _set(self, target, option, value):
+        key = (id(target), option)
+        if option is not None and self._rendered.get(key, _UNSET) == value:
+            self._pending.pop(key, None) # Back to what is shown
+            return
+        was_empty = not self._pending
+        self._pending[key] = (target, option, value)
+        if was_empty and self.on_pending is not None:
+            self.on_pending()
+
+    def configure(self, widget, **options):
+        """Sets widget options (e.g. text=..., state=...) with the next flush, if they changed."""
+        for option, value in options.items():
+            self._set(widget, option, value)
+
+    def set_variable(self, variable, value):
+        """Sets a Tk variable with the next flush, if it then holds a different value."""
+        self._set(variable, None, value)
+
+    def get_variable(self, variable):
+        """
+        Reads a Tk variable the user may have edited. Pending writes win, since
+        they are newer than what Tk shows.
+        """
+        key = (id(variable), None)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending[2]
+        return variable.get()
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    def flush(self):
+        """Pushes the changed values to Tk; returns how many there were."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        pushed = 0
+        for key, (target, option, value) in pending.items():
+            if option is None:
+                try:
+                    unchanged = target.get() == value
+                except Exception: # E.g. a TclError for text typed into a DoubleVar's entry
+                    unchanged = False
+                if unchanged:
+                    continue
+                target.set(value)
+            else:
+                target.configure(**{option: value})
+                self._rendered[key] = value
+            pushed += 1
+        self.pushes += pushed
+        return pushed
@@ -0,0 +1,148 @@
+"""
+Quantized zoom levels with precomputed tick layouts.
+
+Instead of following the circle's radius continuously, the view snaps to a
+ladder of "nice" half-extents. The level only changes when the circle no longer
+fits (zoom out) or fits comfortably in a smaller level (zoom in, with
+hysteresis), so during a radius animation the limits change a handful of times
+instead of on almost every frame. For each level the tick positions and their
+label strings are computed once and installed as the axes' locators and
+formatters, so a view change needs no tick locating or label formatting, and
+reusing the same label strings lets matplotlib reuse its cached text layouts.
+Views the layout was not computed for (e.g. after panning or zooming with the
+navigation toolbar) get matplotlib's automatic ticks instead.
+"""
+import collections
+import math
+
+import numpy as np
+from matplotlib.ticker import AutoLocator, Formatter, Locator
+
+LEVEL_MANTISSAS = (1, 1.2, 1.5, 2, 2.5, 3, 4, 5, 6, 8)
+TICK_STEP_MANTISSAS = (1, 2, 2.5, 5)
+
+
+def nice_step(approximate_step):
+    """Rounds a tick step up to 1, 2, 2.5 or 5 times a power of ten."""
+    exponent = math.floor(math.log10(approximate_step))
+    for mantissa in TICK_STEP_MANTISSAS:
+        step = mantissa * 10 ** exponent
+        if step >= approximate_step:
+            return step
+    return 10 ** (exponent + 1)
+
+
+def format_tick(value):
+    """Formats a tick label like matplotlib's default formatter (with a Unicode minus)."""
+    return f"{value:g}".replace("-", "\N{MINUS SIGN}")
+
+
+class LevelLocator(Locator):
+    """
+    Precomputed tick positions for the views within [low, high] that span at
+    least 'min_span'; any other view is located automatically.
+    """
+
+    def __init__(self, positions, low, high, min_span):
+        self.positions = positions
+        self.low = low
+        self.high = high
+        self.min_span = min_span
+        self._auto = AutoLocator()
+
+    def set_axis(self, axis):
+        super().set_axis(axis)
+        self._auto.set_axis(axis)
+
+    def __call__(self):
+        return self.tick_values(*self.axis.get_view_interval())
+
+    def tick_values(self, vmin, vmax):
+        vmin, vmax = sorted((vmin, vmax))
+        if self.low <= vmin and vmax <= self.high and vmax - vmin >= self.min_span:
+            return self.positions
+        return self._auto.tick_values(vmin, vmax)
+
+
+class LevelFormatter(Formatter):
+    """Precomputed labels of a LevelLocator's ticks; other ticks are formatted on demand."""
+
+    def __init__(self, labels):
+        self.labels = labels # position -> label
+
+    def __call__(self, x, pos=None):
+        label = self.labels.get(x)
+        return label if label is not None else format_tick(x)
+
+
+class ZoomLadder:
+    """
+    Discrete half-extents (half the width of the square view) from 'min_level'
+    to 'max_level', with cached tick layouts per level and view center.
+    """
+
+    def __init__(self, min_level=10, max_level=100_000, hysteresis=0.15, ticks_per_half=3, max_layouts=128):
+        self.levels = [
+            mantissa * 10 ** exponent
+            for exponent in range(int(math.log10(max_level)) + 1)
+            for mantissa in LEVEL_MANTISSAS
+            if min_level <= mantissa * 10 ** exponent <= max_level
+        ]
+        self.hysteresis = hysteresis
+        self.ticks_per_half = ticks_per_half
+        self.max_layouts = max_layouts
+        self._tick_cache = collections.OrderedDict() # LRU; every new view center adds a layout
+
+    def level_for(self, half_extent, current_index=None):
+        """
+        Index of the level to show 'half_extent' with. Zooms out as soon as the
+        current level is too small, but only zooms in once the view fits in the
+        next smaller level with a margin of 'hysteresis'.
+        """
+        index = int(np.searchsorted(self.levels, half_extent))
+        index = min(index, len(self.levels) - 1)
+        if current_index is None or index >= current_index:
+            return index
+        # Zooming in: only step down while the smaller level has room to spare
+        while current_index > index and half_extent <= self.levels[current_index - 1] * (1 - self.hysteresis):
+            current_index -= 1
+        return current_index
+
+    def _axis_ticks(self, index, center):
+        half_extent = self.levels[index]
+        step = nice_step(half_extent / self.ticks_per_half)
+        first = math.ceil((center - half_extent) / step)
+        last = math.floor((center + half_extent) / step)
+        positions = [round(k * step, 10) for k in range(first, last + 1)]
+        # Valid for this level's views around the center: the view eases between
+        # levels but always spans more than half of the level's window.
+        margin = half_extent * 1e-9
+        locator = LevelLocator(positions, center - half_extent - margin, center + half_extent + margin, half_extent)
+        return locator, LevelFormatter({p: format_tick(p) for p in positions})
+
+    def tick_layout(self, index, center_x, center_y):
+        """
+        Returns (x_locator, x_formatter, y_locator, y_formatter) for a level around
+        the given center. Layouts are computed once and then served from a cache.
+        """
+        key = (index, center_x, center_y)
+        layout = self._tick_cache.get(key)
+        if layout is None:
+            layout = self._axis_ticks(index, center_x) + self._axis_ticks(index, center_y)
+            self._tick_cache[key] = layout
+            if len(self._tick_cache) > self.max_layouts:
+                self._tick_cache.popitem(last=False)
+        else:
+            self._tick_cache.move_to_end(key)
+        return layout
+
+
+def apply_view(ax, center_x, center_y, half_extent, layout):
+    """Sets a square view around the center and installs a precomputed tick layout."""
+    x_locator, x_formatter, y_locator, y_formatter = layout
+    ax.xaxis.set_major_locator(x_locator)
+    ax.xaxis.set_major_formatter(x_formatter)
+    ax.yaxis.set_major_locator(y_locator)
+    ax.yaxis.set_major_formatter(y_formatter)
+    ax.set_xlim(center_x - half_extent, center_x + half_extent)
+    ax.set_ylim(center_y - half_extent, center_y + half_extent)